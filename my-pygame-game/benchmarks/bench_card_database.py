@@ -0,0 +1,78 @@
+"""Benchmark loading a large card catalog with CardDatabase.
+
+Writes a temporary catalog of CARDS entries (distinct names, eight images)
+and reports the cold load time, the cost of an unchanged refresh and of a
+touched-but-identical file, lookups, and the memory the catalog holds.
+Run from the repository root:
+
+    python my-pygame-game/benchmarks/bench_card_database.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from card import CardFactory, get_predefined_cards
+from card_database import CardDatabase
+from deck_store import card_to_dict
+
+CARDS = 10_000
+
+
+def write_catalog(path, size):
+    templates = [card_to_dict(card) for card in get_predefined_cards()]
+    entries = []
+    for i in range(size):
+        entry = dict(templates[i % len(templates)])
+        entry["name"] = f"{entry['name']} {i // len(templates)}"
+        entry["value"] = 1 + i % 10
+        entries.append(entry)
+    with open(path, "w") as f:
+        json.dump(entries, f)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.json")
+        write_catalog(path, CARDS)
+        database = CardDatabase(path)
+        _, load_ms = timed(database.refresh)
+
+        # Load again from scratch under tracemalloc, with the shared card objects forgotten
+        CardFactory._interned.clear()
+        tracemalloc.start()
+        CardDatabase(path).refresh()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        _, unchanged_ms = timed(lambda: [database.refresh() for _ in range(100)])
+        unchanged_ms /= 100
+        os.utime(path)
+        rebuilt, touched_ms = timed(database.refresh)
+
+        names = [card.name for card in database.cards()[::97]]
+        start = time.perf_counter()
+        for name in names * 100:
+            database.find(name)
+        find_us = (time.perf_counter() - start) / (len(names) * 100) * 1e6
+
+        print(f"cards:            {len(database):,}")
+        print(f"cold load:        {load_ms:.1f} ms ({memory / 1024:.0f} KiB held)")
+        print(f"unchanged check:  {unchanged_ms * 1000:.1f} us")
+        print(f"touched file:     {touched_ms:.2f} ms (rebuilt: {rebuilt})")
+        print(f"find by name:     {find_us:.2f} us")
+        print(f"attack cards:     {len(database.of_type('attack')):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark card hover handling as the hand grows.
+
+Compares the cached CardHand against the old approach of rescaling every
+card on each mouse motion. Run from the repository root:
+
+    SDL_VIDEODRIVER=dummy python my-pygame-game/benchmarks/bench_card_hover.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pygame
+from card import get_predefined_cards
+from card_sprite import CardHand, build_card_sprite
+
+HAND_SIZES = (4, 16, 64, 256)
+MOTIONS = 500
+
+
+def make_hand(size):
+    cards = (get_predefined_cards() * (size // 8 + 1))[:size]
+    sprites = [build_card_sprite(card, (150, 225), (170, 255)) for card in cards]
+    return CardHand(sprites, 0, 130, spacing=160)
+
+
+def legacy_hover(images, rects, sizes, mouse_pos):
+    """The per-motion rescale loop GameplayScreen used before CardHand."""
+    for i, rect in enumerate(rects):
+        if rect.collidepoint(mouse_pos):
+            images[i] = pygame.transform.scale(images[i], (170, 255))
+        else:
+            images[i] = pygame.transform.scale(images[i], sizes[i])
+        rects[i] = images[i].get_rect(topleft=rect.topleft)
+
+
+def time_per_call(func, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6  # microseconds
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((1200, 800))
+    print(f"{'hand':>6} {'hover us':>10} {'draw us':>10} {'legacy hover us':>16}")
+    for size in HAND_SIZES:
+        hand = make_hand(size)
+        positions = [(hand[i % size].rect.centerx, hand[i % size].rect.centery) for i in range(MOTIONS)]
+        hover_us = time_per_call(lambda i: hand.hover(positions[i]), MOTIONS)
+        draw_us = time_per_call(lambda i: hand.draw(screen), 100)
+
+        images = [sprite.normal_image for sprite in hand.sprites]
+        rects = [sprite.rect.copy() for sprite in hand.sprites]
+        sizes = [image.get_size() for image in images]
+        legacy_us = time_per_call(lambda i: legacy_hover(images, rects, sizes, positions[i]), 20)
+        print(f"{size:>6} {hover_us:>10.2f} {draw_us:>10.1f} {legacy_us:>16.1f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
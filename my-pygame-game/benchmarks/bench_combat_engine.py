@@ -0,0 +1,77 @@
+"""Benchmark headless combat throughput (no pygame needed, NumPy optional).
+
+``simulate`` has a target of SIMULATE_TARGET full five-round runs per
+second on one core for every policy; the script prints "below target"
+next to a miss and exits with status 1. Run from the repository root:
+
+    python my-pygame-game/benchmarks/bench_combat_engine.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from card import get_predefined_cards
+from combat_engine import CombatEngine, deck_from_cards, make_random_policy, simulate
+
+RUNS = 100_000
+PLAYER_HEALTH = 100
+SIMULATE_TARGET = 100_000  # Runs per second per core
+
+
+def verdict(rate, target):
+    return "ok" if rate >= target else f"below target of {target:,}"
+
+
+def main():
+    deck = deck_from_cards(get_predefined_cards()[:4])
+    missed = []
+
+    for policy in ("attack", "random", "greedy"):
+        start = time.perf_counter()
+        result = simulate(deck, PLAYER_HEALTH, RUNS, seed=1, policy=policy)
+        elapsed = time.perf_counter() - start
+        rate = RUNS / elapsed
+        print(f"simulate[{policy:>6}]: {rate:>9,.0f} runs/s  "
+              f"win rate {result['win_rate']:.3f}  avg turns {result['avg_turns']:.1f}  "
+              f"{verdict(rate, SIMULATE_TARGET)}")
+        if rate < SIMULATE_TARGET:
+            missed.append(f"simulate[{policy}]")
+
+    runs = RUNS // 10
+    rng = random.Random(1)
+    policy = make_random_policy(rng)
+    start = time.perf_counter()
+    for seed in range(runs):
+        CombatEngine(deck, PLAYER_HEALTH, seed=seed).run(policy)
+    elapsed = time.perf_counter() - start
+    print(f"CombatEngine.run:  {runs / elapsed:>9,.0f} runs/s")
+
+    try:
+        from batch_combat import simulate_batch
+    except ImportError:
+        print("NumPy not installed, skipping simulate_batch")
+        return report(missed)
+    fights = RUNS * 10
+    for policy in ("attack", "random", "greedy"):
+        start = time.perf_counter()
+        result = simulate_batch(deck, PLAYER_HEALTH, fights, seed=1, policy=policy)
+        elapsed = time.perf_counter() - start
+        print(f"simulate_batch[{policy:>6}]: {fights / elapsed:>9,.0f} runs/s  "
+              f"win rate {result['win_rate']:.3f}  avg turns {result['avg_turns']:.1f}")
+    return report(missed)
+
+
+def report(missed):
+    """Exit status: 1 if any benchmark missed its target."""
+    if missed:
+        print(f"{len(missed)} below target: {', '.join(missed)}")
+        return 1
+    print("All targets met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Benchmark the boss AI: how often the player still wins, and what thinking costs.
+
+Plays FIGHTS full fights with the greedy player policy, first with the
+boss flipping a coin and then with ExpectimaxEnemyAI, and reports win
+rates and per-turn thinking time. Then replays the boss's turns the way
+GameplayScreen runs them, in slices of GameplayScreen.AI_THINK_NODES
+nodes, one per update, and reports how many slices a decision takes, how
+deep it got and how long slices really run, which is what a frame would
+feel, next to plain SPIN_MS spin loops so that time the OS takes away is
+not blamed on the AI. No pygame needed. Run from the repository root:
+
+    python my-pygame-game/benchmarks/bench_enemy_ai.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from card import get_predefined_cards
+from combat_engine import BOSS_ENEMY_TYPE, CombatEngine, deck_from_cards, greedy_policy
+from enemy_ai import ExpectimaxEnemyAI, RandomEnemyAI, TranspositionTable
+
+FIGHTS = 200
+PLAYER_HEALTH = 100
+SLICE_NODES = 200  # GameplayScreen.AI_THINK_NODES; not imported, as that would need pygame
+SPIN_MS = 2.0
+
+
+def play(deck, boss_ai):
+    """Win rate over FIGHTS, plus every boss position the AI was asked about."""
+    positions = []
+    def enemy_ai(enemy_type):
+        if enemy_type != BOSS_ENEMY_TYPE:
+            return RandomEnemyAI()
+        positions.append(engine.state.copy())  # Asked after the player's action, as in the game
+        return boss_ai
+    wins = 0
+    for seed in range(FIGHTS):
+        engine = CombatEngine(deck, PLAYER_HEALTH, seed=seed)
+        engine.run(greedy_policy, enemy_ai=enemy_ai)
+        wins += engine.state.outcome == "win"
+    return wins / FIGHTS, positions
+
+
+def spin_slices(count):
+    """Lengths of ``count`` busy loops of SPIN_MS each: what the host alone adds."""
+    lengths = []
+    for _ in range(count):
+        start = time.perf_counter()
+        deadline = start + SPIN_MS / 1000
+        while time.perf_counter() < deadline:
+            pass
+        lengths.append(time.perf_counter() - start)
+    return lengths
+
+
+def percentiles(lengths):
+    lengths = sorted(lengths)
+    return " / ".join(f"{lengths[min(int(len(lengths) * q), len(lengths) - 1)] * 1000:.2f}"
+                      for q in (0.5, 0.9, 1.0))
+
+
+def main():
+    deck = deck_from_cards(get_predefined_cards()[:4])
+    win_rate, _ = play(deck, RandomEnemyAI())
+    print(f"coin flip boss:   player win rate {win_rate:.3f}")
+
+    ai = ExpectimaxEnemyAI()
+    start = time.perf_counter()
+    win_rate, positions = play(deck, ai)
+    elapsed = time.perf_counter() - start
+    print(f"expectimax boss:  player win rate {win_rate:.3f}  ({len(positions)} boss turns in {elapsed:.2f}s)")
+
+    # Sliced thinking, as GameplayScreen does during the enemy's delay
+    table = TranspositionTable()
+    ai = ExpectimaxEnemyAI(table=table)
+    slices, lengths, depths, turn_ms = [], [], [], []
+    for state in positions[:300]:
+        ai.start(state, deck)
+        count = 0
+        turn_start = time.perf_counter()
+        while True:
+            slice_start = time.perf_counter()
+            done = ai.think(SLICE_NODES)
+            lengths.append(time.perf_counter() - slice_start)
+            count += 1
+            if done:
+                break
+        turn_ms.append((time.perf_counter() - turn_start) * 1000)
+        slices.append(count)
+        depths.append(ai.completed_depth)
+    lookups = table.hits + table.misses
+    print(f"sliced thinking:  {sum(slices) / len(slices):.1f} slices per turn (max {max(slices)}), "
+          f"depth {min(depths)}-{max(depths)}")
+    print(f"                  {sum(turn_ms) / len(turn_ms):.1f} ms per turn (max {max(turn_ms):.1f}), "
+          f"table {len(table):,} entries, {table.hits / lookups if lookups else 0:.0%} hits")
+    print(f"                  slice ms p50 / p90 / max  {percentiles(lengths)}")
+    print(f"                  plain {SPIN_MS:g} ms spin loop    {percentiles(spin_slices(len(lengths)))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark frame pacing: frame rate, CPU use and game speed at several caps.
+
+Runs the real main loop in the starting area with D held for a few seconds
+per setting. With the fixed-timestep loop, the player should cover the
+same distance per second at every frame cap while CPU use drops with the
+cap; busy-loop pacing trades CPU for steadier frame times. Then leaves the
+static screens alone with no input, with and without idling, where idle
+mode should draw almost no frames. Run from the repository root:
+
+    SDL_VIDEODRIVER=dummy python my-pygame-game/benchmarks/bench_frame_pacing.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pygame
+from main import Game
+from player import Player
+from run_benchmarks import BENCH_SAVE_PATH
+from screens.choose_player_screen import ChoosePlayerScreen
+from screens.starting_area_screen import StartingAreaScreen
+
+SECONDS = 2.0
+# (label, fps cap, busy loop)
+SETTINGS = [("30 fps", 30, False), ("60 fps", 60, False), ("144 fps", 144, False),
+            ("60 fps busy", 60, True), ("uncapped", 0, False)]
+IDLE_SCREENS = ("start", "choose_player", "tavern")
+
+
+def make_game(screen_name, **options):
+    game = Game(save_path=BENCH_SAVE_PATH, **options)
+    name, health, image_path = ChoosePlayerScreen.PLAYER_OPTIONS[0]
+    game.selected_player = Player(name, health, image_path)
+    game.goto(screen_name, *([game.selected_player] if screen_name == "starting_area" else []))
+    return game
+
+
+def walk(fps, busy_loop):
+    game = make_game("starting_area", fps=fps, busy_loop=busy_loop)
+    screen = game.current_screen
+    screen.player_x = screen.previous_x = 0.0
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_d, mod=0, unicode="d", scancode=0))
+    pygame.time.set_timer(pygame.QUIT, int(SECONDS * 1000), loops=1)  # Ends the run through the screen's QUIT handling
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    game.run()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    frame = game.profiler.frame_histogram("StartingAreaScreen")
+    return {
+        "fps": game.profiler.frame_count / wall,
+        "cpu": cpu / wall * 100,
+        "speed": screen.player_x / wall,
+        "p99": game.profiler.intervals.percentile(99) * 1000,
+        "work": frame.mean * 1000,
+    }
+
+
+def sit(screen_name, idle):
+    """Leave a screen alone for SECONDS. Returns (frames drawn, CPU %)."""
+    game = make_game(screen_name, idle=idle)
+    pygame.time.set_timer(pygame.QUIT, int(SECONDS * 1000), loops=1)
+    wall, cpu = time.perf_counter(), time.process_time()
+    game.run()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return game.profiler.frame_count, cpu / wall * 100
+
+
+def main():
+    print(f"{'setting':<12} {'fps':>7} {'cpu %':>7} {'px/s':>7} {'interval p99 ms':>16} {'work ms':>8}")
+    for label, fps, busy_loop in SETTINGS:
+        result = walk(fps, busy_loop)
+        print(f"{label:<12} {result['fps']:>7.1f} {result['cpu']:>7.1f} {result['speed']:>7.1f} "
+              f"{result['p99']:>16.2f} {result['work']:>8.2f}")
+    print(f"Target walking speed: {StartingAreaScreen.WALK_SPEED} px/s")
+
+    print(f"\n{'no input on':<14} {'frames':>7} {'cpu %':>7} {'idle frames':>12} {'idle cpu %':>11}")
+    for screen_name in IDLE_SCREENS:
+        busy_frames, busy_cpu = sit(screen_name, idle=False)
+        idle_frames, idle_cpu = sit(screen_name, idle=True)
+        print(f"{screen_name:<14} {busy_frames:>7} {busy_cpu:>7.1f} {idle_frames:>12} {idle_cpu:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark the software and texture renderers on every screen, and check they agree.
+
+For each backend, draws FRAMES frames per screen with the same drivers as
+run_benchmarks.py (walking, hovering cards) and presents every one, so the
+time includes getting the frame to the window. The texture renderer is run
+in a window at the logical 1200x800 and in a larger one, which SDL scales
+to. Each configuration runs in its own process. The last frame of every
+screen is saved, and the texture frames at 1200x800 are compared with the
+software ones pixel by pixel. Run from the repository root:
+
+    SDL_VIDEODRIVER=dummy python my-pygame-game/benchmarks/bench_renderer.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pygame
+from main import Game
+from player import Player
+from run_benchmarks import BENCH_SAVE_PATH, SCREEN_BENCHMARKS, settle
+from screens.choose_player_screen import ChoosePlayerScreen
+
+FRAMES = 200
+# (label, renderer, window size)
+CONFIGS = [("software", "software", None), ("texture", "texture", None),
+           ("texture 1800x1200", "texture", (1800, 1200))]
+
+
+def present(game):
+    if game.texture_renderer is not None:
+        game.texture_renderer.present()
+    else:
+        pygame.display.flip()
+
+
+def frame_pixels(game):
+    """What the window shows. Only for windows at the logical size: pygame's readback of a
+    scaled renderer writes past the end of its buffer."""
+    if game.texture_renderer is not None:
+        return game.texture_renderer.renderer.to_surface()
+    return game.screen.copy()
+
+
+def run_config(renderer, window_size, out_dir):
+    """Time every screen with one backend. Returns {screen: microseconds per frame}."""
+    game = Game(renderer=renderer, window_size=window_size, save_path=BENCH_SAVE_PATH)
+    settle(game)
+    name, health, image_path = ChoosePlayerScreen.PLAYER_OPTIONS[0]
+    game.selected_player = Player(name, health, image_path)
+    results = {}
+    for screen_name, (arguments, make_driver) in SCREEN_BENCHMARKS.items():
+        game.goto(screen_name, *arguments(game))
+        settle(game)
+        screen = game.current_screen
+        drive = make_driver(screen) if make_driver is not None else (lambda i: None)
+        screen.draw(game.screen)
+        present(game)  # First frame uploads the art; time the frames after it
+        start = time.perf_counter()
+        for i in range(FRAMES):
+            drive(i)
+            screen.draw(game.screen)
+            present(game)
+        results[screen_name] = (time.perf_counter() - start) / FRAMES * 1e6
+        if window_size is None:
+            if game.texture_renderer is not None:
+                game.texture_renderer.invalidate()  # Reads come from the frame being drawn, not the window
+                screen.draw(game.screen)
+                present(game)
+            pygame.image.save(frame_pixels(game), os.path.join(out_dir, f"{screen_name}.png"))
+    if game.texture_renderer is not None:
+        results["uploads"] = game.texture_renderer.uploads
+    return results
+
+
+def difference(path_a, path_b):
+    """Mean absolute difference per colour channel, 0 to 255."""
+    a = pygame.image.load(path_a)
+    b = pygame.image.load(path_b)
+    if a.get_size() != b.get_size():
+        return None
+    width, height = a.get_size()
+    total = 0
+    for y in range(0, height, 4):
+        for x in range(0, width, 4):
+            pa, pb = a.get_at((x, y)), b.get_at((x, y))
+            total += abs(pa.r - pb.r) + abs(pa.g - pb.g) + abs(pa.b - pb.b)
+    return total / (3 * ((width + 3) // 4) * ((height + 3) // 4))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--config", type=int, help=argparse.SUPPRESS)  # Run one configuration in this process
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.config is not None:
+        _, renderer, window_size = CONFIGS[args.config]
+        print(json.dumps(run_config(renderer, window_size, args.out)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = []
+        for index, _ in enumerate(CONFIGS):
+            out_dir = os.path.join(directory, str(index))
+            os.makedirs(out_dir)
+            output = subprocess.run([sys.executable, __file__, "--config", str(index), "--out", out_dir],
+                                    capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+        print(f"{'us per frame':<16}" + "".join(f"{label:>20}" for label, _, _ in CONFIGS) + f"{'pixel diff':>12}")
+        for screen_name in SCREEN_BENCHMARKS:
+            diff = difference(os.path.join(directory, "0", f"{screen_name}.png"),
+                              os.path.join(directory, "1", f"{screen_name}.png"))
+            print(f"{screen_name:<16}" + "".join(f"{result[screen_name]:>20.1f}" for result in results)
+                  + f"{diff:>12.2f}")
+        print("texture uploads: " + ", ".join(f"{label} {result['uploads']}"
+                                               for (label, _, _), result in zip(CONFIGS, results) if "uploads" in result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Load generator for the headless combat session server.
+
+Plays ``--sessions`` full fights with ``--concurrency`` of them open at
+once, each bot choosing its actions with one of combat_engine's
+policies, and reports sessions per second and turn latency percentiles.
+By default the host runs in this process and bots use LocalClient;
+``--transport tcp`` or ``unix`` starts a server in this process and
+connects ``--connections`` SocketClients to it, with the bots spread
+over them, so the numbers include JSON and the socket. ``--port``
+drives a server that is already running instead. Run from the
+repository root:
+
+    python my-pygame-game/benchmarks/bench_session_server.py
+    python my-pygame-game/benchmarks/bench_session_server.py --transport tcp --concurrency 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from card import get_predefined_cards
+from combat_engine import CombatState, deck_from_cards, greedy_policy, make_random_policy
+from session_server import DEFAULT_HEALTH, LocalClient, SessionHost, SocketClient, serve
+
+MAX_TURNS = 1000  # A bot gives up on a fight this long, as CombatEngine.run does
+
+
+def percentile(values, q):
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+async def bot(client, deck, policy, next_seed, remaining, latencies, outcomes):
+    """Play fights one after another until ``remaining`` runs out."""
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        reply = await client.start(deck, DEFAULT_HEALTH, seed=next_seed())
+        session = reply["session"]
+        state = CombatState(**reply["state"])
+        outcome = None
+        while outcome is None and state.turns < MAX_TURNS:
+            start = time.perf_counter()
+            reply = await client.act(session, policy(state, deck))
+            latencies.append(time.perf_counter() - start)
+            state = CombatState(**reply["state"])
+            outcome = reply["outcome"]
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        await client.end(session)
+
+
+async def run(args):
+    deck = deck_from_cards(get_predefined_cards()[:4])
+    rng = random.Random(args.seed)
+    policy = greedy_policy if args.policy == "greedy" else make_random_policy(rng)
+    seeds = iter(range(args.seed, args.seed + 10 * args.sessions + 1))
+
+    host = server = None
+    if args.port is None:
+        host = SessionHost(max_sessions=args.max_sessions, max_active_turns=args.max_active_turns)
+    directory = tempfile.TemporaryDirectory()
+    if args.port is not None:
+        clients = [await SocketClient.connect(args.port) for _ in range(args.connections)]
+    elif args.transport == "local":
+        clients = [LocalClient(host)]
+    else:
+        path = os.path.join(directory.name, "sessions.sock") if args.transport == "unix" else None
+        server = await serve(host, port=0, path=path, max_in_flight=args.max_in_flight)
+        port = server.sockets[0].getsockname()[1] if path is None else None
+        clients = [await SocketClient.connect(port, path) for _ in range(args.connections)]
+
+    remaining = [args.sessions]
+    latencies = []
+    outcomes = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(bot(clients[i % len(clients)], deck, policy, lambda: next(seeds),
+                               remaining, latencies, outcomes)
+                           for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    for client in clients:
+        await client.close()
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    directory.cleanup()
+
+    latencies.sort()
+    transport = f"port {args.port}" if args.port is not None else args.transport
+    print(f"{args.sessions} sessions, {args.concurrency} at once, {transport}, {args.policy} bots")
+    print(f"  {args.sessions / elapsed:,.0f} sessions/s, {len(latencies) / elapsed:,.0f} turns/s "
+          f"({len(latencies)} turns in {elapsed:.2f}s)")
+    print("  turn latency ms p50 / p99 / max  " + " / ".join(
+        f"{percentile(latencies, q) * 1000:.2f}" for q in (0.5, 0.99, 1.0)))
+    print("  outcomes: " + ", ".join(f"{outcome or 'timeout'} {count}" for outcome, count in sorted(
+        outcomes.items(), key=lambda item: str(item[0]))))
+    if host is not None:
+        stats = host.stats()
+        print(f"  host: peak {stats['peak']} open sessions, {stats['start_waits']} starts and "
+              f"{stats['turn_waits']} turns waited, {stats['tables']} shared AI table(s)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load-test the combat session server")
+    parser.add_argument("--sessions", type=int, default=5000, help="fights to play in total (default 5000)")
+    parser.add_argument("--concurrency", type=int, default=1000, help="fights open at once (default 1000)")
+    parser.add_argument("--transport", choices=("local", "tcp", "unix"), default="local",
+                        help="in-process LocalClient, or sockets to a server in this process (default local)")
+    parser.add_argument("--connections", type=int, default=16,
+                        help="sockets the bots share with --transport tcp/unix or --port (default 16)")
+    parser.add_argument("--port", type=int, help="drive an already running server on this localhost port")
+    parser.add_argument("--policy", choices=("random", "greedy"), default="random", help="how bots play")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-sessions", type=int, default=10_000, help="host limit on open sessions")
+    parser.add_argument("--max-active-turns", type=int, default=64, help="host limit on turns played at once")
+    parser.add_argument("--max-in-flight", type=int, default=32, help="host limit on requests per connection")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,110 @@
+"""Benchmark run snapshots: encoding, decoding, autosave and resume.
+
+Times each step per call on a mid-fight snapshot with the full card
+catalog as the deck. ``save`` is the part of an autosave that runs on the
+main thread; the file write happens on the writer thread and is timed
+separately. Every main-thread step should stay under BUDGET_MS at the
+99th percentile. A 50 us busy-wait is timed the same way: on a busy or
+throttled machine it shows how much of the tail is the machine rather
+than the code. Run from the repository root:
+
+    python my-pygame-game/benchmarks/bench_snapshot.py
+"""
+import json
+import os
+import pickle
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from card import get_predefined_cards
+from combat_engine import BOSS_ENEMY_TYPE, CombatState
+from deck_store import card_to_dict
+from snapshot import CombatSnapshot, RunSnapshot, SnapshotStore, decode_snapshot, encode_snapshot
+
+CALLS = 2000
+WRITES = 50
+BUDGET_MS = 1.0
+
+
+def make_snapshot():
+    game_rng = random.Random(1)
+    engine_rng = random.Random(2)
+    for _ in range(100):
+        engine_rng.random()
+    state = CombatState(42, 6, BOSS_ENEMY_TYPE, 63, 5, 23)
+    combat = CombatSnapshot(state, 5, engine_rng.getstate(), 80, "Enemy attacked! Damage: 9", (255, 0, 0))
+    deck = [card_to_dict(card) for card in get_predefined_cards()]
+    return RunSnapshot("gameplay", "Lule", "my-pygame-game/src/assets/player1.png", 42, 6, deck,
+                       game_rng.getstate(), combat)
+
+
+def per_call(function, calls=CALLS):
+    """(median, 99th percentile) milliseconds per call."""
+    times = []
+    for i in range(calls):
+        start = time.perf_counter()
+        function(i)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.median(times) * 1000, times[int(len(times) * 0.99)] * 1000
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def report(label, timing):
+    median, p99 = timing
+    verdict = "ok" if p99 < BUDGET_MS else "over budget"
+    print(f"{label:<28}{median * 1000:>10.1f}{p99 * 1000:>10.1f}  {verdict}")
+
+
+def main():
+    snapshot = make_snapshot()
+    data = encode_snapshot(snapshot)
+    as_dict = {name: getattr(snapshot, name) for name in RunSnapshot.__slots__ if name != "combat"}
+    as_dict["combat"] = {name: getattr(snapshot.combat, name) for name in CombatSnapshot.__slots__ if name != "state"}
+    as_dict["combat"]["state"] = snapshot.combat.state.as_tuple()
+    print(f"snapshot: {len(data)} bytes (pickle {len(pickle.dumps(as_dict))}, JSON {len(json.dumps(as_dict))}), "
+          f"{len(snapshot.deck)} cards")
+
+    print(f"{'us per call':<28}{'median':>10}{'p99':>10}")
+    median, p99 = per_call(lambda i: spin(50e-6))
+    print(f"{'busy-wait 50 us':<28}{median * 1000:>10.1f}{p99 * 1000:>10.1f}  (reference)")
+    report("encode", per_call(lambda i: encode_snapshot(snapshot)))
+    report("decode", per_call(lambda i: decode_snapshot(data)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SnapshotStore(os.path.join(directory, "savegame.bin"))
+
+        def next_turn(i):
+            snapshot.player_health = snapshot.combat.state.player_health = i  # Or the save would be skipped
+            store.save(snapshot)
+        report("save (turn boundary)", per_call(next_turn))
+
+        rng_states = [random.Random(seed).getstate() for seed in (3, 4)]
+
+        def new_fight(i):
+            snapshot.rng_state = rng_states[i % 2]  # The RUN section changes too, as when a fight starts
+            store.save(snapshot)
+        report("save (new fight)", per_call(new_fight))
+        store.flush()
+        report("load", per_call(lambda i: store.load()))
+
+        def write(i):
+            next_turn(CALLS + i)
+            store.flush()
+        median, p99 = per_call(write, WRITES)
+        print(f"{'background write + fsync':<28}{median * 1000:>10.1f}{p99 * 1000:>10.1f}  (writer thread)")
+        print(f"saves {store.saves}, writes {store.writes} (saves that arrive during a write replace the pending one)")
+
+
+if __name__ == "__main__":
+    main()
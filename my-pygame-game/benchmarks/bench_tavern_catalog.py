@@ -0,0 +1,64 @@
+"""Benchmark the tavern's CardGrid as the catalog grows.
+
+Scrolling, drawing and hit-testing should cost the same for 8 cards as for
+10,000, since only one page of sprites exists at a time. Run from the
+repository root:
+
+    SDL_VIDEODRIVER=dummy python my-pygame-game/benchmarks/bench_tavern_catalog.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pygame
+from card import get_predefined_cards
+from card_sprite import CARD_ATLAS, CardGrid, build_card_sprite
+from screens.tavern_screen import TavernScreen
+from utils.assets import asset_manager
+
+CATALOG_SIZES = (8, 100, 1000, 10000)
+CALLS = 500
+
+
+def make_grid(size):
+    cards = (get_predefined_cards() * (size // 8 + 1))[:size]
+    make_sprite = lambda card: build_card_sprite(card, (150, 200), (160, 210), hover_anchor="center")
+    return CardGrid(cards, TavernScreen.CATALOG_RECT, TavernScreen.CATALOG_CELL, TavernScreen.CARD_SIZE, make_sprite)
+
+
+def time_per_call(func, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6  # microseconds
+
+
+def draw(grid, screen):
+    for _, image, rect in grid.items():
+        screen.blit(image, rect)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((1200, 800))
+    asset_manager.register_atlas(CARD_ATLAS)
+    print(f"{'catalog':>8} {'build ms':>9} {'hit us':>8} {'draw us':>9} {'scroll+draw us':>15} {'sprites':>8}")
+    for size in CATALOG_SIZES:
+        start = time.perf_counter()
+        grid = make_grid(size)
+        draw(grid, screen)
+        build_ms = (time.perf_counter() - start) * 1000
+        positions = [grid.slot_rect(i % grid.page_size).center for i in range(CALLS)]
+        hit_us = time_per_call(lambda i: grid.index_at(positions[i]), CALLS)
+        draw_us = time_per_call(lambda i: draw(grid, screen), 100)
+        step = 1 if grid.rows > grid.visible_rows else 0
+        scroll_us = time_per_call(lambda i: (grid.scroll(step if i % 200 < 100 else -step), draw(grid, screen)), 200)
+        print(f"{size:>8} {build_ms:>9.1f} {hit_us:>8.2f} {draw_us:>9.1f} {scroll_us:>15.1f} {len(grid._sprites):>8}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""Headless benchmark suite with stored baselines and regression checks.
+
+Measures the game's hot paths without a window:
+
+- ``update`` and ``draw`` per frame for every screen, plus a full redraw
+- ``load_cards_from_json`` and ``CardFactory.create_card`` as the catalog grows
+- ``EnemyFactory.create_enemy`` with the images cached and after a cache clear
+
+Each result is the best of several repeats, in microseconds per call. The
+results are compared with ``benchmarks/baseline.json``; anything slower than
+the baseline by more than the tolerance (and by more than the noise floor)
+is reported as a regression and the script exits with status 1. Baselines
+depend on the machine, so record your own before comparing. Run from the
+repository root:
+
+    python my-pygame-game/benchmarks/run_benchmarks.py --save-baseline
+    python my-pygame-game/benchmarks/run_benchmarks.py
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pygame
+from card import CardFactory, get_predefined_cards, load_cards_from_json
+from deck_store import card_to_dict
+from enemy import EnemyFactory
+from main import Game
+from player import Player
+from screens.choose_player_screen import ChoosePlayerScreen
+from utils.assets import asset_manager
+from utils.sprite_variants import clear_sprite_variants
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+TOLERANCE = 1.5  # Flag results slower than this multiple of the baseline
+NOISE_FLOOR_US = 5.0  # Ignore differences smaller than this
+REPEATS = 5
+RETRIES = 2  # Fresh-process reruns before a slowdown counts as a regression
+BASELINE_RUNS = 3  # Fresh-process runs whose median becomes the baseline
+FRAMES = 200
+CATALOG_SIZES = (100, 1000, 10000)
+BENCH_SAVE_PATH = os.path.join(tempfile.gettempdir(), "sisak_bench_savegame.bin")  # Not the player's saved run
+
+
+def measure(func, calls, repeats=REPEATS, setup=None):
+    """Best time per call over ``repeats`` runs, in microseconds.
+
+    The garbage collector is off while timing, as in ``timeit``, so a
+    collection landing in one run doesn't decide the result.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for i in range(calls):
+                func(i)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = min(best, elapsed / calls)
+    return best * 1e6
+
+
+def settle(game):
+    """Let the preloader finish so background decoding doesn't skew the timings."""
+    while game.preloader.pending_count():
+        game.preloader.poll()
+        time.sleep(0.001)
+    game.preloader.poll()
+
+
+def drive_starting_area(screen):
+    """Walk the player back and forth so the player sprite is redrawn every frame."""
+    width = screen.game.screen.get_width() - screen.player_rect.width
+    def step(i):
+        x = (i * 5) % (2 * width)
+        screen.player_x = screen.previous_x = float(x if x < width else 2 * width - x)
+    return step
+
+
+def drive_tavern(screen):
+    """Move the mouse across the catalog so cards gain and lose hover."""
+    positions = [screen.tavern_grid.slot_rect(i).center for i in range(screen.tavern_grid.page_size)]
+    positions.append((5, 5))
+    return lambda i: screen.hover(positions[i % len(positions)])
+
+
+def drive_gameplay(screen):
+    """Move the mouse across the hand so cards gain and lose hover."""
+    positions = [sprite.rect.center for sprite in screen.hand.sprites] + [(5, 5)]
+    return lambda i: screen.hand.hover(positions[i % len(positions)])
+
+
+# Screen name -> (extra arguments, function returning a per-frame driver or None)
+SCREEN_BENCHMARKS = {
+    "start": (lambda game: (), None),
+    "choose_player": (lambda game: (), None),
+    "starting_area": (lambda game: (game.selected_player,), drive_starting_area),
+    "tavern": (lambda game: (), drive_tavern),
+    "gameplay": (lambda game: (game.selected_player,), drive_gameplay),
+}
+
+
+def bench_screens(game, results):
+    name, health, image_path = ChoosePlayerScreen.PLAYER_OPTIONS[0]
+    game.selected_player = Player(name, health, image_path)
+    for name, (arguments, make_driver) in SCREEN_BENCHMARKS.items():
+        screen = game.screens.create(name, game, *arguments(game))
+        game.change_screen(screen)
+        screen.draw(game.screen)  # First frame builds the static layer
+        settle(game)
+        driver = make_driver(screen) if make_driver else (lambda i: None)
+
+        results[f"screen.{name}.update"] = measure(lambda i: screen.update(), FRAMES)
+        settle(game)
+        results[f"screen.{name}.draw"] = measure(lambda i: (driver(i), screen.draw(game.screen)), FRAMES)
+        results[f"screen.{name}.full_draw"] = measure(
+            lambda i: (screen.layer.invalidate(), screen.draw(game.screen)), FRAMES // 4)
+        pygame.event.clear()
+
+
+def write_catalog(path, size):
+    templates = [card_to_dict(card) for card in get_predefined_cards()]
+    entries = []
+    for i in range(size):
+        entry = dict(templates[i % len(templates)])
+        entry["name"] = f"{entry['name']} {i // len(templates)}"
+        entry["value"] = 1 + i % 10
+        entries.append(entry)
+    with open(path, "w") as f:
+        json.dump(entries, f)
+    return entries
+
+
+def bench_cards(results):
+    with tempfile.TemporaryDirectory() as directory:
+        for size in CATALOG_SIZES:
+            path = os.path.join(directory, f"catalog_{size}.json")
+            entries = write_catalog(path, size)
+            calls = max(1, 1000 // size)
+            # Start from no shared cards each run, as a fresh process would
+            forget = CardFactory._interned.clear
+            results[f"cards.load_cards_from_json[{size}]"] = measure(
+                lambda i: load_cards_from_json(path), calls, setup=forget)
+            arguments = [(e["type"], e["name"], e["value"], e["image_path"]) for e in entries]
+            results[f"cards.create_card[{size}]"] = measure(
+                lambda i: [CardFactory.create_card(*args) for args in arguments], calls, setup=forget)
+    CardFactory._interned.clear()
+
+
+def bench_enemies(results):
+    spawns = [(enemy_type, 100 + enemy_type * 50, 200, 2) for enemy_type in EnemyFactory.NORMAL_ENEMY_DATA]
+    boss = ("boss", 700, 150, 1)
+    for args in spawns + [boss]:
+        EnemyFactory.create_enemy(*args)  # Warm the image cache
+    results["enemy.create_enemy[normal]"] = measure(
+        lambda i: EnemyFactory.create_enemy(*spawns[i % len(spawns)]), 300)
+    results["enemy.create_enemy[boss]"] = measure(lambda i: EnemyFactory.create_enemy(*boss), 300)
+
+    def cold(i):
+        asset_manager.clear()
+        clear_sprite_variants()
+        EnemyFactory.create_enemy(*spawns[i % len(spawns)])
+    results["enemy.create_enemy[cold]"] = measure(cold, 10)
+
+
+def run(pattern="*"):
+    game = Game(save_path=BENCH_SAVE_PATH)
+    settle(game)
+    groups = [("screen", lambda results: bench_screens(game, results)),
+              ("cards", bench_cards),
+              ("enemy", bench_enemies)]
+    results = {}
+    for group, bench in groups:
+        if fnmatch.fnmatch(group, pattern.split(".")[0]):  # Skip groups the pattern rules out
+            bench(results)
+    game.deck_store.flush()
+    game.snapshots.flush()
+    pygame.quit()
+    return {name: value for name, value in results.items() if fnmatch.fnmatch(name, pattern)}
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def run_in_subprocesses(pattern, runs):
+    """Run the suite ``runs`` times, each in a fresh process. Returns one results dict per run."""
+    all_results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for attempt in range(runs):
+            path = os.path.join(directory, f"run_{attempt}.json")
+            subprocess.run([sys.executable, __file__, "--only", pattern, "--json", path, "--no-compare"],
+                           check=True, stdout=subprocess.DEVNULL)
+            with open(path) as f:
+                all_results.append(json.load(f))
+    return all_results
+
+
+def rerun(names, retries):
+    """Measure ``names`` again in fresh processes, keeping each one's best result.
+
+    Allocation-heavy benchmarks can be slow for a whole process when the
+    machine is busy, so a slowdown only counts once it shows up every time.
+    """
+    best = {}
+    for group in sorted({name.split(".")[0] for name in names}):
+        for results in run_in_subprocesses(f"{group}.*", retries):
+            for name in names:
+                if name in results:
+                    best[name] = min(results[name], best.get(name, results[name]))
+    return best
+
+
+def compare(results, baseline, tolerance, noise_floor):
+    """Rows of (name, result, baseline, ratio, status). Status is ok, REGRESSED, faster or new."""
+    rows = []
+    for name, value in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            rows.append((name, value, None, None, "new"))
+            continue
+        ratio = value / previous if previous else float("inf")
+        if ratio > tolerance and value - previous > noise_floor:
+            status = "REGRESSED"
+        elif ratio < 1 / tolerance and previous - value > noise_floor:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, value, previous, ratio, status))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare with or write")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, help=f"allowed slowdown factor (default {TOLERANCE})")
+    parser.add_argument("--only", default="*", metavar="PATTERN",
+                        help="run only benchmarks matching a glob, e.g. 'screen.tavern.*'")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH")
+    parser.add_argument("--retries", type=int, default=RETRIES,
+                        help=f"fresh-process reruns of apparent regressions (default {RETRIES})")
+    parser.add_argument("--runs", type=int, default=BASELINE_RUNS,
+                        help=f"runs whose median is saved by --save-baseline (default {BASELINE_RUNS})")
+    parser.add_argument("--no-compare", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.save_baseline and not args.no_compare:
+        # The median of several processes, so one lucky or unlucky run doesn't set the bar
+        runs = run_in_subprocesses(args.only, args.runs)
+        results = {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+    else:
+        results = run(args.only)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.no_compare:
+        return 0
+
+    stored = load_baseline(args.baseline)
+    if args.save_baseline:
+        # A partial run (--only) updates its entries and keeps the rest
+        previous = stored or {}
+        merged = dict(previous.get("results", {})) if args.only != "*" else {}
+        merged.update(results)
+        baseline = {
+            "tolerance": args.tolerance or previous.get("tolerance", TOLERANCE),
+            "noise_floor_us": previous.get("noise_floor_us", NOISE_FLOOR_US),
+            "results": {name: round(value, 2) for name, value in merged.items()},
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        for name, value in results.items():
+            print(f"{name:<40} {value:>12.1f} us")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    stored = stored or {"results": {}}
+    tolerance = args.tolerance or stored.get("tolerance", TOLERANCE)
+    noise_floor = stored.get("noise_floor_us", NOISE_FLOOR_US)
+    rows = compare(results, stored["results"], tolerance, noise_floor)
+    suspects = [row[0] for row in rows if row[4] == "REGRESSED"]
+    if suspects and args.retries > 0:
+        print(f"Re-measuring {len(suspects)} apparent regression(s)...")
+        for name, value in rerun(suspects, args.retries).items():
+            results[name] = min(results[name], value)
+        rows = compare(results, stored["results"], tolerance, noise_floor)
+    print(f"{'benchmark':<40} {'us':>12} {'baseline':>12} {'ratio':>7}  status")
+    for name, value, previous, ratio, status in rows:
+        previous = f"{previous:12.1f}" if previous is not None else f"{'-':>12}"
+        ratio = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{name:<40} {value:>12.1f} {previous} {ratio}  {status}")
+    regressions = [row[0] for row in rows if row[4] == "REGRESSED"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {tolerance:.2f}x: {', '.join(regressions)}")
+        return 1
+    print(f"No regressions beyond {tolerance:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
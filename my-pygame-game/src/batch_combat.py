@@ -0,0 +1,193 @@
+"""Vectorized combat: many independent fights advanced at once as NumPy arrays.
+
+Follows the same rules as ``combat_engine``, but instead of one Python
+object per fight every field (player health, shield, enemy health, round,
+alive mask) is an array, and each turn is a handful of array operations
+across all fights still running. Meant for balance tuning where millions
+of fights are needed; the rules constants can be overridden per call.
+"""
+import numpy as np
+
+from combat_engine import (ATTACK_DAMAGE, BOSS_HEALTH, ENEMY_HEAL, KIND_ATTACK, KIND_HEAL, KIND_SHIELD,
+                           MAX_ROUNDS, NORMAL_ENEMY_HEALTH, CombatState, boss_decisions, greedy_policy)
+
+# Outcome codes in the per-fight result array
+OUTCOME_TIMEOUT = 0
+OUTCOME_WIN = 1
+OUTCOME_LOSE = -1
+
+
+def _deck_arrays(decks, fights):
+    """Return (kinds, values) arrays of shape (fights, hand) from one deck or one deck per fight."""
+    decks = np.asarray(decks, dtype=np.int32)
+    if decks.ndim == 2:  # One deck shared by every fight
+        decks = np.broadcast_to(decks, (fights,) + decks.shape)
+    if decks.shape[0] != fights or decks.shape[2] != 2:
+        raise ValueError("decks must be (hand, 2) or (fights, hand, 2) arrays of (kind, value)")
+    return decks[:, :, 0], decks[:, :, 1]
+
+
+def _greedy_actions(decks, fights, player_health):
+    """Precompute greedy_policy's low-health and normal choice for each fight."""
+    decks = np.asarray(decks, dtype=np.int32)
+    if decks.ndim == 2:
+        low = greedy_policy(CombatState(1), decks.tolist())
+        high = greedy_policy(CombatState(player_health + 1000), decks.tolist())
+        return np.full(fights, low, dtype=np.int32), np.full(fights, high, dtype=np.int32)
+    cache = {}
+    low = np.empty(fights, dtype=np.int32)
+    high = np.empty(fights, dtype=np.int32)
+    for i, deck in enumerate(decks):
+        key = deck.tobytes()
+        if key not in cache:
+            deck = deck.tolist()
+            cache[key] = (greedy_policy(CombatState(1), deck), greedy_policy(CombatState(player_health + 1000), deck))
+        low[i], high[i] = cache[key]
+    return low, high
+
+
+def _boss_deciders(enemy_ai, decks, fights):
+    """(deck number per fight, function from deck number to its boss_decisions) for the boss AI."""
+    decks = np.asarray(decks, dtype=np.int32)
+    if decks.ndim == 2:
+        unique, deck_ids = decks[np.newaxis], np.zeros(fights, dtype=np.intp)
+    else:
+        unique, deck_ids = np.unique(decks, axis=0, return_inverse=True)
+    deciders = {}
+
+    def decider(deck_id):
+        decide = deciders.get(deck_id)
+        if decide is None:
+            deck = tuple(map(tuple, unique[deck_id].tolist()))
+            decide = deciders[deck_id] = boss_decisions(enemy_ai, deck)
+        return decide
+    return deck_ids.reshape(fights), decider
+
+
+def simulate_batch(decks, player_health, fights, seed=None, policy="random", max_rounds=MAX_ROUNDS,
+                   max_turns=1000, normal_enemy_health=NORMAL_ENEMY_HEALTH, boss_health=BOSS_HEALTH,
+                   enemy_heal=ENEMY_HEAL, attack_damage=ATTACK_DAMAGE, enemy_ai=None):
+    """Simulate ``fights`` full runs at once.
+
+    Args:
+        decks: One deck as (kind, value) pairs, or an array of shape
+            (fights, hand, 2) giving each fight its own deck.
+        player_health (int or array): Starting player health, scalar or per fight.
+        fights (int): Number of independent fights.
+        seed: Seed for the NumPy generator.
+        policy (str): "attack", "random" or "greedy", as in combat_engine.simulate.
+        enemy_ai: Factory for the boss's AI as in combat_engine.simulate, e.g.
+            enemy_ai.enemy_ai_for; its decisions are made one fight at a
+            time, so boss rounds run at Python speed, and it plays by
+            combat_engine's rules whatever is overridden here. None flips
+            a coin.
+
+    Returns:
+        dict: Aggregate wins/losses/timeouts/win_rate/avg_turns/avg_round, plus
+        per-fight "outcome", "turns" and "round" arrays.
+    """
+    rng = np.random.default_rng(seed)
+    kinds, values = _deck_arrays(decks, fights)
+    hand = kinds.shape[1]
+    low, high = attack_damage
+    spread = high - low + 1
+
+    if policy == "greedy":
+        low_action, high_action = _greedy_actions(decks, fights, int(np.max(player_health)))
+    elif policy not in ("attack", "random"):
+        raise ValueError(f"Unknown policy: {policy}")
+    if enemy_ai is not None:
+        deck_ids, boss_decider = _boss_deciders(enemy_ai, decks, fights)
+
+    # Per-fight results, indexed by the fight's original position
+    outcome = np.zeros(fights, dtype=np.int8)
+    turns_out = np.zeros(fights, dtype=np.int32)
+    round_out = np.ones(fights, dtype=np.int32)
+
+    # Working state for the fights still running; shrinks as fights finish
+    index = np.arange(fights)
+    health = np.broadcast_to(np.asarray(player_health, dtype=np.int32), (fights,)).copy()
+    shield = np.zeros(fights, dtype=np.int32)
+    enemy_health = np.full(fights, normal_enemy_health, dtype=np.int32)
+    boss = np.zeros(fights, dtype=bool)
+    rounds = np.ones(fights, dtype=np.int32)
+    if policy == "greedy":
+        low_action = low_action.copy()
+        high_action = high_action.copy()
+
+    turn = 0
+    while index.size:
+        alive = index.size
+
+        # Player action: -1 is the basic attack, otherwise a card index
+        if policy == "attack":
+            action = np.full(alive, -1, dtype=np.int32)
+        elif policy == "random":
+            action = rng.integers(-1, hand, size=alive, dtype=np.int32)
+        else:
+            action = np.where(health <= 15, low_action, high_action)
+        is_attack = action < 0
+        card = np.maximum(action, 0)
+        card_kind = np.where(is_attack, -1, kinds[index, card])
+        card_value = values[index, card]
+        roll = low + rng.integers(0, spread, size=alive, dtype=np.int32)
+        enemy_health -= np.where(is_attack, roll, np.where(card_kind == KIND_ATTACK, card_value, 0))
+        health += np.where(card_kind == KIND_HEAL, card_value, 0)
+        shield += np.where(card_kind == KIND_SHIELD, card_value, 0)
+
+        # Enemy turn: the lower half of one roll means attack, and also picks the damage
+        enemy_roll = rng.random(alive)
+        enemy_attacks = enemy_roll < 0.5
+        damage = np.where(enemy_attacks, low + (enemy_roll * 2 * spread).astype(np.int32), 0)
+        if enemy_ai is not None and boss.any():
+            # The boss AI chooses instead of the roll; an attack then uses the whole roll for damage
+            for i in np.flatnonzero(boss):
+                decide = boss_decider(deck_ids[index[i]])
+                boss_action = decide(int(health[i]), int(shield[i]), int(enemy_health[i]))
+                if boss_action is not None:
+                    enemy_attacks[i] = boss_action == "attack"
+                    damage[i] = low + int(enemy_roll[i] * spread) if enemy_attacks[i] else 0
+        absorbed = np.minimum(shield, damage)  # Shield soaks damage before health
+        shield -= absorbed
+        health -= damage - absorbed
+        enemy_health += np.where(enemy_attacks, 0, enemy_heal)
+
+        # Round progression
+        turn += 1
+        enemy_dead = enemy_health <= 0
+        won = enemy_dead & boss
+        advance = enemy_dead & ~boss
+        rounds += advance
+        becomes_boss = advance & (rounds >= max_rounds)
+        enemy_health = np.where(becomes_boss, boss_health, np.where(advance, normal_enemy_health, enemy_health))
+        boss |= becomes_boss
+        lost = ~won & (health <= 0)
+        timed_out = ~won & ~lost & (turn >= max_turns)
+
+        finished = won | lost | timed_out
+        if finished.any():
+            done = index[finished]
+            outcome[done] = np.where(won[finished], OUTCOME_WIN, np.where(lost[finished], OUTCOME_LOSE, OUTCOME_TIMEOUT))
+            turns_out[done] = turn
+            round_out[done] = rounds[finished]
+            keep = ~finished
+            index = index[keep]
+            health, shield, enemy_health = health[keep], shield[keep], enemy_health[keep]
+            boss, rounds = boss[keep], rounds[keep]
+            if policy == "greedy":
+                low_action, high_action = low_action[keep], high_action[keep]
+
+    wins = int(np.count_nonzero(outcome == OUTCOME_WIN))
+    losses = int(np.count_nonzero(outcome == OUTCOME_LOSE))
+    return {
+        "runs": fights,
+        "wins": wins,
+        "losses": losses,
+        "timeouts": fights - wins - losses,
+        "win_rate": wins / fights if fights else 0.0,
+        "avg_turns": float(turns_out.mean()) if fights else 0.0,
+        "avg_round": float(round_out.mean()) if fights else 0.0,
+        "outcome": outcome,
+        "turns": turns_out,
+        "round": round_out,
+    }
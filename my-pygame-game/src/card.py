@@ -1,13 +1,17 @@
 import json
 import os
+import posixpath
+import sys
 from abc import ABC, abstractmethod
 
 # Base Card Class
 class Card(ABC):
+    __slots__ = ("name", "value", "image_path")  # Catalogs hold thousands of cards, keep them small
+
     def __init__(self, name, value, image_path):
-        self.name = name
+        self.name = sys.intern(name)
         self.value = value
-        self.image_path = image_path
+        self.image_path = sys.intern(image_path)
 
     @abstractmethod
     def use(self, target):
@@ -18,16 +22,22 @@ class Card(ABC):
 
 # Card Types
 class AttackCard(Card):
+    __slots__ = ()
+
     def use(self, target):
         target.health -= self.value
         print(f"{self.name} used on {target}. Damage: {self.value}")
 
 class HealCard(Card):
+    __slots__ = ()
+
     def use(self, target):
         target.health += self.value
         print(f"{self.name} used on {target}. Heal: {self.value}")
 
 class ShieldCard(Card):
+    __slots__ = ()
+
     def use(self, target):
         target.shield += self.value
         print(f"{self.name} used on {target}. Shield: {self.value}")
@@ -35,6 +45,7 @@ class ShieldCard(Card):
 # Factory Class
 class CardFactory:
     _card_types = {}
+    _interned = {}  # (type, name, value, image_path) -> card; identical cards share one object, so never edit one
 
     @classmethod
     def register_card(cls, card_type, card_class):
@@ -47,26 +58,41 @@ class CardFactory:
         # Ensure the image path is relative to the assets/Kartice directory
         if not image_path.startswith('my-pygame-game/src/assets/Kartice'):
             image_path = os.path.join('my-pygame-game/src/assets/Kartice', image_path)
-        return cls._card_types[card_type](name, value, image_path)
+        key = (card_type, name, value, image_path)
+        card = cls._interned.get(key)
+        if card is None:
+            card = cls._interned[key] = cls._card_types[card_type](name, value, image_path)
+        return card
+
+    @classmethod
+    def card_type(cls, card):
+        """Return the registered type name of a card, e.g. "attack"."""
+        for card_type, card_class in cls._card_types.items():
+            if type(card) is card_class:
+                return card_type
+        raise ValueError(f"Card class '{type(card).__name__}' is not registered.")
 
 # Register card types
 CardFactory.register_card("attack", AttackCard)
 CardFactory.register_card("heal", HealCard)
 CardFactory.register_card("shield", ShieldCard)
 
+def normalize_image_path(path):
+    """Use forward slashes so saved paths work on every platform."""
+    return posixpath.normpath(path.replace("\\", "/"))
+
+# The one parser for card JSON, shared by the saved deck and the card catalog
+def cards_from_json(card_data):
+    """Build cards from parsed JSON entries. Raises KeyError, TypeError or ValueError on a bad entry."""
+    create = CardFactory.create_card
+    return [create(entry['type'], entry['name'], entry['value'],
+                   normalize_image_path(entry.get('image_path', 'default.png')))  # Placeholder image if missing
+            for entry in card_data]
+
 # Function to load cards from JSON file
 def load_cards_from_json(file_path):
     with open(file_path, 'r') as file:
-        card_data = json.load(file)
-    cards = []
-    for card_info in card_data:
-        card_type = card_info['type']
-        name = card_info['name']
-        value = card_info['value']
-        image_path = card_info.get('image_path', 'default.png')  # Provide a placeholder image path if missing
-        card = CardFactory.create_card(card_type, name, value, image_path)
-        cards.append(card)
-    return cards
+        return cards_from_json(json.load(file))
 
 # Function to get predefined cards
 def get_predefined_cards():
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import time
+
+from card import CardFactory, cards_from_json, get_predefined_cards
+
+
+class CardDatabase:
+    """The card catalog, loaded once and indexed by name and type.
+
+    With a ``path`` the catalog is read from a JSON file in the same format
+    as saved_cards.json and rebuilt only when the file changes: a stat of
+    its mtime and size first, then a content hash, so touching the file
+    without editing it rebuilds nothing. Without a path it holds the
+    predefined cards. Cards come from CardFactory, so identical entries
+    are one shared object.
+
+    Lookups check the file at most every ``check_interval`` seconds;
+    ``refresh`` checks it right away. A file that is missing or can't be
+    parsed keeps the previous catalog and is retried at the next check.
+    """
+
+    def __init__(self, path=None, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._next_check = 0.0
+        self._cards = ()
+        self._by_name = {}
+        self._by_type = {}
+        self._stat = None  # (mtime_ns, size) of the file the catalog was built from
+        self._digest = None
+        self.version = 0  # Bumped every time the catalog is rebuilt
+        self.last_error = None
+
+    def refresh(self):
+        """Rebuild the catalog if its file changed. Returns True if it was rebuilt."""
+        self._next_check = time.monotonic() + self.check_interval
+        if self.path is None:
+            if self.version:
+                return False
+            self._build(get_predefined_cards())
+            return True
+        try:
+            stat = os.stat(self.path)
+            file_stat = (stat.st_mtime_ns, stat.st_size)
+            if file_stat == self._stat:
+                return False
+            with open(self.path, "rb") as file:
+                raw = file.read()
+            digest = hashlib.sha1(raw).hexdigest()
+            if digest == self._digest:
+                self._stat = file_stat
+                return False
+            cards = cards_from_json(json.loads(raw))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if str(e) != str(self.last_error):  # Once per problem, not at every check
+                print(f"Warning: keeping the card catalog, could not load {self.path}: {e}")
+            self.last_error = e
+            return False
+        self.last_error = None
+        self._build(cards)
+        self._stat, self._digest = file_stat, digest  # Only once the catalog really is this version
+        return True
+
+    def _build(self, cards):
+        self._cards = tuple(cards)
+        by_name, by_type, type_names = {}, {}, {}
+        for card in self._cards:
+            by_name.setdefault(card.name, card)
+            card_class = type(card)
+            card_type = type_names.get(card_class)
+            if card_type is None:
+                card_type = type_names[card_class] = CardFactory.card_type(card)
+            by_type.setdefault(card_type, []).append(card)
+        self._by_name = by_name
+        self._by_type = {card_type: tuple(cards) for card_type, cards in by_type.items()}
+        self.version += 1
+
+    def _check(self):
+        if time.monotonic() >= self._next_check:
+            self.refresh()
+
+    def cards(self):
+        """Return the catalog as a new list the caller may rearrange."""
+        self._check()
+        return list(self._cards)
+
+    def find(self, name):
+        """Return the first card called ``name``, or None."""
+        self._check()
+        return self._by_name.get(name)
+
+    def of_type(self, card_type):
+        """Return every card of a registered type, e.g. "heal"."""
+        self._check()
+        return self._by_type.get(card_type, ())
+
+    def __len__(self):
+        self._check()
+        return len(self._cards)
+
+
+# Shared catalog used by the screens
+card_database = CardDatabase()
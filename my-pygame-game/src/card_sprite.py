@@ -0,0 +1,281 @@
+import pygame
+from utils.assets import asset_manager
+
+DEFAULT_CARD_IMAGE = 'my-pygame-game/src/assets/Kartice/default.png'
+CARD_ATLAS = 'my-pygame-game/src/assets/atlas/cards.json'  # Built by tools/build_card_atlas.py
+
+
+class CardSprite:
+    """A card with its normal and hovered surfaces built once up front.
+
+    Hovering only switches which cached surface is blitted, so no scaling
+    happens on mouse motion or during draw.
+    """
+
+    def __init__(self, card, normal_image, hovered_image, hover_anchor="topleft"):
+        self.card = card
+        self.normal_image = normal_image
+        self.hovered_image = hovered_image
+        self.hover_anchor = hover_anchor  # "topleft" grows right/down, "center" grows evenly
+        self.rect = pygame.Rect((0, 0), normal_image.get_size() if normal_image else (0, 0))
+        self.hovered_rect = self.rect.copy()
+        self.is_hovered = False
+
+    def move_to(self, x, y):
+        """Place the normal rect and recompute where the hovered image goes."""
+        self.rect.topleft = (x, y)
+        if self.hovered_image is not None:
+            self.hovered_rect = self.hovered_image.get_rect()
+            setattr(self.hovered_rect, self.hover_anchor, getattr(self.rect, self.hover_anchor))
+        else:
+            self.hovered_rect = self.rect.copy()
+
+    @property
+    def image(self):
+        return self.hovered_image if self.is_hovered else self.normal_image
+
+    @property
+    def draw_rect(self):
+        return self.hovered_rect if self.is_hovered else self.rect
+
+    def draw(self, screen):
+        image = self.image
+        if image is not None:
+            screen.blit(image, self.draw_rect)
+
+
+def build_card_sprite(card, size, hover_size, image_path=None, fallback=DEFAULT_CARD_IMAGE,
+                      hover_anchor="topleft"):
+    """Create a CardSprite, scaling both variants straight from the source image.
+
+    With ``fallback=None`` a missing image leaves the sprite without art but
+    still clickable.
+    """
+    image_path = image_path or card.image_path
+    try:
+        normal = asset_manager.get(image_path, size)
+        hovered = asset_manager.get(image_path, hover_size)
+    except (pygame.error, FileNotFoundError):
+        print(f"Warning: Image for {card.name} not found at {image_path}")
+        if fallback is None:
+            normal = hovered = None
+        else:
+            normal = asset_manager.get(fallback, size)
+            hovered = asset_manager.get(fallback, hover_size)
+    sprite = CardSprite(card, normal, hovered, hover_anchor)
+    if normal is None:
+        sprite.rect.size = size
+    return sprite
+
+
+class CardHand:
+    """A row of evenly spaced CardSprites with constant-time hover and hit tests."""
+
+    def __init__(self, sprites, x, y, spacing):
+        self.sprites = list(sprites)
+        self.y = y
+        self.spacing = spacing
+        self.hovered_index = None
+        self.layout(x)
+
+    def layout(self, x):
+        """Position every sprite in the row starting at ``x``."""
+        self.x = x
+        for i, sprite in enumerate(self.sprites):
+            sprite.move_to(x + i * self.spacing, self.y)
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def __getitem__(self, index):
+        return self.sprites[index]
+
+    def __setitem__(self, index, sprite):
+        self.sprites[index] = sprite
+        sprite.is_hovered = index == self.hovered_index
+        sprite.move_to(self.x + index * self.spacing, self.y)
+
+    def index_at(self, pos):
+        """Return the index of the topmost card under ``pos``, or None."""
+        # The hovered card may be drawn larger than its slot, so check it first
+        if self.hovered_index is not None and self.sprites[self.hovered_index].hovered_rect.collidepoint(pos):
+            return self.hovered_index
+        if not self.sprites or self.spacing <= 0:
+            return None
+        x, y = pos
+        last = min(len(self.sprites) - 1, (x - self.x) // self.spacing)
+        # Cards can be wider than the spacing, so at most a couple of slots overlap
+        for i in range(last, -1, -1):
+            rect = self.sprites[i].rect
+            if x > rect.right:
+                break
+            if rect.collidepoint(pos):
+                return i
+        return None
+
+    def hover(self, pos):
+        """Update the hovered card. Returns True if the hovered card changed."""
+        index = self.index_at(pos)
+        if index == self.hovered_index:
+            return False
+        if self.hovered_index is not None:
+            self.sprites[self.hovered_index].is_hovered = False
+        if index is not None:
+            self.sprites[index].is_hovered = True
+        self.hovered_index = index
+        return True
+
+    def items(self):
+        """Yield (sprite, image, rect) in draw order, as expected by DirtyLayer."""
+        for sprite in self.sprites:
+            if not sprite.is_hovered and sprite.image is not None:
+                yield sprite, sprite.image, sprite.draw_rect
+        # Draw the hovered card last so it sits on top of its neighbours
+        if self.hovered_index is not None:
+            sprite = self.sprites[self.hovered_index]
+            if sprite.image is not None:
+                yield sprite, sprite.image, sprite.draw_rect
+
+    def draw(self, screen):
+        for _, image, rect in self.items():
+            screen.blit(image, rect)
+
+
+class CardGrid:
+    """A scrollable grid of cards where only the visible rows have sprites.
+
+    Cards are laid out in ``columns`` across the viewport ``rect`` and
+    scrolled a row (or a page) at a time. Sprites, and so the card images,
+    are built by ``make_sprite(card)`` the first time a card scrolls into
+    view and dropped again once it scrolls out, so a catalog of thousands
+    of cards costs no more per frame than one page. Hit tests work out the
+    grid cell from the position, so they take constant time.
+    """
+
+    def __init__(self, cards, rect, cell_size, card_size, make_sprite):
+        self.cards = cards  # Shared with the owner, edited through replace()
+        self.rect = pygame.Rect(rect)
+        self.cell_width, self.cell_height = cell_size
+        self.card_width, self.card_height = card_size
+        self.make_sprite = make_sprite
+        self.columns = max(1, self.rect.width // self.cell_width)
+        self.visible_rows = max(1, self.rect.height // self.cell_height)
+        # Center the columns in the viewport
+        self.left = self.rect.left + (self.rect.width - self.columns * self.cell_width) // 2
+        self.first_row = 0
+        self.hovered_index = None
+        self._sprites = {}  # card index -> CardSprite, only for cards currently in view
+
+    def __len__(self):
+        return len(self.cards)
+
+    @property
+    def rows(self):
+        return -(-len(self.cards) // self.columns)
+
+    @property
+    def page_size(self):
+        return self.columns * self.visible_rows
+
+    @property
+    def page(self):
+        """Current page number, counted from 0."""
+        return -(-self.first_row // self.visible_rows)
+
+    @property
+    def pages(self):
+        return max(1, -(-self.rows // self.visible_rows))
+
+    def visible_range(self):
+        """Return the (start, stop) card indices in view."""
+        start = self.first_row * self.columns
+        return start, min(len(self.cards), start + self.page_size)
+
+    def scroll(self, rows):
+        """Scroll by ``rows`` (negative scrolls up). Returns True if the view moved."""
+        first_row = max(0, min(self.first_row + rows, self.rows - self.visible_rows))
+        if first_row == self.first_row:
+            return False
+        self.first_row = first_row
+        start, stop = self.visible_range()
+        for index in [i for i in self._sprites if not start <= i < stop]:
+            del self._sprites[index]
+        if self.hovered_index is not None and not start <= self.hovered_index < stop:
+            self.hovered_index = None
+        for index, sprite in self._sprites.items():
+            self._place(index, sprite)
+        return True
+
+    def scroll_page(self, pages):
+        return self.scroll(pages * self.visible_rows)
+
+    def slot_rect(self, index):
+        """Where the card at ``index`` sits on screen (meaningful while it is in view)."""
+        row, column = divmod(index, self.columns)
+        x = self.left + column * self.cell_width + (self.cell_width - self.card_width) // 2
+        y = self.rect.top + (row - self.first_row) * self.cell_height + (self.cell_height - self.card_height) // 2
+        return pygame.Rect(x, y, self.card_width, self.card_height)
+
+    def _place(self, index, sprite):
+        sprite.move_to(*self.slot_rect(index).topleft)
+        sprite.is_hovered = index == self.hovered_index
+
+    def sprite(self, index):
+        """Return the sprite for the card at ``index``, building it on first use."""
+        sprite = self._sprites.get(index)
+        if sprite is None:
+            sprite = self.make_sprite(self.cards[index])
+            self._place(index, sprite)
+            self._sprites[index] = sprite
+        return sprite
+
+    def replace(self, index, card, sprite=None):
+        """Put ``card`` at ``index``, reusing ``sprite`` if given or rebuilding it when next drawn."""
+        self.cards[index] = card
+        if sprite is None:
+            self._sprites.pop(index, None)
+            if index == self.hovered_index:
+                self.sprite(index)  # Keep a sprite for the hovered card
+        else:
+            self._place(index, sprite)
+            self._sprites[index] = sprite
+
+    def index_at(self, pos):
+        """Return the index of the card under ``pos``, or None."""
+        if self.hovered_index is not None and self._sprites[self.hovered_index].hovered_rect.collidepoint(pos):
+            return self.hovered_index
+        if not self.rect.collidepoint(pos):
+            return None
+        x, y = pos
+        column = (x - self.left) // self.cell_width
+        row = (y - self.rect.top) // self.cell_height
+        if not 0 <= column < self.columns or row >= self.visible_rows:
+            return None
+        index = (self.first_row + row) * self.columns + column
+        if index >= len(self.cards) or not self.slot_rect(index).collidepoint(pos):
+            return None
+        return index
+
+    def hover(self, pos):
+        """Update the hovered card. Returns True if the hovered card changed."""
+        index = self.index_at(pos)
+        if index == self.hovered_index:
+            return False
+        if self.hovered_index is not None:
+            self._sprites[self.hovered_index].is_hovered = False
+        self.hovered_index = index
+        if index is not None:
+            self.sprite(index).is_hovered = True
+        return True
+
+    def items(self):
+        """Yield (sprite, image, rect) for the cards in view, hovered card last."""
+        start, stop = self.visible_range()
+        for index in range(start, stop):
+            sprite = self.sprite(index)
+            if index != self.hovered_index and sprite.image is not None:
+                yield sprite, sprite.image, sprite.draw_rect
+        if self.hovered_index is not None:
+            sprite = self._sprites[self.hovered_index]
+            if sprite.image is not None:
+                yield sprite, sprite.image, sprite.draw_rect
@@ -0,0 +1,374 @@
+"""Combat rules without any pygame dependency.
+
+GameplayScreen is a view over a CombatEngine, and the same engine can run
+thousands of fights per second headless for balance testing.
+"""
+import random
+
+from card import AttackCard, HealCard, ShieldCard
+
+# Player actions: a card index, or the basic attack bound to the E key
+ATTACK = -1
+
+# Card kinds, kept as small ints so decks are cheap to copy and compare
+KIND_ATTACK = 0
+KIND_HEAL = 1
+KIND_SHIELD = 2
+KIND_NAMES = ("attack", "heal", "shield")
+
+# Combat numbers, matching the original GameplayScreen rules
+MAX_ROUNDS = 5  # The boss appears in this round
+NORMAL_ENEMY_TYPES = (1, 2, 3)  # Keys of EnemyFactory.NORMAL_ENEMY_DATA
+BOSS_ENEMY_TYPE = "boss"
+NORMAL_ENEMY_HEALTH = 10
+BOSS_HEALTH = 100
+ATTACK_DAMAGE = (5, 15)  # Player basic attack and enemy attack roll
+ENEMY_HEAL = 5
+
+WIN = "win"
+LOSE = "lose"
+
+
+def deck_from_cards(cards):
+    """Convert Card objects to the engine's compact (kind, value) tuples."""
+    deck = []
+    for card in cards:
+        if isinstance(card, AttackCard):
+            deck.append((KIND_ATTACK, card.value))
+        elif isinstance(card, HealCard):
+            deck.append((KIND_HEAL, card.value))
+        elif isinstance(card, ShieldCard):
+            deck.append((KIND_SHIELD, card.value))
+        else:
+            raise ValueError(f"Unsupported card type: {type(card).__name__}")
+    return tuple(deck)
+
+
+class CombatState:
+    """Everything needed to describe a fight at a turn boundary."""
+
+    __slots__ = ("player_health", "player_shield", "enemy_type", "enemy_health", "round", "turns", "outcome")
+
+    def __init__(self, player_health, player_shield=0, enemy_type=1, enemy_health=NORMAL_ENEMY_HEALTH,
+                 round=1, turns=0, outcome=None):
+        self.player_health = player_health
+        self.player_shield = player_shield
+        self.enemy_type = enemy_type
+        self.enemy_health = enemy_health
+        self.round = round
+        self.turns = turns
+        self.outcome = outcome
+
+    def copy(self):
+        return CombatState(self.player_health, self.player_shield, self.enemy_type, self.enemy_health,
+                           self.round, self.turns, self.outcome)
+
+    def as_tuple(self):
+        return (self.player_health, self.player_shield, self.enemy_type, self.enemy_health,
+                self.round, self.turns, self.outcome)
+
+    def __repr__(self):
+        return f"CombatState{self.as_tuple()}"
+
+
+class CombatEngine:
+    """Runs one fight: player action, enemy turn, then round progression.
+
+    Args:
+        deck (tuple): (kind, value) pairs, see ``deck_from_cards``.
+        player_health (int): Starting player health.
+        player_shield (int): Starting player shield.
+        seed: Seed for the engine's private RNG, so fights can be replayed.
+        max_rounds (int): Round in which the boss appears.
+    """
+
+    def __init__(self, deck, player_health, player_shield=0, seed=None, max_rounds=MAX_ROUNDS):
+        self.deck = tuple(deck)
+        self.max_rounds = max_rounds
+        self.rng = random.Random(seed)
+        self.state = CombatState(player_health, player_shield)
+        self.state.enemy_type = self._roll_enemy_type()
+
+    @classmethod
+    def restore(cls, deck, state, rng_state, max_rounds=MAX_ROUNDS):
+        """An engine carrying on from a saved ``state`` and ``rng.getstate()``, see snapshot.py."""
+        engine = cls(deck, state.player_health, state.player_shield, seed=0, max_rounds=max_rounds)
+        engine.state = state.copy()
+        engine.rng.setstate(rng_state)
+        return engine
+
+    @property
+    def is_over(self):
+        return self.state.outcome is not None
+
+    def _roll_enemy_type(self):
+        return NORMAL_ENEMY_TYPES[int(self.rng.random() * len(NORMAL_ENEMY_TYPES))]
+
+    def _roll_damage(self):
+        low, high = ATTACK_DAMAGE
+        return low + int(self.rng.random() * (high - low + 1))
+
+    def attack(self):
+        """Player basic attack. Returns the damage dealt."""
+        damage = self._roll_damage()
+        self.state.enemy_health -= damage
+        return damage
+
+    def use_card(self, index):
+        """Apply a card from the deck. Returns its (kind, value)."""
+        kind, value = self.deck[index]
+        state = self.state
+        if kind == KIND_ATTACK:
+            state.enemy_health -= value
+        elif kind == KIND_HEAL:
+            state.player_health += value
+        else:
+            state.player_shield += value
+        return kind, value
+
+    def player_action(self, action):
+        """Run ``ATTACK`` or a card index. Returns the attack damage or the card's (kind, value)."""
+        if action == ATTACK:
+            return self.attack()
+        return self.use_card(action)
+
+    def enemy_turn(self, action=None):
+        """The enemy attacks or heals. Returns ("attack", damage) or ("heal", amount).
+
+        ``action`` is "attack" or "heal" as chosen by an enemy AI; None
+        flips a coin. Shield absorbs damage first; a fully absorbed hit
+        reports 0 damage.
+        """
+        state = self.state
+        low, high = ATTACK_DAMAGE
+        if action is None:
+            roll = self.rng.random()
+            # The lower half of the roll picks "attack" and, rescaled, the damage
+            damage = low + int(roll * 2 * (high - low + 1)) if roll < 0.5 else None
+        elif action == "attack":
+            damage = self._roll_damage()
+        elif action == "heal":
+            damage = None
+        else:
+            raise ValueError(f"Unknown enemy action: {action}")
+        if damage is not None:
+            if state.player_shield > 0:
+                if damage > state.player_shield:
+                    state.player_health -= damage - state.player_shield
+                    state.player_shield = 0
+                else:
+                    state.player_shield -= damage
+                    damage = 0
+            else:
+                state.player_health -= damage
+            return "attack", damage
+        state.enemy_health += ENEMY_HEAL
+        return "heal", ENEMY_HEAL
+
+    def end_round(self):
+        """Advance rounds after a full turn. Returns WIN, LOSE or None."""
+        state = self.state
+        state.turns += 1
+        if state.enemy_health <= 0:
+            if state.enemy_type == BOSS_ENEMY_TYPE:
+                state.outcome = WIN
+                return WIN
+            state.round += 1
+            if state.round < self.max_rounds:
+                state.enemy_type = self._roll_enemy_type()
+                state.enemy_health = NORMAL_ENEMY_HEALTH
+            else:
+                state.enemy_type = BOSS_ENEMY_TYPE
+                state.enemy_health = BOSS_HEALTH
+        if state.player_health <= 0:
+            state.outcome = LOSE
+            return LOSE
+        return None
+
+    def play_turn(self, action, enemy_ai=None):
+        """Player action, enemy turn and round progression in one call.
+
+        ``enemy_ai(enemy_type)`` returns the AI for the current enemy (see
+        enemy_ai.enemy_ai_for), which gets its full node budget; without
+        one the enemy flips a coin.
+        """
+        self.player_action(action)
+        enemy_action = None
+        if enemy_ai is not None:
+            enemy_action = enemy_ai(self.state.enemy_type).decide(self.state, self.deck)
+        self.enemy_turn(enemy_action)
+        return self.end_round()
+
+    def run(self, policy, max_turns=1000, enemy_ai=None):
+        """Play until the fight ends. ``policy(state, deck)`` returns an action."""
+        while self.state.outcome is None and self.state.turns < max_turns:
+            self.play_turn(policy(self.state, self.deck), enemy_ai)
+        return self.state
+
+
+def attack_policy(state, deck):
+    """Always use the basic attack."""
+    return ATTACK
+
+
+def make_random_policy(rng):
+    """Pick uniformly between the basic attack and every card."""
+    def policy(state, deck):
+        return int(rng.random() * (len(deck) + 1)) - 1
+    return policy
+
+
+def greedy_policy(state, deck):
+    """Heal or shield when low on health, otherwise deal the most expected damage."""
+    if state.player_health <= 15:
+        best, best_value = None, 0
+        for index, (kind, value) in enumerate(deck):
+            if kind != KIND_ATTACK and value > best_value:
+                best, best_value = index, value
+        if best is not None:
+            return best
+    best, best_value = ATTACK, sum(ATTACK_DAMAGE) / 2
+    for index, (kind, value) in enumerate(deck):
+        if kind == KIND_ATTACK and value > best_value:
+            best, best_value = index, value
+    return best
+
+
+def boss_decisions(enemy_ai, deck):
+    """``decide(health, shield, enemy_health)`` for the boss ``enemy_ai(BOSS_ENEMY_TYPE)``, memoized.
+
+    For the simulators, which see the same boss positions over and over.
+    The AI's decision must only depend on those three numbers and the
+    deck, as ExpectimaxEnemyAI's does. None means flip a coin, as for
+    ``CombatEngine.enemy_turn``.
+    """
+    ai = enemy_ai(BOSS_ENEMY_TYPE)
+    deck = tuple(deck)
+    decisions = {}
+
+    def decide(health, shield, enemy_health):
+        key = (health, shield, enemy_health)
+        if key not in decisions:
+            decisions[key] = ai.decide(CombatState(health, shield, BOSS_ENEMY_TYPE, enemy_health), deck)
+        return decisions[key]
+    return decide
+
+
+def simulate(deck, player_health, runs, seed=None, policy="random", max_rounds=MAX_ROUNDS, max_turns=1000,
+             enemy_ai=None):
+    """Play ``runs`` full fights as fast as possible and return aggregate results.
+
+    This is the same rules as CombatEngine inlined into one loop, for balance
+    testing where per-call overhead matters. ``policy`` is "attack", "random"
+    or "greedy". ``enemy_ai`` is a factory as for ``CombatEngine.run``
+    (usually enemy_ai.enemy_ai_for, so the boss plays as it does in the
+    game); only the boss's AI is used, see ``boss_decisions``, and normal
+    enemies flip a coin as they do in the game. Without it the boss flips
+    a coin too. Returns a dict with wins, losses, timeouts, turns and the
+    total number of rounds reached.
+    """
+    rng = random.Random(seed)
+    rand = rng.random
+    deck = tuple(deck)
+    hand_size = len(deck)
+    low, high = ATTACK_DAMAGE
+    spread = high - low + 1
+    double_spread = 2 * spread
+    normal_types = len(NORMAL_ENEMY_TYPES)
+
+    # Each action becomes (rolls attack, enemy damage, heal, shield) so a turn is one lookup
+    effects = {ATTACK: (True, 0, 0, 0)}
+    for index, (kind, value) in enumerate(deck):
+        effects[index] = (False, value if kind == KIND_ATTACK else 0,
+                          value if kind == KIND_HEAL else 0, value if kind == KIND_SHIELD else 0)
+
+    # Resolve the policy up front; greedy only depends on whether health is low
+    if policy == "attack":
+        choices = None
+        low_effect = high_effect = effects[ATTACK]
+    elif policy == "random":
+        choices = [effects[ATTACK]] + [effects[index] for index in range(hand_size)]
+    elif policy == "greedy":
+        choices = None
+        low_effect = effects[greedy_policy(CombatState(1), deck)]
+        high_effect = effects[greedy_policy(CombatState(player_health + 1000), deck)]
+    else:
+        raise ValueError(f"Unknown policy: {policy}")
+    choice_count = hand_size + 1
+    boss_decide = boss_decisions(enemy_ai, deck) if enemy_ai is not None else None
+
+    wins = losses = timeouts = total_turns = total_rounds = 0
+    for _ in range(runs):
+        health = player_health
+        shield = 0
+        enemy_health = NORMAL_ENEMY_HEALTH
+        int(rand() * normal_types)  # Enemy type only changes the art, but keep the draw so seeds match CombatEngine
+        boss = False
+        rnd = 1
+        turns = 0
+        while True:
+            # Player action
+            if choices is not None:
+                rolls, damage, heal, block = choices[int(rand() * choice_count)]
+            elif health <= 15:
+                rolls, damage, heal, block = low_effect
+            else:
+                rolls, damage, heal, block = high_effect
+            if rolls:
+                enemy_health -= low + int(rand() * spread)
+            else:
+                enemy_health -= damage
+                health += heal
+                shield += block
+
+            # Enemy turn; the AI's choice draws the same numbers as CombatEngine.enemy_turn
+            action = boss_decide(health, shield, enemy_health) if boss and boss_decide is not None else None
+            if action is None:
+                roll = rand()
+                damage = low + int(roll * double_spread) if roll < 0.5 else None
+            elif action == "attack":
+                damage = low + int(rand() * spread)
+            else:
+                damage = None
+            if damage is not None:
+                if shield > 0:
+                    if damage > shield:
+                        health -= damage - shield
+                        shield = 0
+                    else:
+                        shield -= damage
+                else:
+                    health -= damage
+            else:
+                enemy_health += ENEMY_HEAL
+
+            # Round progression
+            turns += 1
+            if enemy_health <= 0:
+                if boss:
+                    wins += 1
+                    break
+                rnd += 1
+                if rnd < max_rounds:
+                    int(rand() * normal_types)
+                    enemy_health = NORMAL_ENEMY_HEALTH
+                else:
+                    boss = True
+                    enemy_health = BOSS_HEALTH
+            if health <= 0:
+                losses += 1
+                break
+            if turns >= max_turns:
+                timeouts += 1
+                break
+        total_turns += turns
+        total_rounds += rnd
+    return {
+        "runs": runs,
+        "wins": wins,
+        "losses": losses,
+        "timeouts": timeouts,
+        "win_rate": wins / runs if runs else 0.0,
+        "avg_turns": total_turns / runs if runs else 0.0,
+        "avg_round": total_rounds / runs if runs else 0.0,
+    }
@@ -0,0 +1,77 @@
+import json
+import os
+
+from card import CardFactory, cards_from_json, get_predefined_cards, normalize_image_path
+from utils.background_writer import BackgroundWriter
+
+DEFAULT_DECK_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'saved_cards.json'))
+
+
+def card_to_dict(card):
+    return {
+        "type": CardFactory.card_type(card),
+        "name": card.name,
+        "value": card.value,
+        "image_path": normalize_image_path(card.image_path),
+    }
+
+
+class DeckStore:
+    """The player's deck, kept in memory and written to disk in the background.
+
+    ``load`` reads saved_cards.json once; after that every screen gets the
+    deck from memory. ``save`` updates the in-memory deck right away and
+    hands the write to a BackgroundWriter, which waits ``delay`` seconds
+    for further edits so a burst of swaps becomes one write, and replaces
+    the file atomically. Call ``flush`` before exiting.
+    """
+
+    def __init__(self, path=DEFAULT_DECK_PATH, delay=0.5):
+        self.path = path
+        self._cards = None
+        self._writer = BackgroundWriter(path, "deck", delay)
+
+    @property
+    def delay(self):
+        return self._writer.delay
+
+    @property
+    def saves(self):
+        return self._writer.saves
+
+    @property
+    def writes(self):
+        return self._writer.writes
+
+    @property
+    def last_error(self):
+        return self._writer.last_error
+
+    def load(self):
+        """Return a copy of the deck, reading the file only the first time."""
+        if self._cards is None:
+            try:
+                with open(self.path, "r") as file:
+                    data = json.load(file)
+                self._cards = cards_from_json(data)
+                self._writer.remember(_encode(self._cards))
+            except (OSError, ValueError, KeyError, TypeError):
+                self._cards = get_predefined_cards()[:4]  # Starting deck
+        return list(self._cards)
+
+    def save(self, cards):
+        """Replace the deck and schedule a write. Saving an unchanged deck does nothing."""
+        self._cards = list(cards)
+        self._writer.submit(_encode(self._cards))
+
+    def flush(self, timeout=None):
+        """Write any pending change now and wait for it. Returns False on timeout."""
+        return self._writer.flush(timeout)
+
+    @property
+    def dirty(self):
+        return self._writer.dirty
+
+
+def _encode(cards):
+    return json.dumps([card_to_dict(card) for card in cards]).encode("utf-8")
@@ -1,18 +1,25 @@
-import pygame
 import random
+from utils.sprite_variants import sprite_variants
 
 class Enemy:
     def __init__(self, x, y, speed, image_path, size, health=10):
         self.x = x
         self.y = y
         self.speed = speed
+        self.variants = sprite_variants(image_path)  # Full-size art, scaled once per size it is drawn at
         self.image = self.load_image(image_path, size)
         self.rect = self.image.get_rect(topleft=(x, y))
         self.health = health
 
     def load_image(self, path, size):
-        image = pygame.image.load(path)
-        return pygame.transform.scale(image, size)
+        return sprite_variants(path).get(size)
+
+    def image_at(self, size, flip=False):
+        """The enemy's art at ``size``, scaled from the full-size source the first time it is asked for."""
+        return self.variants.get(size, flip)
+
+    def memory_stats(self):
+        return self.variants.stats()
 
     def update(self):
         pass  # No movement for enemies
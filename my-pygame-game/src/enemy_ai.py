@@ -0,0 +1,247 @@
+"""Enemy decision making, separate from the combat rules.
+
+An enemy AI is told the state at the start of the enemy's turn with
+``start``, is given work to do with ``think(nodes)``, possibly spread
+over several updates, and is asked for its decision with ``finish`` when
+the turn comes: "attack", "heal", or None to let CombatEngine roll as it
+always has. Thinking is measured in search nodes, never in time, so the
+decision only depends on the position, the deck, what the AI searched
+before and how its thinking was sliced: a replay or a fight with the same
+seed gets the same moves however fast the machine is.
+"""
+
+from combat_engine import ATTACK_DAMAGE, BOSS_ENEMY_TYPE, ENEMY_HEAL, KIND_ATTACK, KIND_HEAL, KIND_SHIELD
+
+ENEMY_ATTACK = "attack"
+ENEMY_HEAL_ACTION = "heal"
+WIN_SCORE = 1000.0  # Player dead; the remaining depth is added so quicker wins score higher
+
+
+class RandomEnemyAI:
+    """The original behaviour: the engine's coin flip picks attack or heal."""
+
+    def __init__(self, table=None):
+        pass  # Nothing to look up, so a shared table goes unused
+
+    def start(self, state, deck):
+        pass
+
+    def think(self, nodes):
+        """Nothing to work out. Returns True: the decision is ready."""
+        return True
+
+    def finish(self):
+        return None
+
+    def decision(self):
+        return None
+
+    def decide(self, state, deck):
+        return None
+
+
+class _OutOfNodes(Exception):
+    pass
+
+
+class TranspositionTable:
+    """Bounded memo of searched positions: ``key -> value``.
+
+    Entries live in two generations. When the newer one reaches half of
+    ``max_entries``, the older one is dropped and the newer one takes its
+    place, so the table never holds more than ``max_entries`` and positions
+    used recently survive. Both steps are O(1). Values depend on the
+    player's cards, so the table remembers which ``deck`` they were
+    searched with, and AIs facing the same deck can share it.
+    """
+
+    def __init__(self, max_entries=200_000):
+        self.max_entries = max_entries
+        self.deck = None
+        self._new = {}
+        self._old = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self._new.get(key)
+        if value is None:
+            value = self._old.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.put(key, value)  # Still in use, keep it through the next turnover
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if len(self._new) >= self.max_entries // 2:
+            self._old, self._new = self._new, {}
+        self._new[key] = value
+
+    def __len__(self):
+        return len(self._new) + len(self._old)
+
+    def clear(self):
+        self._new.clear()
+        self._old.clear()
+
+
+class ExpectimaxEnemyAI:
+    """Looks ahead over the enemy's and the player's turns before choosing.
+
+    The search covers player health, shield and enemy health under the
+    same rules as CombatEngine: enemy attack and player basic attack
+    damage are chance nodes over every roll, the player is assumed to pick
+    whichever card or attack is worst for the enemy (every card stays in
+    the hand, as in the game), and positions are scored as enemy health
+    minus player health and shield. The enemy moves after the player's
+    action but before its own death is checked, so healing out of negative
+    health counts as surviving, as it does in the engine.
+
+    Depths are searched one after another (iterative deepening), keeping
+    the best action of the deepest finished one. Work is counted in nodes
+    searched (table hits are free) and checked at every node. ``think``
+    stops when its slice of nodes is used up by abandoning the current
+    depth; every position finished so far stays in the transposition
+    table, so the next call passes over that work at lookup cost and
+    carries on where it stopped. Thinking stops for good after
+    ``max_nodes`` in total or once ``max_depth`` is done. The default
+    budget covers a full depth-4 search from a cold table.
+
+    Args:
+        max_depth (int): Enemy turns to look ahead.
+        max_nodes (int): Nodes allowed per enemy turn, over all ``think`` calls.
+        table (TranspositionTable): Shared between turns, and between AIs facing the same deck;
+            a new bounded one by default.
+    """
+
+    def __init__(self, max_depth=4, max_nodes=12_000, table=None):
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.table = table if table is not None else TranspositionTable()
+        self.root = None
+        self.deck = ()
+        self.best_action = ENEMY_ATTACK
+        self.completed_depth = 0
+        self.nodes = 0  # Searched this turn
+        self._limit = 0
+
+    def start(self, state, deck):
+        """Begin deciding the enemy's move for ``state`` (after the player's action)."""
+        self.deck = tuple(deck)
+        if self.deck != self.table.deck:
+            self.table.clear()  # Values depend on the player's cards
+            self.table.deck = self.deck
+        self.root = (state.player_health, state.player_shield, state.enemy_health)
+        self.best_action = ENEMY_ATTACK
+        self.completed_depth = 0
+        self.nodes = 0
+
+    @property
+    def done(self):
+        return self.completed_depth >= self.max_depth or self.nodes >= self.max_nodes
+
+    def think(self, nodes):
+        """Search up to ``nodes`` more nodes (capped by ``max_nodes``). Returns True once decided."""
+        if self.root is None or self.done:
+            return True
+        self._limit = min(self.nodes + nodes, self.max_nodes)
+        try:
+            while self.completed_depth < self.max_depth:
+                self.best_action = self._search_root(self.completed_depth + 1)
+                self.completed_depth += 1
+        except _OutOfNodes:
+            pass
+        return self.done
+
+    def finish(self):
+        """Stop thinking, when the decision is due now. Returns the best action found so far."""
+        return self.best_action
+
+    def decision(self):
+        """Best action found so far: "attack" or "heal"."""
+        return self.best_action
+
+    def decide(self, state, deck):
+        """Start, think for the whole node budget and decide, for headless use."""
+        self.start(state, deck)
+        self.think(self.max_nodes)
+        return self.decision()
+
+    def _tick(self):
+        if self.nodes >= self._limit:
+            raise _OutOfNodes
+        self.nodes += 1
+
+    def _search_root(self, depth):
+        health, shield, enemy_health = self.root
+        attack = self._attack_value(health, shield, enemy_health, depth)
+        heal = self._after_enemy(health, shield, enemy_health + ENEMY_HEAL, depth)
+        return ENEMY_HEAL_ACTION if heal > attack else ENEMY_ATTACK
+
+    def _enemy_value(self, health, shield, enemy_health, depth):
+        """Enemy to move: the better of attacking and healing."""
+        key = (0, health, shield, enemy_health, depth)
+        value = self.table.get(key)
+        if value is None:
+            self._tick()
+            value = max(self._attack_value(health, shield, enemy_health, depth),
+                        self._after_enemy(health, shield, enemy_health + ENEMY_HEAL, depth))
+            self.table.put(key, value)
+        return value
+
+    def _attack_value(self, health, shield, enemy_health, depth):
+        """Average over every enemy damage roll, with shield absorbing damage first."""
+        low, high = ATTACK_DAMAGE
+        total = 0.0
+        for damage in range(low, high + 1):
+            if damage > shield:
+                total += self._after_enemy(health - (damage - shield), 0, enemy_health, depth)
+            else:
+                total += self._after_enemy(health, shield - damage, enemy_health, depth)
+        return total / (high - low + 1)
+
+    def _after_enemy(self, health, shield, enemy_health, depth):
+        """End of the turn: check deaths, then score the position or let the player move."""
+        if enemy_health <= 0:
+            return -WIN_SCORE - depth
+        if health <= 0:
+            return WIN_SCORE + depth
+        if depth <= 1:
+            return enemy_health - health - shield
+        return self._player_value(health, shield, enemy_health, depth - 1)
+
+    def _player_value(self, health, shield, enemy_health, depth):
+        """Player to move: the action that leaves the enemy worst off."""
+        key = (1, health, shield, enemy_health, depth)
+        value = self.table.get(key)
+        if value is not None:
+            return value
+        self._tick()
+        low, high = ATTACK_DAMAGE
+        best = sum(self._enemy_value(health, shield, enemy_health - damage, depth)
+                   for damage in range(low, high + 1)) / (high - low + 1)
+        for kind, card_value in set(self.deck):
+            if kind == KIND_ATTACK:
+                value = self._enemy_value(health, shield, enemy_health - card_value, depth)
+            elif kind == KIND_HEAL:
+                value = self._enemy_value(health + card_value, shield, enemy_health, depth)
+            elif kind == KIND_SHIELD:
+                value = self._enemy_value(health, shield + card_value, enemy_health, depth)
+            else:
+                continue
+            best = min(best, value)
+        self.table.put(key, best)
+        return best
+
+
+# Which AI each enemy type uses; anything not listed flips a coin as before
+ENEMY_AIS = {
+    BOSS_ENEMY_TYPE: ExpectimaxEnemyAI,
+}
+
+
+def enemy_ai_for(enemy_type, table=None):
+    """A new AI for ``enemy_type``. AIs that search use ``table`` if given, see TranspositionTable."""
+    return ENEMY_AIS.get(enemy_type, RandomEnemyAI)(table=table)
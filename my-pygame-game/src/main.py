@@ -1,35 +1,336 @@
+import time
+LAUNCH_TIME = time.perf_counter()  # Taken before any other import, for the startup report
+
+import argparse
+import json
+import os
+import random
+import tempfile
 import pygame
-from screens.start_screen import StartScreen
-from screens.choose_player_screen import ChoosePlayerScreen
-from screens.tavern_screen import TavernScreen
-from screens.gameplay_screen import GameplayScreen
-from screens.starting_area_screen import StartingAreaScreen
+from screens.registry import ScreenRegistry
+from card import cards_from_json
+from card_sprite import CARD_ATLAS
+from deck_store import DeckStore, card_to_dict
+from player import Player
+from snapshot import DEFAULT_SNAPSHOT_PATH, SnapshotStore
+from utils.assets import asset_manager
+from utils.input_source import InputRecorder, InputSource, ReplaySource
+from utils.perf_overlay import PerformanceOverlay
+from utils.preloader import Preloader
+from utils.profiler import FrameProfiler
+from utils.raw_cache import RawImageCache
+from utils.text import clear_fonts
+from utils.texture_renderer import TextureRenderer
+from utils.timestep import FixedTimestep
+IMPORT_TIME = time.perf_counter() - LAUNCH_TIME
 
 class Game:
-    def __init__(self):
+    IDLE_TIMEOUT_MS = 250  # While idle, wake up this often to adopt preloaded images
+    SIZE = (1200, 800)  # Logical resolution every screen is laid out for
+
+    def __init__(self, dirty_rects=False, startup_report=False, quit_after_startup=False,
+                 show_profiler=False, profile_json=None, profile_trace=None,
+                 seed=None, record=None, replay=None, fps=60, tick_rate=60, vsync=False, busy_loop=False,
+                 idle=True, renderer="software", window_size=None, resume=False,
+                 save_path=DEFAULT_SNAPSHOT_PATH):
+        self.startup = {"imports": IMPORT_TIME}  # Seconds spent in each startup step
+        start = time.perf_counter()
         pygame.init()
-        self.screen = pygame.display.set_mode((1200, 800))
+        # With the texture renderer, screens draw onto its canvas and art is drawn as textures
+        self.texture_renderer = self.open_texture_renderer(window_size, vsync) if renderer == "texture" else None
+        if self.texture_renderer is not None:
+            self.screen = self.texture_renderer.canvas
+        else:
+            self.screen = self.open_window(self.SIZE, vsync)
         pygame.display.set_caption("My Pygame Game")
         self.clock = pygame.time.Clock()
+        self.fps = fps  # Frame cap, 0 for none; the simulation rate does not depend on it
+        self.busy_loop = busy_loop  # Pace frames by spinning instead of sleeping: steadier, but uses a full core
+        self.timestep = FixedTimestep(tick_rate)  # Screens' update() runs tick_rate times per second
+        self.idle = idle  # Wait for input instead of redrawing a screen that isn't changing
+        self._redraw = True  # Set by invalidate(); the next frame is drawn even if nothing else happens
         self.running = True
         self.selected_player = None  # Track selected player
-        self.current_screen = StartScreen(self)
+        self.replay_dir = None
+        if replay:
+            # Replays start from the recorded deck and never touch the real saved_cards.json
+            self.input = ReplaySource(replay)
+            seed = self.input.seed
+            self.replay_dir = tempfile.TemporaryDirectory(prefix="sisak_replay_")
+            deck_path = os.path.join(self.replay_dir.name, "saved_cards.json")
+            with open(deck_path, "w") as f:
+                json.dump(self.input.deck, f)
+            self.deck_store = DeckStore(deck_path)
+            # Likewise the saved run, so resuming it plays back the same fight
+            self.snapshots = SnapshotStore(os.path.join(self.replay_dir.name, "savegame.bin"))
+            if self.input.save is not None:
+                with open(self.snapshots.path, "wb") as f:
+                    f.write(self.input.save)
+            resume = self.input.resume
+        else:
+            self.deck_store = DeckStore()  # The player's deck, saved in the background
+            self.snapshots = SnapshotStore(save_path)  # The run, autosaved at every turn boundary
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        random.seed(self.seed)
+        self.rng = random.Random(self.seed)  # Screens draw their own seeds from this, in a fixed order
+        if record:
+            deck = [card_to_dict(card) for card in self.deck_store.load()]
+            self.input = InputSource(InputRecorder(record, self.seed, deck, self.snapshots.read_bytes(), resume))
+        elif not replay:
+            self.input = InputSource()  # Input straight from pygame, one batch per frame
+        self.dirty_rects = dirty_rects  # Push only changed areas to the display instead of flipping
+        asset_manager.register_atlas(CARD_ATLAS)  # All card art comes from one sheet
+        asset_manager.raw_cache = RawImageCache()  # Pre-scaled images, if the cache has been built
+        self.preloader = Preloader(asset_manager)  # Decodes upcoming screens' images in the background
+        self.profiler = FrameProfiler()  # Times every phase of every frame, per screen
+        self.overlay = PerformanceOverlay(self.profiler, visible=show_profiler)  # F3 toggles it
+        self.profile_json = profile_json
+        self.profile_trace = profile_trace
+        self.startup["display_init"] = time.perf_counter() - start
+        self.startup_report = startup_report
+        self.quit_after_startup = quit_after_startup
+        self.first_frame_done = False
+        self.screens = ScreenRegistry()  # Screen modules are imported the first time they are entered
+        self.current_screen = self.screens.create("loading", self, self.screens.required_assets("start", self),
+                                                  lambda: self.screens.create("start", self))
+        if resume and not self.resume():
+            print("No saved run to resume, starting a new one")
+
+    @staticmethod
+    def open_window(size, vsync=False):
+        """Open the window. Vsync needs a SCALED window; without support for it, open a plain one."""
+        if vsync:
+            try:
+                return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f"Warning: vsync is not available ({e}), continuing without it")
+        return pygame.display.set_mode(size)
+
+    @classmethod
+    def open_texture_renderer(cls, window_size=None, vsync=False):
+        """Draw through SDL's renderer in a resizable window, or return None if it can't be created."""
+        try:
+            return TextureRenderer(cls.SIZE, "My Pygame Game", window_size, vsync)
+        except pygame.error as e:
+            print(f"Warning: texture renderer is not available ({e}), drawing in software")
+            return None
 
     def change_screen(self, new_screen):
         """Switch to a new screen."""
         self.current_screen = new_screen
+        self.invalidate()
+
+    def invalidate(self):
+        """Ask for another frame, for changes that don't come from input or an animating screen."""
+        self._redraw = True
+
+    def can_idle(self):
+        """True when the next frame would look the same as the last one, unless input arrives.
+
+        Screens say whether they change on their own (timers, held keys,
+        loading) through an ``animating`` attribute; screens without one
+        are always redrawn. Nothing here depends on wall-clock time, so a
+        replay idles at the same points as the recorded session.
+        """
+        return (self.idle and not self._redraw and not self.overlay.visible
+                and not getattr(self.current_screen, "animating", True))
+
+    def wait_for_input(self):
+        """Sleep until an event arrives, adopting preloaded images in the meantime."""
+        while self.running:
+            event = pygame.event.wait(self.IDLE_TIMEOUT_MS)
+            if event.type != pygame.NOEVENT:
+                pygame.event.post(event)  # The queue was empty, so this keeps it in order
+                return
+            self.preloader.poll()
+            if self._redraw:
+                return
+
+    def goto(self, name, *args):
+        """Switch to the screen registered under ``name``, e.g. ``game.goto("tavern")``."""
+        self.change_screen(self.screens.create(name, self, *args))
+
+    def resume(self):
+        """Carry on with the saved run: restore its deck, player and RNG, then load its screen.
+
+        Returns False if there is no saved run that can be read.
+        """
+        snapshot = self.snapshots.load()
+        if snapshot is None:
+            return False
+        self.deck_store.save(cards_from_json(snapshot.deck))
+        self.rng.setstate(snapshot.rng_state)
+        player = Player(snapshot.player_name, snapshot.player_health, snapshot.player_image)
+        player.shield = snapshot.player_shield
+        self.selected_player = player
+        args = (player,) if snapshot.combat is None else (player, snapshot.combat)
+        self.change_screen(self.screens.create("loading", self, self.screens.required_assets(snapshot.screen, self),
+                                               lambda: self.screens.create(snapshot.screen, self, *args)))
+        return True
+
+    def record_startup(self, screen):
+        """Note the first frame and the first title screen frame after launch."""
+        now = time.perf_counter() - LAUNCH_TIME
+        if not self.first_frame_done:
+            self.first_frame_done = True
+            self.startup["first_frame"] = now
+        if self.screens.is_loaded("start") and isinstance(screen, self.screens.get("start")):
+            self.startup["first_title_frame"] = now
+            self.startup["screen_imports"] = dict(self.screens.import_times)
+            if self.startup_report:
+                self.print_startup_report()
+            if self.quit_after_startup:
+                self.running = False
+            return True
+        return False
+
+    def print_startup_report(self):
+        report = self.startup
+        print("Startup report (ms since launch unless noted):")
+        print(f"  module imports      {report['imports'] * 1000:8.1f}  (duration)")
+        print(f"  display init        {report['display_init'] * 1000:8.1f}  (duration)")
+        for name, seconds in report["screen_imports"].items():
+            print(f"  import {name:<13}{seconds * 1000:8.1f}  (duration)")
+        print(f"  first frame         {report['first_frame'] * 1000:8.1f}")
+        print(f"  first title frame   {report['first_title_frame'] * 1000:8.1f}")
+
+    def check_overlay_key(self, events):
+        """Toggle the performance overlay when F3 goes down."""
+        if any(event.type == pygame.KEYDOWN and event.key == pygame.K_F3 for event in events):
+            self.overlay.toggle()
+
+    def save_profile(self):
+        if self.profile_json:
+            self.profiler.export_json(self.profile_json)
+            print(f"Profile written to {self.profile_json}")
+        if self.profile_trace:
+            self.profiler.export_chrome_trace(self.profile_trace)
+            print(f"Chrome trace written to {self.profile_trace}")
+
+    def print_replay_report(self, elapsed):
+        source = self.input
+        speedup = source.duration / elapsed if elapsed else 0.0
+        print(f"Replayed {source.index} of {len(source.frames)} frames ({source.duration:.1f}s of play) "
+              f"in {elapsed:.2f}s, {speedup:.1f}x real time")
+        if source.desyncs:
+            frame, recorded, current = source.first_desync
+            print(f"Warning: {source.desyncs} frames ran on a different screen than recorded, "
+                  f"first at frame {frame} ({current} instead of {recorded})")
 
     def run(self):
         """Main game loop."""
+        startup_pending = True
+        profiler = self.profiler
+        replaying = isinstance(self.input, ReplaySource)
+        fps = 0 if replaying else self.fps  # Replays run as fast as the frames can be made
+        tick = self.clock.tick_busy_loop if self.busy_loop and fps else self.clock.tick
+        start = time.perf_counter()
         while self.running:
+            if self.can_idle():
+                if not replaying:
+                    self.wait_for_input()
+                self.timestep.pause()  # Idle time is not game time
+            screen_name = type(self.current_screen).__name__
+            profiler.begin_frame(screen_name)
+            events = self.input.begin_frame(screen_name)
+            if any(event.type != pygame.QUIT for event in events):
+                profiler.input_seen()
+            self.check_overlay_key(events)
             self.current_screen.handle_events()
-            self.current_screen.update()
-            self.current_screen.draw(self.screen)
-            pygame.display.flip()
-            self.clock.tick(60)
+            profiler.mark("events")
+            # Fixed-length updates for the time this frame covers, from the input's clock so replays match
+            for _ in range(self.timestep.advance(self.input.ticks())):
+                self.current_screen.update()
+            profiler.mark("update")
+            self.preloader.poll()
+            profiler.mark("preload")
+            dirty = self.current_screen.draw(self.screen)
+            profiler.mark("draw")
+            overlay_rect = self.overlay.draw(self.screen)
+            profiler.mark("overlay")
+            if self.texture_renderer is not None:
+                self.texture_renderer.present([(self.overlay.panel, self.overlay.rect)] if self.overlay.visible else [])
+            elif self.dirty_rects and dirty is not None:
+                if overlay_rect is not None:
+                    dirty = list(dirty) + [overlay_rect]
+                if dirty:
+                    pygame.display.update(dirty)
+            else:
+                pygame.display.flip()
+            self.overlay.restore(self.screen)
+            profiler.mark("present")
+            if startup_pending:
+                startup_pending = not self.record_startup(self.current_screen)
+            tick(fps)
+            profiler.mark("idle")
+            profiler.end_frame()
+            self._redraw = False
+            if self.input.finished:
+                self.running = False
 
+        self.deck_store.flush()  # Don't lose a deck edit that is still waiting to be written
+        self.snapshots.flush()
+        self.input.close()
+        if replaying:
+            self.print_replay_report(time.perf_counter() - start)
+            self.replay_dir.cleanup()
+        self.save_profile()
         pygame.quit()
+        clear_fonts()  # They would crash if used again after pygame.quit()
+
+def window_size(text):
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sisak Adventure")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only update the parts of the window that changed each frame")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print import time and time to first frame once the title screen is shown")
+    parser.add_argument("--quit-after-startup", action="store_true",
+                        help="exit as soon as the title screen has been drawn (for timing startup)")
+    parser.add_argument("--profile", action="store_true",
+                        help="show the performance overlay from the start (F3 toggles it at any time)")
+    parser.add_argument("--profile-json", metavar="PATH",
+                        help="on exit, write per-frame phase timings and percentiles as JSON")
+    parser.add_argument("--profile-trace", metavar="PATH",
+                        help="on exit, write the frames in Chrome trace format (chrome://tracing, Perfetto)")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="frame rate cap, 0 for uncapped (default 60); game speed stays the same")
+    parser.add_argument("--tick-rate", type=int, default=60,
+                        help="game updates per second, independent of the frame rate (default 60)")
+    parser.add_argument("--vsync", action="store_true",
+                        help="wait for the display's refresh when presenting (uses a SCALED window)")
+    parser.add_argument("--busy-loop", action="store_true",
+                        help="pace frames by busy-waiting: more even frame times, but one core stays busy")
+    parser.add_argument("--no-idle", action="store_true",
+                        help="keep redrawing every frame even when nothing on screen changes")
+    parser.add_argument("--renderer", choices=("software", "texture"), default="software",
+                        help="draw by blitting to the window (software) or as SDL textures in a resizable window")
+    parser.add_argument("--window-size", type=window_size, metavar="WxH",
+                        help="initial window size for --renderer texture, e.g. 1800x1200 (default 1200x800)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the autosaved run on the screen it was saved on")
+    parser.add_argument("--seed", type=int, help="seed for all game randomness (random by default)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the seed and every frame's input to PATH for later replay")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recording headless and as fast as possible, then exit")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    game = Game()
+    args = parse_args()
+    if args.replay:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"  # Chosen when the display starts, so this is still in time
+    game = Game(dirty_rects=args.dirty_rects, startup_report=args.startup_report,
+                quit_after_startup=args.quit_after_startup, show_profiler=args.profile,
+                profile_json=args.profile_json, profile_trace=args.profile_trace,
+                seed=args.seed, record=args.record, replay=args.replay,
+                fps=args.fps, tick_rate=args.tick_rate, vsync=args.vsync, busy_loop=args.busy_loop,
+                idle=not args.no_idle, renderer=args.renderer, window_size=args.window_size,
+                resume=args.resume)
     game.run()
\ No newline at end of file
@@ -1,6 +1,9 @@
 import pygame
+from utils.sprite_variants import sprite_variants
 
 class Player:
+    IMAGE_SIZE = (90, 90)
+
     def __init__(self, name, health, image_path):
         """
         Initialize a player with name and health, and load an image.
@@ -13,9 +16,19 @@ class Player:
         self.name = name
         self.health = health
         self.shield = 0
-        self.image = pygame.image.load(image_path)  # Load player image
-        self.image = pygame.transform.scale(self.image, (90, 90))  # Adjust size as needed
-        self.rect = self.image.get_rect()
+        self.variants = sprite_variants(image_path)  # Full-size art, scaled once per size it is drawn at
+        self.rect = pygame.Rect((0, 0), self.IMAGE_SIZE)
+
+    @property
+    def image(self):
+        return self.variants.get(self.IMAGE_SIZE)
+
+    def image_at(self, size, flip=False):
+        """The player's art at ``size``, scaled from the full-size source the first time it is asked for."""
+        return self.variants.get(size, flip)
+
+    def memory_stats(self):
+        return self.variants.stats()
 
     def take_damage(self, amount):
         self.health -= amount
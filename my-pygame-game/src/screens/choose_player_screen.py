@@ -1,25 +1,42 @@
 import pygame
 from player import Player
-from screens.starting_area_screen import StartingAreaScreen
+from utils.assets import asset_manager
+from utils.render import DirtyLayer, compose_layer
+from utils.text import get_font, text_cache
 
 class ChoosePlayerScreen:
+    BACKGROUND = 'my-pygame-game/src/assets/main_bg.png'
+    animating = False  # Only changes on input, so the game can idle here
+    PLAYER_OPTIONS = [
+        ("Lule", 80, 'my-pygame-game/src/assets/player1.png'),
+        ("Toni", 120, 'my-pygame-game/src/assets/player2.png'),
+        ("Lovro", 100, 'my-pygame-game/src/assets/player3.png'),
+    ]
+
+    @classmethod
+    def required_assets(cls, game):
+        """(path, size) pairs this screen loads, for the Preloader."""
+        assets = [(cls.BACKGROUND, (1200, 800))]
+        assets.extend((image_path, None) for _, _, image_path in cls.PLAYER_OPTIONS)  # Full size, see Player.image_at
+        return assets
+
     def __init__(self, game):
         self.game = game
-        self.players = [
-            Player("Lule", health=80, image_path='my-pygame-game/src/assets/player1.png'),
-            Player("Toni", health=120, image_path='my-pygame-game/src/assets/player2.png'),
-            Player("Lovro", health=100, image_path='my-pygame-game/src/assets/player3.png')
-        ]
+        self.players = [Player(name, health=health, image_path=image_path)
+                        for name, health, image_path in self.PLAYER_OPTIONS]
         self.selected_player = None
-        self.font = pygame.font.Font(None, 30)  # Smaller font for player text
+        self.font = get_font(None, 30)  # Smaller font for player text
         self.image_size = (200, 280)  # New size for player images
 
         # Load the background image
-        self.background_image = pygame.image.load('my-pygame-game/src/assets/main_bg.png')
-        self.background_image = pygame.transform.scale(self.background_image, (1200, 800))  # Scale to match screen size
+        self.background_image = asset_manager.get(self.BACKGROUND, (1200, 800))  # Scale to match screen size
+        self.layer = None  # Everything on this screen is static, built on first draw
+
+        # Decode the starting area's art while the player is choosing
+        game.preloader.request(game.screens.required_assets("starting_area", game))
 
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in self.game.input.events():
             if event.type == pygame.QUIT:
                 self.game.running = False
             if event.type == pygame.KEYDOWN:
@@ -34,16 +51,23 @@ class ChoosePlayerScreen:
         self.selected_player = self.players[index]
         self.game.selected_player = self.selected_player  # Store in Game class
         print(f"Selected Player: {self.selected_player.name}, Health: {self.selected_player.health}")
-        self.game.change_screen(StartingAreaScreen(self.game, self.selected_player))  # Pass the selected player
+        self.game.goto("starting_area", self.selected_player)  # Pass the selected player
 
     def update(self):
         pass  # No animations yet
 
     def draw(self, screen):
+        if self.layer is None:
+            static = compose_layer(screen.get_size())
+            self.draw_static(static)
+            self.layer = DirtyLayer(static)
+        return self.layer.render(screen, [])
+
+    def draw_static(self, screen):
         # Draw the background
         screen.blit(self.background_image, (0, 0))
 
-        title_text = self.font.render("Choose Your Player", True, (255, 255, 255))
+        title_text = text_cache.render("Choose Your Player", self.font, (255, 255, 255))
         screen.blit(title_text, (screen.get_width() // 2 - title_text.get_width() // 2, 20))
 
         # Calculate positioning for players
@@ -53,12 +77,11 @@ class ChoosePlayerScreen:
         start_y = 200  # Starting Y position for player images
 
         for index, player in enumerate(self.players):
-            player_image = player.get_image()
-            player_image = pygame.transform.scale(player_image, self.image_size)  # Scale to new size
+            player_image = player.image_at(self.image_size)  # Scaled once from the full-size art
             image_x = start_x + index * (self.image_size[0] + spacing)  # Calculate X position
             screen.blit(player_image, (image_x, start_y))  # Draw player image
 
             # Render text below each image
-            text = self.font.render(f"{player.name} - Health: {player.health} (Press {index + 1})", True, (255, 255, 255))
+            text = text_cache.render(f"{player.name} - Health: {player.health} (Press {index + 1})", self.font, (255, 255, 255))
             text_x = image_x + (self.image_size[0] - text.get_width()) // 2  # Center text below the image
             screen.blit(text, (text_x, start_y + self.image_size[1] + 5))  # Draw text below image
@@ -1,154 +1,210 @@
 import pygame
-import random
-import os
-import time
 from enemy import EnemyFactory, BossEnemy  # Import BossEnemy and EnemyFactory
-from card import CardFactory, load_cards_from_json, AttackCard, HealCard, ShieldCard  # Import CardFactory, load_cards_from_json, AttackCard, HealCard, ShieldCard
+from card_sprite import DEFAULT_CARD_IMAGE, CardHand, build_card_sprite
+from combat_engine import (ATTACK, BOSS_ENEMY_TYPE, BOSS_HEALTH, KIND_ATTACK, KIND_HEAL, LOSE, WIN,
+                           CombatEngine, deck_from_cards)
+from enemy_ai import enemy_ai_for
+from snapshot import CombatSnapshot, RunSnapshot
+from turn_scheduler import TurnScheduler, BANNER, ENEMY_DELAY
+from utils.assets import asset_manager
+from utils.render import DirtyLayer
+from utils.text import TextLabel, get_font, render_text
 
 class GameplayScreen:
-    def __init__(self, game, player):
+    BACKGROUND = 'my-pygame-game/src/assets/game_bg.png'
+    CARD_SIZE = (150, 225)
+    CARD_HOVER_SIZE = (170, 255)
+    PLAYER_SIZE = (350, 350)
+    AI_THINK_NODES = 200  # Search nodes per update while the player's action is shown; 60 updates cover a turn
+
+    @classmethod
+    def required_assets(cls, game):
+        """(path, size) pairs this screen loads, for the Preloader."""
+        assets = [(cls.BACKGROUND, game.screen.get_size())]
+        cards = game.deck_store.load()
+        for image_path in [card.image_path for card in cards] + [DEFAULT_CARD_IMAGE]:
+            assets.append((image_path, cls.CARD_SIZE))
+            assets.append((image_path, cls.CARD_HOVER_SIZE))
+        # Enemy sprites scale their own sizes from the full-size art
+        enemies = list(EnemyFactory.NORMAL_ENEMY_DATA.values()) + list(EnemyFactory.BOSS_ENEMY_DATA.values())
+        assets.extend((image_path, None) for image_path, _ in enemies)
+        return assets
+
+    def __init__(self, game, player, resume=None):
         self.game = game
         self.player = player
-        self.player.image = pygame.transform.scale(self.player.image, (350, 350))  # Increase player size
-        self.player.rect = self.player.image.get_rect()
+        self.player_image = self.player.image_at(self.PLAYER_SIZE)  # Scaled from the full-size art, not the 90px copy
+        self.player.rect = self.player_image.get_rect()
         self.player.rect.bottom = self.game.screen.get_height()  # Position player at the bottom
         self.player.rect.x = 100  # Position player on the left side
-        self.round = 1  # Start at round 1
-        self.max_rounds = 5  # Total number of rounds before boss
-        self.enemy = self.create_enemy()  # Initialize first enemy
-        self.player_turn = True  # Track whose turn it is
         self.action_text = ""  # Text to display the actions
         self.action_color = (255, 255, 255)  # Color for the action text
         self.initial_health = player.health  # Store the initial health of the player
+        if resume is not None:  # Carrying on from a saved CombatSnapshot
+            self.action_text = resume.action_text
+            self.action_color = resume.action_color
+            self.initial_health = resume.start_health
 
-        # Load background
-        self.background = pygame.image.load('my-pygame-game/src/assets/game_bg.png')
-        self.background = pygame.transform.scale(self.background, (self.game.screen.get_width(), self.game.screen.get_height()))
+        # Load background, the only layer that never changes
+        self.background = asset_manager.get(self.BACKGROUND, self.game.screen.get_size())
+        self.layer = DirtyLayer(self.background)
 
-        # Load cards from JSON file
-        current_dir = os.path.dirname(__file__)
-        json_path = os.path.join(current_dir, '..', '..', '..', 'saved_cards.json')
-        self.cards = load_cards_from_json(json_path)
+        # The deck comes from memory, saved_cards.json is only read once per run
+        self.cards = self.game.deck_store.load()
         self.selected_card = None
 
-        # Load card images
-        self.card_images = []
-        self.card_rects = []
-        self.original_card_sizes = []
-        for card in self.cards:
-            try:
-                card_image = pygame.image.load(card.image_path)
-            except pygame.error:
-                print(f"Warning: Image for {card.name} not found at {card.image_path}. Using default image.")
-                card_image = pygame.image.load('my-pygame-game/src/assets/Kartice/default.png')  # Use placeholder image if not found
-            card_image = pygame.transform.scale(card_image, (150, 225))  # Resize card image
-            self.card_images.append(card_image)
-            self.card_rects.append(card_image.get_rect())
-            self.original_card_sizes.append(card_image.get_size())
+        # The engine owns the combat rules and state; this screen only shows it
+        if resume is None:
+            self.engine = CombatEngine(deck_from_cards(self.cards), player.health, player.shield,
+                                       seed=self.game.rng.getrandbits(32))
+            self.enemy = self.create_enemy()  # Initialize first enemy
+        else:
+            self.engine = CombatEngine.restore(deck_from_cards(self.cards), resume.state, resume.rng_state,
+                                               resume.max_rounds)
+            self.enemy = self.create_boss() if self.engine.state.enemy_type == BOSS_ENEMY_TYPE else self.create_enemy()
+            self.sync_from_engine()
+        self.enemy_ai = enemy_ai_for(self.engine.state.enemy_type)
+        self.scheduler = TurnScheduler(self.enemy_turn, self.end_round, self.leave_combat)  # Tracks whose turn it is
+
+        # Build normal and hovered card images once, centered in a row near the top
+        screen_width = self.game.screen.get_width()
+        total_card_width = len(self.cards) * 150 + (len(self.cards) - 1) * 10
+        start_x = (screen_width - total_card_width) // 2
+        self.hand = CardHand(
+            [build_card_sprite(card, self.CARD_SIZE, self.CARD_HOVER_SIZE) for card in self.cards],
+            start_x, 130, spacing=160
+        )
+
+        # HUD labels are only re-rendered when their value changes
+        font = get_font(None, 36)
+        self.hp_label = TextLabel("HP: {}", font, (255, 255, 255))
+        self.shield_label = TextLabel("Shield: {}", font, (0, 255, 255))
+        self.round_label = TextLabel("Round: {}", font, (255, 255, 255))
+        self.enemy_hp_label = TextLabel("Enemy HP: {}", font, (255, 0, 0))
+        self.action_label = TextLabel("{}", font)
+        self.autosave()
+
+    @property
+    def animating(self):
+        """The enemy's turn and the win/lose banner run on timers; the player's turn waits for input."""
+        return not self.scheduler.is_player_turn
+
+    @property
+    def player_turn(self):
+        return self.scheduler.is_player_turn
+
+    @property
+    def round(self):
+        return self.engine.state.round
+
+    @property
+    def max_rounds(self):
+        return self.engine.max_rounds
+
+    def autosave(self):
+        """Save the run at a turn boundary, so quitting now loses nothing. The write happens in the background."""
+        combat = CombatSnapshot(self.engine.state, self.engine.max_rounds, self.engine.rng.getstate(),
+                                self.initial_health, self.action_text, self.action_color)
+        self.game.snapshots.save(RunSnapshot.capture(self.game, "gameplay", self.player, combat))
+
+    def sync_from_engine(self):
+        """Copy combat state onto the player and enemy sprites."""
+        state = self.engine.state
+        self.player.health = state.player_health
+        self.player.shield = state.player_shield
+        self.enemy.health = state.enemy_health
 
     def handle_events(self):
         """Handle events for the gameplay screen."""
-        for event in pygame.event.get():
+        for event in self.game.input.events():
             if event.type == pygame.QUIT:
                 self.game.running = False
             elif event.type == pygame.KEYDOWN and self.player_turn:
                 if event.key == pygame.K_e:
                     self.attack_enemy()
             elif event.type == pygame.MOUSEBUTTONDOWN and self.player_turn:
-                mouse_pos = event.pos
-                for i, card_rect in enumerate(self.card_rects):
-                    if card_rect.collidepoint(mouse_pos):
-                        self.use_card(i)
-                        break
+                card_index = self.hand.index_at(event.pos)
+                if card_index is not None:
+                    self.use_card(card_index)
             elif event.type == pygame.MOUSEMOTION:
                 self.handle_mouse_hover(event.pos)
 
     def handle_mouse_hover(self, mouse_pos):
-        """Handle mouse hover over cards."""
-        for i, card_rect in enumerate(self.card_rects):
-            if card_rect.collidepoint(mouse_pos):
-                card_image = pygame.transform.scale(self.card_images[i], (170, 255))  # Enlarge card image
-                self.card_images[i] = card_image
-                self.card_rects[i] = card_image.get_rect(topleft=card_rect.topleft)
-            else:
-                card_image = pygame.transform.scale(self.card_images[i], self.original_card_sizes[i])  # Reset card image size
-                self.card_images[i] = card_image
-                self.card_rects[i] = card_image.get_rect(topleft=card_rect.topleft)
+        """Handle mouse hover over cards by switching to the pre-built enlarged image."""
+        self.hand.hover(mouse_pos)
 
     def update(self):
-        """Update game logic here (e.g., check for enemy defeat)."""
-        if self.enemy.health <= 0:
-            if isinstance(self.enemy, BossEnemy):
-                self.win_game()
-            else:
-                print(f"Enemy defeated! Moving to round {self.round + 1}")
-                self.round += 1
-                if self.round < self.max_rounds:
-                    self.enemy = self.create_enemy()  # Create a new enemy for the next round
-                else:
-                    self.enemy = self.create_boss()  # Spawn boss in the final round
+        """Advance the turn phases whose delay has elapsed, without blocking."""
+        if self.scheduler.phase == ENEMY_DELAY:
+            self.enemy_ai.think(self.AI_THINK_NODES)  # Spread over the delay instead of one long frame
+        self.scheduler.update(self.game.input.ticks())
 
-        if self.player.health <= 0:
-            self.lose_game()
+    def end_round(self):
+        """Check for enemy defeat after a full turn. Returns "win", "lose" or None."""
+        previous_round = self.round
+        outcome = self.engine.end_round()
+        if self.round != previous_round:
+            print(f"Enemy defeated! Moving to round {self.round}")
+            if self.engine.state.enemy_type == BOSS_ENEMY_TYPE:
+                self.enemy = self.create_boss()  # Spawn boss in the final round
+            else:
+                self.enemy = self.create_enemy()  # Create a new enemy for the next round
+            self.enemy_ai = enemy_ai_for(self.engine.state.enemy_type)
+        self.sync_from_engine()
 
-        if not self.player_turn:
-            self.enemy_turn()
+        if outcome == WIN:
+            return self.win_game()
+        if outcome == LOSE:
+            return self.lose_game()
+        self.autosave()  # Back to the player's turn
+        return None
 
     def draw(self, screen):
-        """Draw gameplay elements on the screen."""
-        screen.blit(self.background, (0, 0))  # Draw the background
-
-        # Draw player
-        screen.blit(self.player.image, self.player.rect)
-
-        # Draw enemy
-        self.enemy.draw(screen)  # Use the enemy's draw method
+        """Draw gameplay elements on the screen and return the areas that changed."""
+        # Draw player and enemy
+        items = [
+            ("player", self.player_image, self.player.rect),
+            ("enemy", self.enemy.image, self.enemy.image.get_rect(topleft=(self.enemy.x, self.enemy.y))),
+        ]
 
         # Draw HP and round tracker
-        font = pygame.font.Font(None, 36)
-        hp_text = font.render(f"HP: {self.player.health}", True, (255, 255, 255))
-        shield_text = font.render(f"Shield: {self.player.shield}", True, (0, 255, 255))
-        round_text = font.render(f"Round: {self.round}", True, (255, 255, 255))
-        enemy_hp_text = font.render(f"Enemy HP: {self.enemy.health}", True, (255, 0, 0))
+        self.hp_label.set(self.player.health)
+        self.shield_label.set(self.player.shield)
+        self.round_label.set(self.round)
+        self.enemy_hp_label.set(self.enemy.health)
 
-        screen.blit(hp_text, (10, 10))
-        screen.blit(shield_text, (10, 50))
-        screen.blit(round_text, (10, 90))
-        screen.blit(enemy_hp_text, (self.game.screen.get_width() - 200, 10))
+        items.append(("hp", self.hp_label.surface, self.hp_label.surface.get_rect(topleft=(10, 10))))
+        items.append(("shield", self.shield_label.surface, self.shield_label.surface.get_rect(topleft=(10, 50))))
+        items.append(("round", self.round_label.surface, self.round_label.surface.get_rect(topleft=(10, 90))))
+        items.append(("enemy_hp", self.enemy_hp_label.surface,
+                      self.enemy_hp_label.surface.get_rect(topleft=(screen.get_width() - 200, 10))))
 
         # Draw cards
-        screen_width = self.game.screen.get_width()
-        total_card_width = len(self.card_images) * 150 + (len(self.card_images) - 1) * 10
-        start_x = (screen_width - total_card_width) // 2
-        for i, card_image in enumerate(self.card_images):
-            card_rect = self.card_rects[i]
-            card_rect.topleft = (start_x + i * 160, 130)
-            screen.blit(card_image, card_rect)
+        items.extend(self.hand.items())
 
         # Draw action text at the top
-        action_text = font.render(self.action_text, True, self.action_color)
-        screen.blit(action_text, (self.game.screen.get_width() // 2 - action_text.get_width() // 2, 10))
+        self.action_label.set(self.action_text, self.action_color)
+        action_rect = self.action_label.surface.get_rect(midtop=(screen.get_width() // 2, 10))
+        items.append(("action", self.action_label.surface, action_rect))
 
-        pygame.display.flip()
+        # Win/lose message, shown for a while before leaving combat
+        if self.scheduler.phase == BANNER:
+            if self.scheduler.outcome == "win":
+                banner = render_text("You Win!", 60, (0, 255, 0))
+            else:
+                banner = render_text("You Lose!", 60, (255, 0, 0))
+            items.append(("banner", banner, banner.get_rect(topleft=(screen.get_width() // 2 - 100, screen.get_height() // 2))))
+
+        return self.layer.render(screen, items)
 
     def win_game(self):
         """Handles the win condition (after defeating the final boss)."""
-        # Display victory message
-        font = pygame.font.Font(None, 60)
-        win_text = font.render("You Win!", True, (0, 255, 0))
-        self.game.screen.blit(win_text, (self.game.screen.get_width() // 2 - 100, self.game.screen.get_height() // 2))
-        pygame.display.flip()
-
-        pygame.time.wait(2000)  # Wait for 2 seconds to show the victory message
-        
-        # After winning, switch back to the starting area screen
-        from screens.starting_area_screen import StartingAreaScreen
-        self.game.change_screen(StartingAreaScreen(self.game, self.game.selected_player))  # Switch back to StartingAreaScreen
+        print("Boss defeated! You win!")
+        return "win"  # The scheduler shows the victory message for 2 seconds
 
     def create_enemy(self):
-        """Randomly create a normal enemy."""
-        enemy_type = random.randint(1, 3)  # Random enemy type
-        enemy = EnemyFactory.create_enemy(enemy_type, 700, 300, speed=random.randint(1, 3))
+        """Create the sprite for the normal enemy the engine rolled."""
+        enemy = EnemyFactory.create_enemy(self.engine.state.enemy_type, 700, 300, speed=1)
         enemy.rect = enemy.image.get_rect()  # Ensure the rect is set correctly
         enemy.rect.bottom = self.game.screen.get_height()  # Position enemy at the bottom
         enemy.rect.x = self.game.screen.get_width() - 250  # Position enemy on the right side
@@ -158,7 +214,7 @@ class GameplayScreen:
         """Create a boss enemy for the final round."""
         boss_data = EnemyFactory.BOSS_ENEMY_DATA["boss"]
         image_path, size = boss_data
-        boss = BossEnemy(700, 300, speed=1, image_path=image_path, size=size, health=100)  # Boss with custom stats
+        boss = BossEnemy(700, 300, speed=1, image_path=image_path, size=size, health=BOSS_HEALTH)  # Boss with custom stats
         boss.rect = boss.image.get_rect()  # Ensure the rect is set correctly
         boss.rect.bottom = self.game.screen.get_height()  # Position boss at the bottom
         boss.rect.x = self.game.screen.get_width() - 250  # Position boss on the right side
@@ -166,81 +222,60 @@ class GameplayScreen:
 
     def attack_enemy(self):
         """Reduce enemy health when attacking."""
-        damage = random.randint(5, 15)  # Random damage value
-        self.enemy.health -= damage
+        damage = self.engine.player_action(ATTACK)  # Random damage value
+        self.sync_from_engine()
         self.action_text = f"Player attacked! Damage: {damage}"
         self.action_color = (255, 255, 255)  # White color for player actions
         print(f"Attacked enemy! Damage: {damage}, Enemy HP: {self.enemy.health}")
-        self.player_turn = False  # End player's turn
-        self.wait_and_enemy_turn()
+        self.enemy_ai.start(self.engine.state, self.engine.deck)
+        self.scheduler.end_player_turn(self.game.input.ticks())  # Enemy responds after a short delay
 
     def use_card(self, card_index):
         """Use a card from the player's hand."""
         if 0 <= card_index < len(self.cards):
             card = self.cards[card_index]
-            if isinstance(card, AttackCard):
-                card.use(self.enemy)
-                self.action_text = f"Player used {card.name}! Damage: {card.value}"
-            elif isinstance(card, HealCard):
-                card.use(self.player)
-                self.action_text = f"Player used {card.name}! Heal: {card.value}"
-            elif isinstance(card, ShieldCard):
-                card.use(self.player)
-                self.action_text = f"Player used {card.name}! Shield: {card.value}"
+            kind, value = self.engine.player_action(card_index)
+            self.sync_from_engine()
+            if kind == KIND_ATTACK:
+                self.action_text = f"Player used {card.name}! Damage: {value}"
+            elif kind == KIND_HEAL:
+                self.action_text = f"Player used {card.name}! Heal: {value}"
+            else:
+                self.action_text = f"Player used {card.name}! Shield: {value}"
             self.action_color = (255, 255, 255)  # White color for player actions
             print(f"Used card: {card.name}")
-            self.player_turn = False  # End player's turn
-            self.wait_and_enemy_turn()
-
-    def wait_and_enemy_turn(self):
-        """Wait for 2 seconds and then let the enemy take its turn."""
-        self.draw(self.game.screen)  # Update the screen to show the player's action
-        pygame.display.flip()
-        pygame.time.wait(1000)  # Wait for 2 seconds
-        self.enemy_turn()
+            self.enemy_ai.start(self.engine.state, self.engine.deck)
+            self.scheduler.end_player_turn(self.game.input.ticks())  # Enemy responds after a short delay
 
     def enemy_turn(self):
         """Handle the enemy's turn."""
-        action = random.choice(["attack", "heal"])
+        decision = self.enemy_ai.finish()  # Best found by now; it never searches on in this frame
+        action, amount = self.engine.enemy_turn(decision)  # Shield absorbs damage first
+        self.sync_from_engine()
         if action == "attack":
-            damage = random.randint(5, 15)  # Random damage value
-            if self.player.shield > 0:
-                if damage > self.player.shield:
-                    remaining_damage = damage - self.player.shield
-                    self.player.shield = 0
-                    self.player.health -= remaining_damage
-                else:
-                    self.player.shield -= damage
-                    damage = 0
-            else:
-                self.player.health -= damage
+            damage = amount
             self.action_text = f"Enemy attacked! Damage: {damage}"
             self.action_color = (255, 0, 0)  # Red color for enemy actions
             print(f"Enemy attacked! Damage: {damage}, Player HP: {self.player.health}")
         elif action == "heal":
-            heal_amount = 5  # Fixed heal value
-            self.enemy.health += heal_amount
+            heal_amount = amount
             self.action_text = f"Enemy healed! Heal: {heal_amount}"
             self.action_color = (255, 0, 0)  # Red color for enemy actions
             print(f"Enemy healed! Heal: {heal_amount}, Enemy HP: {self.enemy.health}")
-        self.player_turn = True  # End enemy's turn
 
     def lose_game(self):
         """Handles the loss condition (when player's health reaches 0)."""
-        # Display loss message
-        font = pygame.font.Font(None, 60)
-        lose_text = font.render("You Lose!", True, (255, 0, 0))
-        self.game.screen.blit(lose_text, (self.game.screen.get_width() // 2 - 100, self.game.screen.get_height() // 2))
-        pygame.display.flip()
-
-        pygame.time.wait(2000)  # Wait for 2 seconds to show the loss message
+        print("Player defeated! You lose!")
+        return "lose"  # The scheduler shows the loss message for 2 seconds
 
-        # Reset player's health to initial value
-        self.player.health = self.initial_health
+    def leave_combat(self, outcome):
+        """Called once the win/lose message has been shown."""
+        if outcome == "lose":
+            # Reset player's health to initial value
+            self.player.health = self.initial_health
 
-        # After losing, switch back to the starting area screen
-        from screens.starting_area_screen import StartingAreaScreen
-        self.game.change_screen(StartingAreaScreen(self.game, self.game.selected_player))  # Switch back to StartingAreaScreen
+        # Switch back to the starting area screen
+        self.game.goto("starting_area", self.game.selected_player)  # Switch back to StartingAreaScreen
 
     def run(self):
         """Main loop for gameplay."""
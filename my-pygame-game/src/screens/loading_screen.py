@@ -0,0 +1,42 @@
+import pygame
+from utils.text import render_text
+
+class LoadingScreen:
+    """Shows a progress bar while the Preloader decodes assets, then opens the next screen."""
+
+    animating = True  # The bar moves as images arrive, without any input
+
+    def __init__(self, game, assets, next_screen):
+        self.game = game
+        self.next_screen = next_screen  # Callable that builds the screen to show once loading is done
+        self.keys = game.preloader.request(assets)
+        self.bar_rect = pygame.Rect(0, 0, 600, 30)
+        self.bar_rect.center = (game.screen.get_width() // 2, game.screen.get_height() // 2 + 40)
+
+    def progress(self):
+        if not self.keys:
+            return 1.0
+        return 1.0 - self.game.preloader.pending_count(self.keys) / len(self.keys)
+
+    def handle_events(self):
+        for event in self.game.input.events():
+            if event.type == pygame.QUIT:
+                self.game.running = False
+        # Checked every frame rather than in update: loading runs on the worker's time, not
+        # game time, and a replay holds the clock still while it waits for loading to finish
+        self.game.preloader.poll(budget_ms=12)  # Nothing else to do yet, so adopt images faster
+        if self.progress() >= 1.0:
+            self.game.change_screen(self.next_screen())
+
+    def update(self):
+        pass
+
+    def draw(self, screen):
+        screen.fill((0, 0, 0))
+        progress = self.progress()
+        text = render_text(f"Loading... {int(progress * 100)}%", 50)
+        screen.blit(text, text.get_rect(midbottom=(self.bar_rect.centerx, self.bar_rect.top - 20)))
+        pygame.draw.rect(screen, (255, 255, 255), self.bar_rect, 2)
+        fill = self.bar_rect.inflate(-8, -8)
+        fill.width = int(fill.width * progress)
+        pygame.draw.rect(screen, (255, 255, 255), fill)
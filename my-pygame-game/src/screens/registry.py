@@ -0,0 +1,51 @@
+import importlib
+import time
+
+# Screen name -> (module, class). Modules are only imported the first time a screen is used.
+SCREENS = {
+    "loading": ("screens.loading_screen", "LoadingScreen"),
+    "start": ("screens.start_screen", "StartScreen"),
+    "choose_player": ("screens.choose_player_screen", "ChoosePlayerScreen"),
+    "starting_area": ("screens.starting_area_screen", "StartingAreaScreen"),
+    "tavern": ("screens.tavern_screen", "TavernScreen"),
+    "gameplay": ("screens.gameplay_screen", "GameplayScreen"),
+}
+
+
+class ScreenRegistry:
+    """Looks up screens by name and imports their modules lazily.
+
+    Screens refer to each other by name through ``Game.goto``, so no screen
+    module imports another at load time and startup only pays for the
+    screens actually shown.
+    """
+
+    def __init__(self, screens=None):
+        self.screens = dict(SCREENS if screens is None else screens)
+        self._classes = {}
+        self.import_times = {}  # name -> seconds spent importing its module
+
+    def get(self, name):
+        """Return the screen class for ``name``, importing its module on first use."""
+        screen_class = self._classes.get(name)
+        if screen_class is None:
+            try:
+                module_name, class_name = self.screens[name]
+            except KeyError:
+                raise ValueError(f"Screen '{name}' is not registered.") from None
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            self.import_times[name] = time.perf_counter() - start
+            screen_class = getattr(module, class_name)
+            self._classes[name] = screen_class
+        return screen_class
+
+    def create(self, name, game, *args):
+        return self.get(name)(game, *args)
+
+    def required_assets(self, name, game):
+        """(path, size) pairs the named screen loads, for the Preloader."""
+        return self.get(name).required_assets(game)
+
+    def is_loaded(self, name):
+        return name in self._classes
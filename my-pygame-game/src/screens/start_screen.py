@@ -1,25 +1,56 @@
 import pygame
+from utils.assets import asset_manager
+from utils.render import DirtyLayer, compose_layer
+from utils.text import get_font
 
 class StartScreen:
+    BACKGROUND = "my-pygame-game/src/assets/main_bg.png"
+
+    @classmethod
+    def required_assets(cls, game):
+        """(path, size) pairs this screen loads, for the Preloader."""
+        return [(cls.BACKGROUND, None)]
+
     def __init__(self, game):
         self.game = game
-        self.font = pygame.font.Font(None, 74)
+        self.font = get_font(None, 74)
         self.title = self.font.render("My Game", True, (255, 255, 255))
-        self.start_text = pygame.font.Font(None, 50).render("Press Enter to Start", True, (255, 255, 255))
-        self.background = pygame.image.load("my-pygame-game/src/assets/main_bg.png")  # Ensure this file exists!
+        self.start_text = get_font(None, 50).render("Press Enter to Start", True, (255, 255, 255))
+        self.can_continue = game.snapshots.exists()  # There is an autosaved run to carry on with
+        self.continue_text = get_font(None, 50).render("Press C to Continue", True, (255, 255, 255))
+        self.background = asset_manager.get(self.BACKGROUND)  # Ensure this file exists!
+        self.layer = None  # Everything on this screen is static, built on first draw
+        self.prefetched = False
 
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in self.game.input.events():
             if event.type == pygame.QUIT:
                 self.game.running = False
             if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                from screens.choose_player_screen import ChoosePlayerScreen
-                self.game.change_screen(ChoosePlayerScreen(self.game))  # Switch screen
+                self.game.goto("choose_player")  # Switch screen
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_c and self.can_continue:
+                self.game.resume()  # Straight back to the screen the run was saved on
+
+    @property
+    def animating(self):
+        return not self.prefetched  # One update after the first frame, then only input changes anything
 
     def update(self):
-        pass  # No animations yet, but can be used later
+        # Once the title is up, decode the character select screen's art while it is showing
+        if not self.prefetched and self.layer is not None:
+            self.prefetched = True
+            self.game.preloader.request(self.game.screens.required_assets("choose_player", self.game))
 
     def draw(self, screen):
+        if self.layer is None:
+            static = compose_layer(screen.get_size())
+            self.draw_static(static)
+            self.layer = DirtyLayer(static)
+        return self.layer.render(screen, [])
+
+    def draw_static(self, screen):
         screen.blit(self.background, (0, 0))  # Draw the background
         screen.blit(self.title, (screen.get_width() // 2 - self.title.get_width() // 2, 100))
         screen.blit(self.start_text, (screen.get_width() // 2 - self.start_text.get_width() // 2, 300))
+        if self.can_continue:
+            screen.blit(self.continue_text, (screen.get_width() // 2 - self.continue_text.get_width() // 2, 370))
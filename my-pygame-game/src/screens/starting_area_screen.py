@@ -1,27 +1,39 @@
 import pygame
-from screens.tavern_screen import TavernScreen
-from screens.gameplay_screen import GameplayScreen
+from snapshot import RunSnapshot
+from utils.assets import asset_manager
+from utils.render import DirtyLayer, compose_layer
+from utils.text import render_text
 
 class StartingAreaScreen:
+    BACKGROUND = 'my-pygame-game/src/assets/main_bg.png'
+    TAVERN_IMAGE = ('my-pygame-game/src/assets/kuca.png', (500, 500))
+    PORTAL_IMAGE = ('my-pygame-game/src/assets/portal.png', (360, 480))
+    PREFETCH_DISTANCE = 100  # Start decoding a building's screen when this close to it
+    WALK_SPEED = 300  # Pixels per second, whatever the frame rate
+    PLAYER_SIZE = (200, 240)
+
+    @classmethod
+    def required_assets(cls, game):
+        """(path, size) pairs this screen loads, for the Preloader."""
+        return [(cls.BACKGROUND, None), cls.TAVERN_IMAGE, cls.PORTAL_IMAGE]
+
     def __init__(self, game, player):
         self.game = game
         self.screen = game.screen
         self.player = player  
 
         # Load assets
-        self.background = pygame.image.load('my-pygame-game/src/assets/main_bg.png')  
-        self.tavern_image = pygame.image.load('my-pygame-game/src/assets/kuca.png')
-        self.portal_image = pygame.image.load('my-pygame-game/src/assets/portal.png')
+        self.background = asset_manager.get(self.BACKGROUND)
 
-        # Resize tavern and portal images
-        self.tavern_image = pygame.transform.scale(self.tavern_image, (500, 500))  
-        self.portal_image = pygame.transform.scale(self.portal_image, (360, 480))  
+        # Resized tavern and portal images
+        self.tavern_image = asset_manager.get(*self.TAVERN_IMAGE)
+        self.portal_image = asset_manager.get(*self.PORTAL_IMAGE)
 
         # Player setup
-        self.original_player_image = self.player.get_image()
-        self.original_player_image = pygame.transform.scale(self.original_player_image, (200, 240))
+        self.original_player_image = self.player.image_at(self.PLAYER_SIZE)
         self.player_image = self.original_player_image  
         self.player_rect = self.player_image.get_rect(center=(600, 625))  
+        self.player_x = self.previous_x = float(self.player_rect.x)  # Exact position, and where the last update started
 
         # Direction tracking
         self.facing_right = True
@@ -34,8 +46,25 @@ class StartingAreaScreen:
         self.near_tavern = False
         self.near_portal = False  # New flag for the portal
 
+        # Areas around the buildings where their screen's assets get prefetched
+        self.tavern_prefetch_rect = self.tavern_rect.inflate(self.PREFETCH_DISTANCE * 2, 0)
+        self.portal_prefetch_rect = self.portal_rect.inflate(self.PREFETCH_DISTANCE * 2, 0)
+        self.tavern_prefetched = False
+        self.portal_prefetched = False
+
+        # Background, tavern and portal never move, so flatten them into one cached layer
+        self.layer = DirtyLayer(compose_layer(
+            self.screen.get_size(),
+            (self.background, (0, 0)),
+            (self.tavern_image, self.tavern_rect),
+            (self.portal_image, self.portal_rect),
+        ))
+
+        # Choosing a player, leaving the tavern and leaving combat all end up here, so save the run
+        self.game.snapshots.save(RunSnapshot.capture(game, "starting_area", player))
+
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in self.game.input.events():
             if event.type == pygame.QUIT:
                 self.game.running = False
 
@@ -43,48 +72,63 @@ class StartingAreaScreen:
                 if event.key == pygame.K_e:
                     if self.near_tavern:
                         print("Entering Tavern...")
-                        self.game.change_screen(TavernScreen(self.game))
+                        self.game.goto("tavern")
                     if self.near_portal:
                         print("Entering Portal... Starting Combat!")
-                        self.game.change_screen(GameplayScreen(self.game, self.player))
+                        self.game.goto("gameplay", self.player)
+
+    @property
+    def animating(self):
+        """Walking, or still catching the drawn position up with the last update."""
+        keys = self.game.input.pressed()
+        return keys[pygame.K_a] or keys[pygame.K_d] or self.previous_x != self.player_x
 
     def update(self):
-        keys = pygame.key.get_pressed()  
-        speed = 5  
+        """One fixed timestep: move the player by WALK_SPEED for ``game.timestep.step`` seconds."""
+        keys = self.game.input.pressed()  
+        distance = self.WALK_SPEED * self.game.timestep.step
+        self.previous_x = self.player_x
 
         if keys[pygame.K_a]:  
-            self.player_rect.x -= speed
+            self.player_x -= distance
             if self.facing_right:  
-                self.player_image = pygame.transform.flip(self.original_player_image, True, False)
+                self.player_image = self.player.image_at(self.PLAYER_SIZE, flip=True)  # Flipped once, then reused
                 self.facing_right = False
 
         if keys[pygame.K_d]:  
-            self.player_rect.x += speed
+            self.player_x += distance
             if not self.facing_right:  
                 self.player_image = self.original_player_image
                 self.facing_right = True
 
         # Prevent player from moving off the screen
-        self.player_rect.left = max(0, self.player_rect.left)
-        self.player_rect.right = min(self.game.screen.get_width(), self.player_rect.right)
+        self.player_x = max(0.0, min(self.game.screen.get_width() - self.player_rect.width, self.player_x))
+        self.player_rect.x = round(self.player_x)
 
         # Check interactions
         self.near_tavern = self.player_rect.colliderect(self.tavern_rect)
         self.near_portal = self.player_rect.colliderect(self.portal_rect)  # Check portal collision
 
-    def draw(self, screen):
-        screen.blit(self.background, (0, 0))  
-        screen.blit(self.tavern_image, self.tavern_rect)
-        screen.blit(self.portal_image, self.portal_rect)
-        screen.blit(self.player_image, self.player_rect)  
+        # Walking towards a building decodes its screen's assets in the background
+        if not self.tavern_prefetched and self.player_rect.colliderect(self.tavern_prefetch_rect):
+            self.game.preloader.request(self.game.screens.required_assets("tavern", self.game))
+            self.tavern_prefetched = True
+        if not self.portal_prefetched and self.player_rect.colliderect(self.portal_prefetch_rect):
+            self.game.preloader.request(self.game.screens.required_assets("gameplay", self.game))
+            self.portal_prefetched = True
 
-        font = pygame.font.Font(None, 36)
+    def draw(self, screen):
+        # Draw the player between the last two updates, so movement looks smooth at any frame rate
+        x = self.previous_x + (self.player_x - self.previous_x) * self.game.timestep.alpha
+        items = [("player", self.player_image, self.player_rect.move(round(x) - self.player_rect.x, 0))]
 
         # Show interaction text
         if self.near_tavern:
-            text = font.render("Press E to enter the Tavern", True, (255, 255, 255))
-            screen.blit(text, (self.tavern_rect.centerx - text.get_width() // 2, self.tavern_rect.top - 40))
+            text = render_text("Press E to enter the Tavern", 36)
+            items.append(("tavern_prompt", text, text.get_rect(midtop=(self.tavern_rect.centerx, self.tavern_rect.top - 40))))
 
         if self.near_portal:
-            text = font.render("Press E to enter the Portal", True, (255, 255, 255))
-            screen.blit(text, (self.portal_rect.centerx - text.get_width() // 2, self.portal_rect.top - 40))
\ No newline at end of file
+            text = render_text("Press E to enter the Portal", 36)
+            items.append(("portal_prompt", text, text.get_rect(midtop=(self.portal_rect.centerx, self.portal_rect.top - 40))))
+
+        return self.layer.render(screen, items)
\ No newline at end of file
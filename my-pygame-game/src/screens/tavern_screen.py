@@ -1,101 +1,144 @@
-import json
 import pygame
-from card import CardFactory, get_predefined_cards
+from card_database import card_database
+from card_sprite import CardGrid, CardHand, build_card_sprite
+from utils.assets import asset_manager
+from utils.render import DirtyLayer, compose_layer
+from utils.text import TextLabel, get_font, text_cache
 
 class TavernScreen:
-    SAVE_FILE = "saved_cards.json"
+    BACKGROUND = "my-pygame-game/src/assets/tavern.jpg"
+    animating = False  # Only changes on input, so the game can idle here
+    CARD_SIZE = (150, 200)
+    HOVER_OFFSET = 10  # Hovered cards grow by this many pixels
+    CATALOG_RECT = (40, 68, 1120, 430)  # Scrollable area for the tavern's cards
+    CATALOG_CELL = (160, 215)  # Space each catalog card takes, including the gap
+
+    @staticmethod
+    def card_image_path(card):
+        return f"my-pygame-game/src/assets/Kartice/{card.name.lower().replace(' ', '_')}.png"
+
+    @classmethod
+    def required_assets(cls, game):
+        """(path, size) pairs this screen loads, for the Preloader."""
+        width, height = cls.CARD_SIZE
+        hover_size = (width + cls.HOVER_OFFSET, height + cls.HOVER_OFFSET)
+        assets = [(cls.BACKGROUND, (1200, 800))]
+        # Only the first page of the catalog is shown on entry, the rest loads as it scrolls into view
+        x, y, width, height = cls.CATALOG_RECT
+        page_size = (width // cls.CATALOG_CELL[0]) * (height // cls.CATALOG_CELL[1])
+        for card in card_database.cards()[:page_size]:
+            assets.append((cls.card_image_path(card), cls.CARD_SIZE))
+            assets.append((cls.card_image_path(card), hover_size))
+        return assets
 
     def __init__(self, game):
         self.game = game
-        self.font = pygame.font.Font(None, 40)  # Font for title
-        self.info_font = pygame.font.Font(None, 30)  # Font for instructions
+        self.font = get_font(None, 40)  # Font for title
+        self.info_font = get_font(None, 30)  # Font for instructions
 
         # Load background
-        self.background = pygame.image.load("my-pygame-game/src/assets/tavern.jpg")
-        self.background = pygame.transform.scale(self.background, (1200, 800))
+        self.background = asset_manager.get(self.BACKGROUND, (1200, 800))
 
         # Load cards
         self.player_cards = self.load_saved_cards()
-        self.all_cards = get_predefined_cards()
+        self.all_cards = card_database.cards()
 
         self.selected_card_index = None
         self.selected_tavern_card_index = None
 
-        # Load card images
-        self.card_images = self.load_card_images()
-
         # Card display settings
-        self.card_width = 150
-        self.card_height = 200
+        self.card_width, self.card_height = self.CARD_SIZE
+        self.hover_offset = self.HOVER_OFFSET
         self.card_spacing = 130
 
         # Calculate centered positions
         self.start_x_player = (1200 - (4 * self.card_spacing)) // 2
         self.card_y_player = 500
 
-        self.start_x_tavern = (1200 - (len(self.all_cards) * self.card_spacing)) // 2
-        self.card_y_tavern = 250
-
-    def load_card_images(self):
-        """Loads images for all predefined cards."""
-        images = {}
-        for card in self.all_cards:
-            image_path = f"my-pygame-game/src/assets/Kartice/{card.name.lower().replace(' ', '_')}.png"
-            try:
-                images[card.name] = pygame.image.load(image_path)
-                images[card.name] = pygame.transform.scale(images[card.name], (150, 200))  # Resize cards
-            except pygame.error:
-                print(f"Warning: Image for {card.name} not found at {image_path}")
-                images[card.name] = None  # Use a placeholder if missing
-        return images
+        # Build normal and hovered card images once for the player's row; the catalog builds
+        # them as cards scroll into view
+        self.player_hand = CardHand(self.build_card_sprites(self.player_cards),
+                                    self.start_x_player, self.card_y_player, self.card_spacing)
+        self.tavern_grid = CardGrid(self.all_cards, self.CATALOG_RECT, self.CATALOG_CELL, self.CARD_SIZE,
+                                    self.build_card_sprite)
+        self.page_label = TextLabel("Page {}", self.info_font)
+        self.hover(self.game.input.mouse)
+
+        # Background, title and instructions never change, so flatten them into one cached layer
+        title_text = text_cache.render("Edit Your Deck", self.font, (255, 255, 255))
+        info_text = text_cache.render("Click on a player card, then a tavern card to swap | Wheel/PgUp/PgDn: Browse | E: Exit",
+                                      self.info_font, (255, 255, 255))
+        self.layer = DirtyLayer(compose_layer(
+            (1200, 800),
+            (self.background, (0, 0)),
+            (title_text, ((1200 - title_text.get_width()) // 2, 30)),
+            (info_text, ((1200 - info_text.get_width()) // 2, 750)),
+        ))
+
+    def build_card_sprite(self, card):
+        """Builds the normal and hovered sprite for one card."""
+        size = (self.card_width, self.card_height)
+        hover_size = (self.card_width + self.hover_offset, self.card_height + self.hover_offset)
+        return build_card_sprite(card, size, hover_size, image_path=self.card_image_path(card),
+                                 fallback=None, hover_anchor="center")
+
+    def build_card_sprites(self, cards):
+        """Builds normal and hovered sprites for the given cards."""
+        return [self.build_card_sprite(card) for card in cards]
+
+    def hover(self, pos):
+        self.player_hand.hover(pos)
+        self.tavern_grid.hover(pos)
+
+    def scroll_catalog(self, rows=0, pages=0):
+        """Scroll the tavern catalog, then start loading the page after the new view."""
+        if not self.tavern_grid.scroll(rows + pages * self.tavern_grid.visible_rows):
+            return
+        self.hover(self.game.input.mouse)
+        start, stop = self.tavern_grid.visible_range()
+        upcoming = self.all_cards[stop:stop + self.tavern_grid.page_size]
+        hover_size = (self.card_width + self.hover_offset, self.card_height + self.hover_offset)
+        self.game.preloader.request([(self.card_image_path(card), size) for card in upcoming
+                                     for size in (self.CARD_SIZE, hover_size)])
 
     def load_saved_cards(self):
-        try:
-            with open(self.SAVE_FILE, "r") as file:
-                card_data = json.load(file)
-                return [CardFactory.create_card(c["type"], c["name"], c["value"], c.get("image_path", "default.png")) for c in card_data]
-        except (FileNotFoundError, json.JSONDecodeError):
-            return get_predefined_cards()[:4]
+        return self.game.deck_store.load()
 
     def save_cards(self):
-        with open(self.SAVE_FILE, "w") as file:
-            json.dump(
-                [{"type": card.__class__.__name__.replace("Card", "").lower(), "name": card.name, "value": card.value, "image_path": card.image_path}
-                 for card in self.player_cards],
-                file
-            )
+        """Hand the deck to the DeckStore, which writes it in the background."""
+        self.game.deck_store.save(self.player_cards)
 
     def swap_card(self):
         """Swaps selected player card with a tavern card."""
         if self.selected_card_index is not None and self.selected_tavern_card_index is not None:
-            self.player_cards[self.selected_card_index], self.all_cards[self.selected_tavern_card_index] = (
-                self.all_cards[self.selected_tavern_card_index], self.player_cards[self.selected_card_index]
-            )
+            player_index, tavern_index = self.selected_card_index, self.selected_tavern_card_index
+            tavern_card, tavern_sprite = self.all_cards[tavern_index], self.tavern_grid.sprite(tavern_index)
+            self.tavern_grid.replace(tavern_index, self.player_cards[player_index], self.player_hand[player_index])
+            self.player_cards[player_index] = tavern_card
+            self.player_hand[player_index] = tavern_sprite
             self.selected_card_index = None
             # Reset selection
             self.save_cards()  # Save the updated cards
 
     def handle_events(self):
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-
-        for event in pygame.event.get():
+        for event in self.game.input.events():
             if event.type == pygame.QUIT:
                 self.game.running = False
+            elif event.type == pygame.MOUSEMOTION:
+                self.hover(event.pos)
+            elif event.type == pygame.MOUSEWHEEL:
+                self.scroll_catalog(rows=-event.y)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left mouse button
                     # Check if a player card is clicked
-                    for i in range(len(self.player_cards)):
-                        card_x = self.start_x_player + i * self.card_spacing
-                        if card_x <= mouse_x <= card_x + self.card_width and \
-                                self.card_y_player <= mouse_y <= self.card_y_player + self.card_height:
-                            self.selected_card_index = i
+                    index = self.player_hand.index_at(event.pos)
+                    if index is not None:
+                        self.selected_card_index = index
 
                     # Check if a tavern card is clicked
-                    for i in range(len(self.all_cards)):
-                        card_x = self.start_x_tavern + i * self.card_spacing
-                        if card_x <= mouse_x <= card_x + self.card_width and \
-                                self.card_y_tavern <= mouse_y <= self.card_y_tavern + self.card_height:
-                            self.selected_tavern_card_index = i
+                    index = self.tavern_grid.index_at(event.pos)
+                    if index is not None:
+                        self.selected_tavern_card_index = index
 
                     # Swap if both selections are made
                     if self.selected_card_index is not None and self.selected_tavern_card_index is not None:
@@ -104,6 +147,10 @@ class TavernScreen:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_e:
                     self.return_to_game()
+                elif event.key == pygame.K_PAGEDOWN:
+                    self.scroll_catalog(pages=1)
+                elif event.key == pygame.K_PAGEUP:
+                    self.scroll_catalog(pages=-1)
 
     def update(self):
         """Prevent crashes by ensuring update exists."""
@@ -112,56 +159,13 @@ class TavernScreen:
     def return_to_game(self):
         """Exit Tavern and return to the game while saving cards."""
         self.save_cards()
-        from screens.starting_area_screen import StartingAreaScreen
-        self.game.change_screen(StartingAreaScreen(self.game, self.game.selected_player))
+        self.game.goto("starting_area", self.game.selected_player)
 
     def draw(self, screen):
-        screen.blit(self.background, (0, 0))  # Draw Tavern Background
-
-        # Draw "Edit Your Deck" at the top center
-        title_text = self.font.render("Edit Your Deck", True, (255, 255, 255))
-        screen.blit(title_text, ((1200 - title_text.get_width()) // 2, 30))
-
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-
-        # Draw Player Cards (Bottom Row - Centered)
-        for i, card in enumerate(self.player_cards):
-            card_x = self.start_x_player + i * self.card_spacing
-
-            # Check if mouse is hovering over this card
-            is_hovered = card_x <= mouse_x <= card_x + self.card_width and \
-                         self.card_y_player <= mouse_y <= self.card_y_player + self.card_height
-
-            # Resize for hover effect
-            size_offset = 10 if is_hovered else 0
-            hover_width = self.card_width + size_offset
-            hover_height = self.card_height + size_offset
-            hover_x = card_x - size_offset // 2
-            hover_y = self.card_y_player - size_offset // 2
-
-            if self.card_images.get(card.name):
-                scaled_image = pygame.transform.scale(self.card_images[card.name], (hover_width, hover_height))
-                screen.blit(scaled_image, (hover_x, hover_y))
-
-        # Draw Tavern Cards (Top Row - Centered)
-        for i, card in enumerate(self.all_cards):
-            card_x = self.start_x_tavern + i * self.card_spacing
-
-            # Check if mouse is hovering over this card
-            is_hovered = card_x <= mouse_x <= card_x + self.card_width and \
-                         self.card_y_tavern <= mouse_y <= self.card_y_tavern + self.card_height
-
-            # Resize for hover effect
-            size_offset = 10 if is_hovered else 0
-            hover_width = self.card_width + size_offset
-            hover_height = self.card_height + size_offset
-            hover_x = card_x - size_offset // 2
-            hover_y = self.card_y_tavern - size_offset // 2
-
-            if self.card_images.get(card.name):
-                scaled_image = pygame.transform.scale(self.card_images[card.name], (hover_width, hover_height))
-                screen.blit(scaled_image, (hover_x, hover_y))
-
-        # Instructions at the bottom
-        info_text = self.info_font.render("Click on a player card, then a tavern card to swap | E: Exit", True, (255, 255, 255))
-        screen.blit(info_text, ((1200 - info_text.get_width()) // 2, 750))
+        # Draw Player Cards (Bottom Row) and the visible part of the catalog over the cached background
+        items = list(self.player_hand.items())
+        items.extend(self.tavern_grid.items())
+        if self.tavern_grid.pages > 1:
+            self.page_label.set(f"{self.tavern_grid.page + 1}/{self.tavern_grid.pages}")
+            items.append(("page", self.page_label.surface, self.page_label.surface.get_rect(topright=(1160, 35))))
+        return self.layer.render(screen, items)
@@ -0,0 +1,402 @@
+"""Headless combat sessions hosted on asyncio, for bot play and soak tests.
+
+Each session is one fight under GameplayScreen's rules: a CombatEngine
+for card use, enemy turns and round progression (the boss appears in
+round ``max_rounds``), with the enemy AI for the current enemy. There is
+no pygame and no enemy delay; a turn is answered as soon as it is played.
+
+Clients talk to a SessionHost through a SocketClient (JSON lines over a
+local TCP or Unix socket) or a LocalClient, an in-process stand-in with
+the same calls. Requests are dicts with an ``op``:
+
+    {"op": "start", "deck": [[kind, value], ...], "health": 100, "seed": 1}
+        -> {"session": 7, "state": {...}}
+    {"op": "act", "session": 7, "action": -1}
+        -> {"player": 12, "enemy": ["attack", 9], "state": {...}, "outcome": None}
+    {"op": "end", "session": 7}
+        -> {"ended": True}
+
+``action`` is a card index or ATTACK (-1); ``player`` is the attack
+damage or the card's [kind, value]. Failed requests get ``{"error": ...}``.
+A socket client can only play and end the sessions it started.
+Over a socket, requests carry an ``id`` that is echoed in the reply, so
+replies can arrive out of order. Serve from the repository root with:
+
+    python my-pygame-game/src/session_server.py --port 8765
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+from collections import OrderedDict
+
+from card import get_predefined_cards
+from combat_engine import ATTACK, KIND_NAMES, MAX_ROUNDS, CombatEngine, CombatState, deck_from_cards
+from enemy_ai import TranspositionTable, enemy_ai_for
+
+THINK_NODES = 200  # Search nodes an enemy AI thinks before letting other sessions run, as in GameplayScreen
+DEFAULT_HEALTH = 100
+DEFAULT_PORT = 8765
+
+
+class SessionError(Exception):
+    """A request that can't be served: unknown session or op, bad deck or action, finished fight."""
+
+
+def state_to_dict(state):
+    return dict(zip(CombatState.__slots__, state.as_tuple()))
+
+
+def parse_deck(data):
+    """A deck sent as [[kind, value], ...], checked, in CombatEngine's form."""
+    try:
+        deck = tuple((int(kind), int(value)) for kind, value in data)
+    except (TypeError, ValueError):
+        raise SessionError("deck must be a list of [kind, value] pairs") from None
+    if not deck:
+        raise SessionError("deck is empty")
+    if any(not 0 <= kind < len(KIND_NAMES) for kind, _ in deck):
+        raise SessionError(f"card kinds are 0-{len(KIND_NAMES) - 1} ({', '.join(KIND_NAMES)})")
+    return deck
+
+
+class CombatSession:
+    """One fight, played a turn per ``play_turn`` call the way GameplayScreen plays it.
+
+    Args:
+        session_id (int): The host's id for it.
+        deck (tuple): (kind, value) pairs.
+        player_health (int): Starting player health.
+        seed: Seed for the engine's RNG.
+        max_rounds (int): Round in which the boss appears.
+        table (TranspositionTable): Shared with other sessions' bosses that face the same deck.
+    """
+
+    def __init__(self, session_id, deck, player_health, seed=None, max_rounds=MAX_ROUNDS, table=None):
+        self.id = session_id
+        self.engine = CombatEngine(deck, player_health, seed=seed, max_rounds=max_rounds)
+        self.table = table
+        self.enemy_ai = enemy_ai_for(self.engine.state.enemy_type, table)
+        self.busy = False  # A turn is being played
+
+    async def play_turn(self, action):
+        """Player action, enemy turn and round progression. Returns the reply."""
+        engine = self.engine
+        if engine.is_over:
+            raise SessionError(f"session {self.id} is over ({engine.state.outcome})")
+        if action != ATTACK and not (isinstance(action, int) and 0 <= action < len(engine.deck)):
+            raise SessionError(f"action must be {ATTACK} (attack) or a card index below {len(engine.deck)}")
+        if self.busy:
+            raise SessionError(f"session {self.id} is already playing a turn")
+        self.busy = True
+        try:
+            player = engine.player_action(action)
+            # Think in slices, letting other sessions' turns run in between
+            self.enemy_ai.start(engine.state, engine.deck)
+            while not self.enemy_ai.think(THINK_NODES):
+                await asyncio.sleep(0)
+            enemy = engine.enemy_turn(self.enemy_ai.decision())
+            previous_round = engine.state.round
+            outcome = engine.end_round()
+            if engine.state.round != previous_round:
+                self.enemy_ai = enemy_ai_for(engine.state.enemy_type, self.table)  # Next enemy, or the boss
+        finally:
+            self.busy = False
+        return {"player": list(player) if isinstance(player, tuple) else player, "enemy": list(enemy),
+                "state": state_to_dict(engine.state), "outcome": outcome}
+
+
+class SessionHost:
+    """Every open session, with limits that keep a loaded host responsive.
+
+    - At most ``max_sessions`` sessions are open; "start" waits for a free
+      slot instead of failing, so bots slow down rather than pile up.
+    - At most ``max_active_turns`` turns are played at once; later ones
+      wait their turn in arrival order.
+    - Enemy AIs think in THINK_NODES slices and yield in between, so a
+      boss search never holds up other sessions' turns for long.
+
+    Bosses facing the same deck share a TranspositionTable, so thousands
+    of boss fights don't each build their own. Tables for the
+    ``table_decks`` most recently started decks are kept.
+    """
+
+    def __init__(self, max_sessions=10_000, max_active_turns=64, table_decks=8):
+        self.sessions = {}
+        self.max_sessions = max_sessions
+        self.table_decks = table_decks
+        self._ids = itertools.count(1)
+        self._slots = asyncio.Semaphore(max_sessions)
+        self._turns = asyncio.Semaphore(max_active_turns)
+        self._tables = OrderedDict()  # deck -> TranspositionTable
+        self.started = 0
+        self.ended = 0
+        self.turns = 0
+        self.peak_sessions = 0
+        self.start_waits = 0  # Starts that had to wait for a free slot
+        self.turn_waits = 0  # Turns that had to wait for another to finish
+
+    def table_for(self, deck):
+        table = self._tables.pop(deck, None)
+        if table is None:
+            table = TranspositionTable()
+            if len(self._tables) >= self.table_decks:
+                self._tables.popitem(last=False)
+        self._tables[deck] = table
+        return table
+
+    async def start(self, deck=None, health=DEFAULT_HEALTH, seed=None, max_rounds=MAX_ROUNDS):
+        """Open a session. Waits while ``max_sessions`` are open."""
+        deck = parse_deck(deck) if deck is not None else deck_from_cards(get_predefined_cards()[:4])
+        health, max_rounds = int(health), int(max_rounds)  # Checked before taking a slot
+        if self._slots.locked():
+            self.start_waits += 1
+        await self._slots.acquire()
+        session = CombatSession(next(self._ids), deck, health, seed, max_rounds, self.table_for(deck))
+        self.sessions[session.id] = session
+        self.started += 1
+        self.peak_sessions = max(self.peak_sessions, len(self.sessions))
+        return session
+
+    def get(self, session_id):
+        try:
+            return self.sessions[session_id]
+        except KeyError:
+            raise SessionError(f"no session {session_id}") from None
+
+    async def act(self, session_id, action):
+        session = self.get(session_id)
+        await asyncio.sleep(0)  # Every turn lets other sessions run, even when nothing else would wait
+        if self._turns.locked():
+            self.turn_waits += 1
+        async with self._turns:
+            reply = await session.play_turn(action)
+        self.turns += 1
+        return reply
+
+    def end(self, session_id):
+        """Close a session and free its slot. Ending a session twice does nothing."""
+        if self.sessions.pop(session_id, None) is not None:
+            self.ended += 1
+            self._slots.release()
+
+    async def handle(self, request, owned=None):
+        """Serve one request dict and return the reply.
+
+        ``owned`` collects the ids of sessions opened through it; when it is
+        given, ``act`` and ``end`` are refused for any other session, so a
+        socket client can't play or close another client's fights by
+        guessing their ids.
+        """
+        reply = {} if request.get("id") is None else {"id": request["id"]}
+        try:
+            op = request.get("op")
+            if op in ("act", "end") and owned is not None and request.get("session") not in owned:
+                raise SessionError(f"no session {request.get('session')}")  # Same reply as for an unknown id
+            if op == "start":
+                session = await self.start(request.get("deck"), request.get("health", DEFAULT_HEALTH),
+                                           request.get("seed"), request.get("max_rounds", MAX_ROUNDS))
+                if owned is not None:
+                    owned.add(session.id)
+                reply.update(session=session.id, state=state_to_dict(session.engine.state))
+            elif op == "act":
+                reply.update(await self.act(request.get("session"), request.get("action")))
+            elif op == "end":
+                self.end(request.get("session"))
+                if owned is not None:
+                    owned.discard(request.get("session"))
+                reply["ended"] = True
+            else:
+                raise SessionError(f"unknown op {op!r}")
+        except SessionError as e:
+            reply["error"] = str(e)
+        except (TypeError, ValueError) as e:  # e.g. a health that isn't a number
+            reply["error"] = f"bad request: {e}"
+        return reply
+
+    def stats(self):
+        return {"open": len(self.sessions), "peak": self.peak_sessions, "started": self.started,
+                "ended": self.ended, "turns": self.turns, "start_waits": self.start_waits,
+                "turn_waits": self.turn_waits, "tables": len(self._tables)}
+
+
+async def serve_connection(host, reader, writer, max_in_flight=32):
+    """Serve one socket client: a JSON request per line in, a JSON reply per line out.
+
+    Up to ``max_in_flight`` requests are worked on at once. Beyond that the
+    connection isn't read until one finishes, so a client sending faster
+    than the host keeps up is held back by the socket's flow control
+    rather than queueing unbounded work. Sessions the client opened are
+    ended when it disconnects.
+    """
+    owned = set()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    write_lock = asyncio.Lock()
+    tasks = set()
+
+    async def send(reply):
+        async with write_lock:
+            writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+            await writer.drain()
+
+    async def answer(request):
+        try:
+            await send(await host.handle(request, owned))
+        except ConnectionError:
+            pass
+        finally:
+            in_flight.release()
+
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            await in_flight.acquire()
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("not an object")
+            except ValueError as e:
+                in_flight.release()
+                await send({"error": f"bad request: {e}"})
+                continue
+            task = asyncio.ensure_future(answer(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except ConnectionError:
+        pass
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for session_id in owned:
+            host.end(session_id)
+        writer.close()
+
+
+async def serve(host, port=DEFAULT_PORT, path=None, max_in_flight=32):
+    """Listen on localhost ``port``, or on the Unix socket ``path``. Returns the asyncio server."""
+    def on_connect(reader, writer):
+        return serve_connection(host, reader, writer, max_in_flight)
+    if path is not None:
+        return await asyncio.start_unix_server(on_connect, path)
+    return await asyncio.start_server(on_connect, "127.0.0.1", port)
+
+
+class _ClientCalls:
+    """The session calls shared by LocalClient and SocketClient, which each provide ``request``."""
+
+    async def call(self, op, **fields):
+        reply = await self.request(dict(fields, op=op))
+        if "error" in reply:
+            raise SessionError(reply["error"])
+        return reply
+
+    async def start(self, deck=None, health=DEFAULT_HEALTH, seed=None, max_rounds=MAX_ROUNDS):
+        """Open a session. Returns the reply, with the id under "session"."""
+        return await self.call("start", deck=[list(card) for card in deck] if deck is not None else None,
+                               health=health, seed=seed, max_rounds=max_rounds)
+
+    async def act(self, session, action):
+        return await self.call("act", session=session, action=action)
+
+    async def end(self, session):
+        await self.call("end", session=session)
+
+
+class LocalClient(_ClientCalls):
+    """Talks to a SessionHost in the same process, with the same calls as SocketClient."""
+
+    def __init__(self, host):
+        self.host = host
+
+    async def request(self, request):
+        return await self.host.handle(request)
+
+    async def close(self):
+        pass
+
+
+class SocketClient(_ClientCalls):
+    """Talks to a session server over a socket. Many requests can be in flight at once."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._ids = itertools.count(1)
+        self._waiting = {}  # request id -> Future for its reply
+        self._reader_task = asyncio.ensure_future(self._read_replies())
+
+    @classmethod
+    async def connect(cls, port=DEFAULT_PORT, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        return cls(reader, writer)
+
+    async def request(self, request):
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self.writer.write(json.dumps(dict(request, id=request_id), separators=(",", ":")).encode() + b"\n")
+        await self.writer.drain()
+        return await future
+
+    async def _read_replies(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self._waiting.pop(reply.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except ConnectionError:
+            pass
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("session server closed the connection"))
+            self._waiting.clear()
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self._reader_task
+
+
+async def main(args):
+    host = SessionHost(max_sessions=args.max_sessions, max_active_turns=args.max_active_turns)
+    server = await serve(host, args.port, args.unix, args.max_in_flight)
+    where = args.unix or f"127.0.0.1:{args.port}"
+    print(f"Serving combat sessions on {where} (up to {args.max_sessions} sessions, "
+          f"{args.max_active_turns} turns at once)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Host headless combat sessions for bots and soak tests")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="localhost TCP port (default 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-sessions", type=int, default=10_000,
+                        help="open sessions allowed at once; further starts wait (default 10000)")
+    parser.add_argument("--max-active-turns", type=int, default=64,
+                        help="turns played at once; further turns wait (default 64)")
+    parser.add_argument("--max-in-flight", type=int, default=32,
+                        help="requests per connection worked on at once before reading stops (default 32)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,304 @@
+"""Binary snapshots of a run, so quitting in the middle of a fight loses nothing.
+
+A snapshot is a header followed by tagged sections, all little-endian:
+
+    header   magic b"SISK", format version (uint16), section count (uint16)
+    section  tag (uint8), payload length (uint32), payload
+
+The RUN section holds the screen to resume on, who the player is, the
+deck and the game's RNG, which only change between fights; the PLAYER
+section holds health and shield; the COMBAT section, present only
+mid-fight, holds the CombatState, the engine's RNG and what the screen
+was showing. Readers
+skip sections they don't know, so a section can be added without
+breaking older saves; SNAPSHOT_VERSION only changes when the layout of
+an existing section does. Snapshots are only taken at turn boundaries,
+so no turn phase or timer is stored.
+"""
+import os
+import struct
+
+from combat_engine import BOSS_ENEMY_TYPE, CombatState
+from deck_store import DEFAULT_DECK_PATH, card_to_dict
+from utils.background_writer import BackgroundWriter
+
+SNAPSHOT_MAGIC = b"SISK"
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(DEFAULT_DECK_PATH), "savegame.bin")
+
+SECTION_RUN = 1
+SECTION_PLAYER = 2
+SECTION_COMBAT = 3
+
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<BI")
+_LENGTH = struct.Struct("<H")  # Strings and the card count
+_PLAYER = struct.Struct("<ii")  # health, shield
+_CARD_VALUE = struct.Struct("<i")
+_COMBAT = struct.Struct("<iiBiHIHi3B")  # CombatState, max rounds, start health, action colour
+_RNG_WORDS = struct.Struct("<625I")  # Mersenne Twister state: 624 words and the position
+_RNG_GAUSS = struct.Struct("<Bd")  # Whether a gauss() value is cached, and the value
+
+
+class SnapshotError(ValueError):
+    """The data is not a snapshot this version can read."""
+
+
+class CombatSnapshot:
+    """A fight at a turn boundary: the engine's state and RNG plus what the screen showed."""
+
+    __slots__ = ("state", "max_rounds", "rng_state", "start_health", "action_text", "action_color")
+
+    def __init__(self, state, max_rounds, rng_state, start_health, action_text="", action_color=(255, 255, 255)):
+        self.state = state
+        self.max_rounds = max_rounds
+        self.rng_state = rng_state
+        self.start_health = start_health  # Player health restored after a loss
+        self.action_text = action_text
+        self.action_color = tuple(action_color)
+
+
+class RunSnapshot:
+    """Everything needed to continue a run on the screen it was saved on.
+
+    Args:
+        screen (str): ScreenRegistry name to resume on, "starting_area" or "gameplay".
+        player_name (str): As in ChoosePlayerScreen.PLAYER_OPTIONS.
+        player_image (str): Path of the player's art.
+        player_health (int): Current health.
+        player_shield (int): Current shield.
+        deck (list): Card dicts, see ``deck_store.card_to_dict``.
+        rng_state (tuple): ``Game.rng.getstate()``.
+        combat (CombatSnapshot): The fight in progress, or None outside combat.
+    """
+
+    __slots__ = ("screen", "player_name", "player_image", "player_health", "player_shield", "deck",
+                 "rng_state", "combat")
+
+    def __init__(self, screen, player_name, player_image, player_health, player_shield, deck, rng_state,
+                 combat=None):
+        self.screen = screen
+        self.player_name = player_name
+        self.player_image = player_image
+        self.player_health = player_health
+        self.player_shield = player_shield
+        self.deck = deck
+        self.rng_state = rng_state
+        self.combat = combat
+
+    @classmethod
+    def capture(cls, game, screen, player, combat=None):
+        """Snapshot the run as it is now, with the deck from ``game.deck_store``."""
+        return cls(screen, player.name, player.variants.path, player.health, player.shield,
+                   [card_to_dict(card) for card in game.deck_store.load()], game.rng.getstate(), combat)
+
+    def run_key(self):
+        """Everything in the RUN section, to tell whether it needs encoding again."""
+        return (self.screen, self.player_name, self.player_image, tuple(tuple(card.values()) for card in self.deck),
+                self.rng_state)
+
+
+def _pack_string(parts, text):
+    data = text.encode("utf-8")
+    parts.append(_LENGTH.pack(len(data)))
+    parts.append(data)
+
+
+def _pack_rng(parts, state):
+    version, words, gauss = state
+    if version != 3:
+        raise SnapshotError(f"unsupported random state version {version}")
+    parts.append(_RNG_WORDS.pack(*words))
+    parts.append(_RNG_GAUSS.pack(gauss is not None, gauss or 0.0))
+
+
+def _section(tag, parts):
+    payload = b"".join(parts)
+    return _SECTION.pack(tag, len(payload)) + payload
+
+
+def encode_run(snapshot):
+    """The RUN section of ``snapshot``."""
+    parts = []
+    _pack_string(parts, snapshot.screen)
+    _pack_string(parts, snapshot.player_name)
+    _pack_string(parts, snapshot.player_image)
+    parts.append(_LENGTH.pack(len(snapshot.deck)))
+    for card in snapshot.deck:
+        _pack_string(parts, card["type"])
+        _pack_string(parts, card["name"])
+        parts.append(_CARD_VALUE.pack(card["value"]))
+        _pack_string(parts, card["image_path"])
+    _pack_rng(parts, snapshot.rng_state)
+    return _section(SECTION_RUN, parts)
+
+
+def encode_combat(combat):
+    """The COMBAT section for ``combat``."""
+    state = combat.state
+    enemy_type = 0 if state.enemy_type == BOSS_ENEMY_TYPE else state.enemy_type  # Normal types start at 1
+    parts = [_COMBAT.pack(state.player_health, state.player_shield, enemy_type, state.enemy_health,
+                          state.round, state.turns, combat.max_rounds, combat.start_health, *combat.action_color)]
+    _pack_string(parts, combat.action_text)
+    _pack_rng(parts, combat.rng_state)
+    return _section(SECTION_COMBAT, parts)
+
+
+def encode_snapshot(snapshot, run_section=None):
+    """Serialize ``snapshot``. ``run_section`` reuses an already encoded RUN section."""
+    sections = [run_section if run_section is not None else encode_run(snapshot),
+                _section(SECTION_PLAYER, [_PLAYER.pack(snapshot.player_health, snapshot.player_shield)])]
+    if snapshot.combat is not None:
+        sections.append(encode_combat(snapshot.combat))
+    return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(sections)) + b"".join(sections)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, layout):
+        try:
+            values = layout.unpack_from(self.data, self.offset)
+        except struct.error:
+            raise SnapshotError("snapshot is truncated") from None
+        self.offset += layout.size
+        return values
+
+    def string(self):
+        (length,) = self.unpack(_LENGTH)
+        end = self.offset + length
+        if end > len(self.data):
+            raise SnapshotError("snapshot is truncated")
+        text = str(self.data[self.offset:end], "utf-8")
+        self.offset = end
+        return text
+
+    def rng(self):
+        words = self.unpack(_RNG_WORDS)
+        has_gauss, gauss = self.unpack(_RNG_GAUSS)
+        return (3, words, gauss if has_gauss else None)
+
+
+def _decode_run(reader):
+    screen = reader.string()
+    player_name = reader.string()
+    player_image = reader.string()
+    (count,) = reader.unpack(_LENGTH)
+    deck = []
+    for _ in range(count):
+        card_type = reader.string()
+        name = reader.string()
+        (value,) = reader.unpack(_CARD_VALUE)
+        deck.append({"type": card_type, "name": name, "value": value, "image_path": reader.string()})
+    return RunSnapshot(screen, player_name, player_image, 0, 0, deck, reader.rng())
+
+
+def _decode_combat(reader):
+    (player_health, player_shield, enemy_type, enemy_health, round, turns, max_rounds, start_health,
+     red, green, blue) = reader.unpack(_COMBAT)
+    state = CombatState(player_health, player_shield, enemy_type or BOSS_ENEMY_TYPE, enemy_health, round, turns)
+    action_text = reader.string()
+    return CombatSnapshot(state, max_rounds, reader.rng(), start_health, action_text, (red, green, blue))
+
+
+def decode_snapshot(data):
+    """Read a snapshot written by ``encode_snapshot``. Raises SnapshotError if it can't."""
+    data = memoryview(data)
+    reader = _Reader(data)
+    magic, version, count = reader.unpack(_HEADER)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"unsupported snapshot version {version}")
+    snapshot = player = combat = None
+    for _ in range(count):
+        tag, length = reader.unpack(_SECTION)
+        end = reader.offset + length
+        if end > len(data):
+            raise SnapshotError("snapshot is truncated")
+        section = _Reader(data[:end])
+        section.offset = reader.offset
+        if tag == SECTION_RUN:
+            snapshot = _decode_run(section)
+        elif tag == SECTION_PLAYER:
+            player = section.unpack(_PLAYER)
+        elif tag == SECTION_COMBAT:
+            combat = _decode_combat(section)
+        reader.offset = end  # Sections from newer versions are skipped
+    if snapshot is None or player is None:
+        raise SnapshotError("snapshot is missing its run or player section")
+    snapshot.player_health, snapshot.player_shield = player
+    snapshot.combat = combat
+    return snapshot
+
+
+class SnapshotStore:
+    """The autosave file, written in the background.
+
+    ``save`` encodes on the calling thread, which takes well under a
+    millisecond, and hands the bytes to a BackgroundWriter, the same
+    writer DeckStore uses, which replaces the file atomically. Only the
+    latest snapshot is written if several arrive while a write is in
+    progress. The RUN section is kept from the previous save and only
+    encoded again when the screen, deck or game RNG changed, so a save
+    between two turns of a fight only encodes health and the COMBAT
+    section. Saving
+    the same bytes as last time does nothing. Call ``flush`` before
+    exiting.
+    """
+
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        self._run_key = None
+        self._run_section = None
+        self._writer = BackgroundWriter(path, "run")
+
+    @property
+    def saves(self):
+        return self._writer.saves
+
+    @property
+    def writes(self):
+        return self._writer.writes
+
+    @property
+    def last_error(self):
+        return self._writer.last_error
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def read_bytes(self):
+        """The saved file as it is on disk, or None if there is none."""
+        try:
+            with open(self.path, "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def load(self):
+        """The saved RunSnapshot, or None if there is none or it can't be read."""
+        data = self.read_bytes()
+        if data is None:
+            return None
+        try:
+            snapshot = decode_snapshot(data)
+        except (SnapshotError, UnicodeDecodeError) as e:
+            print(f"Warning: ignoring saved run in {self.path}: {e}")
+            return None
+        self._writer.remember(data)
+        return snapshot
+
+    def save(self, snapshot):
+        """Encode ``snapshot`` now and write it in the background."""
+        run_key = snapshot.run_key()
+        if run_key != self._run_key:
+            self._run_section = encode_run(snapshot)
+            self._run_key = run_key
+        self._writer.submit(encode_snapshot(snapshot, self._run_section))
+
+    def flush(self, timeout=None):
+        """Wait for any pending write. Returns False on timeout."""
+        return self._writer.flush(timeout)
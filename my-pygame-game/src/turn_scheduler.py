@@ -0,0 +1,69 @@
+# Turn phases, in the order a combat turn goes through them
+PLAYER_ACTION = "player_action"  # Waiting for the player to attack or use a card
+ENEMY_DELAY = "enemy_delay"  # Showing the player's action before the enemy responds
+ENEMY_ACTION = "enemy_action"
+ROUND_TRANSITION = "round_transition"  # Next enemy, boss, win or loss
+BANNER = "banner"  # Showing "You Win!" / "You Lose!" before leaving combat
+FINISHED = "finished"
+
+
+class TurnScheduler:
+    """Timer-driven combat turn state machine.
+
+    Instead of sleeping inside the event handler, the screen calls ``update``
+    once per frame with the current time in milliseconds, and the scheduler
+    moves on to the next phase once its delay has elapsed. Rendering and
+    input keep running at full frame rate during every delay.
+
+    Args:
+        enemy_action (callable): Performs the enemy's turn.
+        round_transition (callable): Advances rounds and returns "win", "lose" or None.
+        finish (callable): Called with the outcome once its banner has been shown.
+        enemy_delay (int): Milliseconds between the player's action and the enemy's.
+        banner_duration (int): Milliseconds the win/lose banner stays up.
+    """
+
+    def __init__(self, enemy_action, round_transition, finish, enemy_delay=1000, banner_duration=2000):
+        self.enemy_action = enemy_action
+        self.round_transition = round_transition
+        self.finish = finish
+        self.enemy_delay = enemy_delay
+        self.banner_duration = banner_duration
+        self.phase = PLAYER_ACTION
+        self.phase_started = 0
+        self.outcome = None
+
+    @property
+    def is_player_turn(self):
+        return self.phase == PLAYER_ACTION
+
+    def _enter(self, phase, now):
+        self.phase = phase
+        self.phase_started = now
+
+    def end_player_turn(self, now):
+        """Call after the player acted; the enemy responds after ``enemy_delay``."""
+        if self.phase == PLAYER_ACTION:
+            self._enter(ENEMY_DELAY, now)
+
+    def update(self, now):
+        """Advance through every phase whose delay has elapsed. Never blocks."""
+        if self.phase == ENEMY_DELAY:
+            if now - self.phase_started < self.enemy_delay:
+                return
+            self._enter(ENEMY_ACTION, now)
+
+        if self.phase == ENEMY_ACTION:
+            self.enemy_action()
+            self._enter(ROUND_TRANSITION, now)
+
+        if self.phase == ROUND_TRANSITION:
+            self.outcome = self.round_transition()
+            if self.outcome is None:
+                self._enter(PLAYER_ACTION, now)
+                return
+            self._enter(BANNER, now)
+
+        if self.phase == BANNER and now - self.phase_started >= self.banner_duration:
+            self._enter(FINISHED, now)
+            self.finish(self.outcome)
@@ -0,0 +1,232 @@
+import json
+import os
+from collections import OrderedDict
+
+import pygame
+
+
+class AssetManager:
+    """Decodes every image file once and hands out display-format surfaces.
+
+    Decoded sources are kept for the lifetime of the game. Scaled and flipped
+    variants are keyed by (path, size, flip) and live in an LRU that is capped
+    by a memory budget, so screens can ask for the same art at whatever size
+    they need without touching the disk again.
+
+    Images packed into an atlas (see ``register_atlas``) are served as
+    subsurfaces of the atlas sheet, so the whole sheet is decoded once
+    instead of every file on its own. With a ``raw_cache`` set, images
+    pre-scaled by tools/build_asset_cache.py are read from it before
+    falling back to decoding and scaling the original file.
+    """
+
+    def __init__(self, budget_bytes=64 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._sources = {}  # path -> decoded source surface
+        self._missing = set()  # Paths that failed to load, so we don't retry them
+        self._variants = OrderedDict()  # (path, size, flip) -> surface, oldest first
+        self._variant_bytes = 0
+        self._atlas = {}  # source path -> (atlas sheet path, rect)
+        self.raw_cache = None  # Optional RawImageCache of pre-scaled images
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0  # Number of times an image file was actually read
+        self.cache_loads = 0  # Images read from the raw cache instead
+
+    @staticmethod
+    def _key(path):
+        return os.path.normpath(path)
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    @staticmethod
+    def _to_display_format(surface):
+        """Convert to the display pixel format so blits take the fast path."""
+        if pygame.display.get_surface() is None:
+            return surface  # No display yet, convert once one exists
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def register_atlas(self, manifest_path):
+        """Serve the images listed in an atlas manifest from its sheet.
+
+        Entries whose source file has changed size since the atlas was built
+        are skipped, so edited art is loaded from the file until the atlas is
+        rebuilt. Returns the number of images registered; a missing manifest
+        registers nothing.
+        """
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        base = os.path.dirname(manifest_path)
+        sheet = self._key(os.path.join(base, manifest["image"]))
+        source_dir = os.path.join(base, manifest["source_dir"])
+        registered = 0
+        for filename, entry in manifest["entries"].items():
+            source = self._key(os.path.join(source_dir, filename))
+            try:
+                stale = os.path.getsize(source) != entry["bytes"]
+            except OSError:
+                stale = False  # Only the packed copy exists, which is fine
+            if stale:
+                print(f"Warning: {source} changed since the card atlas was built, loading it directly")
+                continue
+            self._atlas[source] = (sheet, pygame.Rect(entry["rect"]))
+            registered += 1
+        return registered
+
+    def atlas_region(self, path):
+        """Return (file to decode, rect within it or None) for an image path."""
+        key = self._key(path)
+        return self._atlas.get(key, (key, None))
+
+    def load(self, path):
+        """Return the full-size surface for an image file, decoding it only once."""
+        key = self._key(path)
+        entry = self._sources.get(key)
+        if entry is None and key in self._atlas:
+            sheet_path, rect = self._atlas[key]
+            try:
+                sheet = self.load(sheet_path)
+                entry = [sheet.subsurface(rect), self._sources[sheet_path][1]]
+                self._sources[key] = entry
+            except (pygame.error, FileNotFoundError, ValueError):
+                del self._atlas[key]  # Broken atlas, use the original file instead
+        if entry is None:
+            if key in self._missing:
+                raise FileNotFoundError(f"Image previously failed to load: {key}")
+            surface = self.raw_cache.load(key) if self.raw_cache is not None else None
+            if surface is not None:
+                self.cache_loads += 1
+            else:
+                try:
+                    surface = pygame.image.load(key)
+                except (pygame.error, FileNotFoundError):
+                    self._missing.add(key)
+                    raise
+                self.decodes += 1
+            entry = [surface, False]
+            self._sources[key] = entry
+        if not entry[1] and pygame.display.get_surface() is not None:
+            entry[0] = self._to_display_format(entry[0])
+            entry[1] = True
+        return entry[0]
+
+    def get(self, path, size=None, flip=False, fallback=None):
+        """Return an image scaled to ``size`` and optionally flipped horizontally.
+
+        If the file cannot be loaded and a ``fallback`` path is given, the
+        fallback image is returned at the same size instead.
+        """
+        size = tuple(size) if size is not None else None
+        if size is None and not flip:
+            try:
+                return self.load(path)
+            except (pygame.error, FileNotFoundError):
+                if fallback is None:
+                    raise
+                return self.load(fallback)
+
+        key = (self._key(path), size, flip)
+        surface = self._variants.get(key)
+        if surface is not None:
+            self._variants.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if not flip and self.raw_cache is not None:
+            surface = self.raw_cache.load(key[0], size)
+            if surface is not None:
+                self.cache_loads += 1
+                surface = self._to_display_format(surface)
+                self._store(key, surface)
+                return surface
+        try:
+            source = self.load(path)
+        except (pygame.error, FileNotFoundError):
+            if fallback is None:
+                raise
+            return self.get(fallback, size, flip)
+
+        surface = source
+        if size is not None and size != source.get_size():
+            surface = pygame.transform.scale(surface, size)
+        if flip:
+            surface = pygame.transform.flip(surface, True, False)
+        self._store(key, surface)
+        return surface
+
+    def has(self, path, size=None, flip=False):
+        """Return True if the image is already available without touching the disk."""
+        size = tuple(size) if size is not None else None
+        if size is None and not flip:
+            return self._key(path) in self._sources
+        return (self._key(path), size, flip) in self._variants
+
+    def adopt(self, path, source, size=None, surface=None):
+        """Take over images decoded elsewhere, e.g. by the background Preloader.
+
+        Must be called on the main thread, since surfaces are converted to the
+        display format here. Anything already cached is left alone. For
+        images in an atlas, ``source`` is the whole atlas sheet. A ``surface``
+        without a ``source`` came from the raw cache.
+        """
+        key = self._key(path)
+        if source is None:
+            self.cache_loads += 1
+            if size is None and key not in self._sources:
+                self._sources[key] = [surface, False]  # A full-size image is a source
+                self.load(key)
+        elif key not in self._sources:
+            decoded = self._atlas[key][0] if key in self._atlas else key
+            if decoded not in self._sources:
+                self._sources[decoded] = [source, False]
+                self.decodes += 1
+            self.load(key)  # Converts to display format when possible
+        if size is not None and surface is not None:
+            variant_key = (key, tuple(size), False)
+            if variant_key not in self._variants:
+                self._store(variant_key, self._to_display_format(surface))
+
+    def mark_missing(self, path):
+        self._missing.add(self._key(path))
+
+    def _store(self, key, surface):
+        self._variants[key] = surface
+        self._variant_bytes += self._surface_bytes(surface)
+        # Evict least recently used variants, but never the one just added
+        while self._variant_bytes > self.budget_bytes and len(self._variants) > 1:
+            _, evicted = self._variants.popitem(last=False)
+            self._variant_bytes -= self._surface_bytes(evicted)
+
+    def stats(self):
+        """Return cache counters, useful for debugging and overlays."""
+        lookups = self.hits + self.misses
+        return {
+            "sources": len(self._sources),
+            "variants": len(self._variants),
+            "variant_bytes": self._variant_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "decodes": self.decodes,
+            "cache_loads": self.cache_loads,
+        }
+
+    def clear(self):
+        """Drop every cached image. Registered atlases stay registered."""
+        self._sources.clear()
+        self._missing.clear()
+        self._variants.clear()
+        self._variant_bytes = 0
+
+
+# Shared instance used by every screen, sprite and helper
+asset_manager = AssetManager()
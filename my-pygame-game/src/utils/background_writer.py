@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+import time
+
+
+class BackgroundWriter:
+    """Writes bytes to one file on a background thread, replacing it atomically.
+
+    ``submit`` queues data and returns right away; the thread waits
+    ``delay`` seconds for newer data, restarting the wait on every submit,
+    and writes only the latest. Writes go to a temporary file in the same
+    directory that then replaces the real one, so a crash mid-write never
+    leaves a truncated file behind. Submitting the same bytes as the latest
+    ones read, queued or in flight does nothing; if a write fails and
+    nothing newer is queued, that record is dropped so submitting the same
+    bytes again retries. Used by DeckStore and SnapshotStore.
+
+    Args:
+        path (str): File to write.
+        what (str): What the file holds, for the warning printed when a write fails.
+        delay (float): Seconds to wait for newer data before writing.
+    """
+
+    def __init__(self, path, what, delay=0.0):
+        self.path = path
+        self.what = what
+        self.delay = delay
+        self._latest = None  # Latest data read from disk or submitted, queued or in flight
+        self._pending = None  # Data waiting for the writer thread
+        self._due = 0.0
+        self._writing = False
+        self._flushing = False
+        self._condition = threading.Condition()
+        self._thread = None
+        self.saves = 0
+        self.writes = 0
+        self.last_error = None
+
+    def remember(self, data):
+        """Record ``data`` as what the file holds, after reading it."""
+        with self._condition:
+            self._latest = data
+
+    def submit(self, data):
+        """Queue ``data`` for writing. Returns False if it is already the latest."""
+        with self._condition:
+            if data == self._latest:
+                return False
+            self._latest = self._pending = data
+            self._due = time.monotonic() + self.delay
+            self.saves += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"{self.what}-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+            return True
+
+    def flush(self, timeout=None):
+        """Write any pending data now and wait for it. Returns False on timeout."""
+        with self._condition:
+            self._flushing = True
+            self._condition.notify_all()
+            done = self._condition.wait_for(lambda: self._pending is None and not self._writing, timeout)
+            self._flushing = False
+            return done
+
+    @property
+    def dirty(self):
+        with self._condition:
+            return self._pending is not None or self._writing
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None)
+                # Wait out the delay, restarting it whenever another submit comes in
+                while not self._flushing:
+                    remaining = self._due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                data, self._pending = self._pending, None
+                self._writing = True
+            try:
+                self._write(data)
+                self.writes += 1
+                failed = False
+            except OSError as e:
+                self.last_error = e
+                print(f"Warning: could not save {self.what} to {self.path}: {e}")
+                failed = True
+            with self._condition:
+                if failed and self._pending is None:
+                    self._latest = None  # So submitting the same data again retries the write
+                self._writing = False
+                self._condition.notify_all()
+
+    def _write(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        prefix = "." + os.path.splitext(os.path.basename(self.path))[0] + "."
+        fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
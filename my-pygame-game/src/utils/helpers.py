@@ -1,11 +1,12 @@
 import pygame
+from utils.assets import asset_manager
+from utils.text import text_cache
 
 def load_image(file_path):
     """Load an image from the specified file path."""
     try:
-        image = pygame.image.load(file_path)
-        return image
-    except pygame.error as e:
+        return asset_manager.load(file_path)
+    except (pygame.error, FileNotFoundError) as e:
         print(f"Unable to load image at {file_path}: {e}")
         return None
 
@@ -19,8 +20,8 @@ def load_sound(file_path):
         return None
 
 def draw_text(surface, text, font, color, position):
-    """Draw text on the given surface at the specified position."""
-    text_surface = font.render(text, True, color)
+    """Draw text on the given surface at the specified position, reusing cached renders."""
+    text_surface = text_cache.render(text, font, color)
     surface.blit(text_surface, position)
 
 def reset_game_state():
@@ -0,0 +1,210 @@
+import base64
+import json
+
+import pygame
+
+RECORDING_VERSION = 1
+# Events the screens react to; window, audio and other system events are not recorded
+INPUT_EVENT_TYPES = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN,
+                     pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL)
+LOADING_SCREEN = "LoadingScreen"  # Runs for as long as decoding takes, so replays stretch or shrink it
+
+
+def event_to_json(event):
+    """``[type, attributes]`` with only plain values kept (no window handles)."""
+    attributes = {}
+    for name, value in event.dict.items():
+        if isinstance(value, tuple):
+            value = list(value)
+        if name != "window" and (value is None or isinstance(value, (int, float, str, list))):
+            attributes[name] = value
+    return [event.type, attributes]
+
+
+def event_from_json(data):
+    event_type, attributes = data
+    return pygame.event.Event(event_type, {name: tuple(value) if isinstance(value, list) else value
+                                           for name, value in attributes.items()})
+
+
+class KeyState:
+    """Held keys, indexable like ``pygame.key.get_pressed()``."""
+
+    def __init__(self):
+        self.down = set()
+
+    def __getitem__(self, key):
+        return key in self.down
+
+
+class InputSource:
+    """Where screens get their input: events, held keys, mouse position and time.
+
+    ``Game.run`` calls ``begin_frame`` once per frame, which takes the
+    frame's events from pygame. Screens read them with ``events()`` instead
+    of ``pygame.event.get()``, held keys with ``pressed()``, the pointer
+    with ``mouse`` and the time with ``ticks()``. Held keys and the pointer
+    are worked out from the events themselves, so a replayed recording
+    reaches exactly the same state. With a recorder attached, every frame's
+    time, screen and events are written out as they happen.
+    """
+
+    def __init__(self, recorder=None):
+        self.recorder = recorder
+        self.keys = KeyState()
+        self.mouse = pygame.mouse.get_pos()
+        self.now = 0
+        self.frame = 0
+        self._pending = []
+        if recorder is not None:
+            recorder.start(self.mouse)
+
+    def begin_frame(self, screen_name):
+        """Collect this frame's input. Returns the events, for the profiler and hotkeys."""
+        events = [event for event in pygame.event.get() if event.type in INPUT_EVENT_TYPES]
+        now = pygame.time.get_ticks()
+        if self.recorder is not None:
+            self.recorder.write(now, screen_name, events)
+        return self._start_frame(now, events)
+
+    def _start_frame(self, now, events):
+        self.now = now
+        self.frame += 1
+        for event in events:
+            self._track(event)
+        self._pending = events
+        return events
+
+    def _track(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.keys.down.add(event.key)
+        elif event.type == pygame.KEYUP:
+            self.keys.down.discard(event.key)
+        elif event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            self.mouse = event.pos
+
+    def events(self):
+        """This frame's events. Like ``pygame.event.get()``, a second call returns nothing new."""
+        events, self._pending = self._pending, []
+        return events
+
+    def pressed(self):
+        return self.keys
+
+    def ticks(self):
+        """Milliseconds at the start of this frame, the same for every call within it."""
+        return self.now
+
+    @property
+    def finished(self):
+        return False
+
+    def close(self):
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+class InputRecorder:
+    """Writes a session to a JSON-lines file: a header, then one line per frame.
+
+    The header holds the RNG seed, the starting deck, the saved run (the
+    autosave file's bytes, base64) with whether the session resumed it,
+    and the pointer position. Each frame line is ``[ticks, events]``, with the screen name
+    appended whenever it changed, so a recording can be checked for desync.
+    """
+
+    def __init__(self, path, seed, deck, save=None, resume=False):
+        self.path = path
+        self.header = {"version": RECORDING_VERSION, "seed": seed, "deck": deck,
+                       "save": base64.b64encode(save).decode("ascii") if save is not None else None,
+                       "resume": resume}
+        self.file = None
+        self._screen = None
+        self.frames = 0
+
+    def start(self, mouse):
+        self.file = open(self.path, "w")
+        self.file.write(json.dumps(dict(self.header, mouse=list(mouse))) + "\n")
+
+    def write(self, now, screen_name, events):
+        frame = [now, [event_to_json(event) for event in events]]
+        if screen_name != self._screen:
+            frame.append(screen_name)
+            self._screen = screen_name
+        self.file.write(json.dumps(frame, separators=(",", ":")) + "\n")
+        self.frames += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def read_recording(path):
+    """Return (header, frames) with frames as ``(ticks, events, screen)`` tuples."""
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"{path}: unsupported recording version {header.get('version')}")
+        frames = []
+        screen = None
+        for line in f:
+            if line.strip():
+                frame = json.loads(line)
+                screen = frame[2] if len(frame) > 2 else screen
+                frames.append((frame[0], [event_from_json(event) for event in frame[1]], screen))
+    return header, frames
+
+
+class ReplaySource(InputSource):
+    """Feeds a recording back to the screens instead of live input.
+
+    Frames are replayed one per ``begin_frame``, with their recorded time,
+    so timers behave as they did. The loading screen is the exception: it
+    lasts as long as decoding takes, so recorded loading frames are skipped
+    once loading is done here, and empty frames are inserted while it is
+    still going. Any other mismatch between the recorded screen and the
+    current one is counted in ``desyncs``.
+    """
+
+    def __init__(self, path):
+        self.header, self.frames = read_recording(path)
+        super().__init__()
+        self.mouse = tuple(self.header.get("mouse", (0, 0)))
+        self.seed = self.header["seed"]
+        self.deck = self.header["deck"]
+        save = self.header.get("save")  # Recordings made before autosave have neither
+        self.save = base64.b64decode(save) if save is not None else None
+        self.resume = self.header.get("resume", False)
+        self.index = 0
+        self.desyncs = 0
+        self.first_desync = None  # (frame, recorded screen, current screen)
+
+    def begin_frame(self, screen_name):
+        pygame.event.pump()  # Keep the (headless) window responsive; live events are ignored
+        frames = self.frames
+        if screen_name == LOADING_SCREEN and self.index < len(frames) and frames[self.index][2] != LOADING_SCREEN:
+            return self._start_frame(self.now, [])  # Still loading here, wait without using up the recording
+        while self.index < len(frames) - 1 and frames[self.index][2] == LOADING_SCREEN \
+                and screen_name != LOADING_SCREEN:
+            for event in frames[self.index][1]:
+                self._track(event)  # Keys pressed while loading are still held afterwards
+            self.index += 1
+        if self.index >= len(frames):
+            return self._start_frame(self.now, [])
+        now, events, recorded_screen = frames[self.index]
+        self.index += 1
+        if recorded_screen != screen_name:
+            self.desyncs += 1
+            if self.first_desync is None:
+                self.first_desync = (self.index, recorded_screen, screen_name)
+        return self._start_frame(now, events)
+
+    @property
+    def finished(self):
+        return self.index >= len(self.frames)
+
+    @property
+    def duration(self):
+        """Seconds of play the recording covers."""
+        return (self.frames[-1][0] - self.frames[0][0]) / 1000 if self.frames else 0.0
@@ -0,0 +1,97 @@
+import time
+
+import pygame
+
+from utils.assets import asset_manager
+from utils.sprite_variants import sprite_memory_bytes
+from utils.text import get_font, text_cache
+
+
+class PerformanceOverlay:
+    """A small panel with FPS, frame time percentiles and cache hit rates.
+
+    The text is re-rendered a few times per second, not every frame. The
+    pixels under the panel are saved before it is drawn and put back by
+    ``restore`` once the frame has been presented, so screens that only
+    repaint their dirty areas never see the panel on their surface.
+    """
+
+    REFRESH_INTERVAL = 0.25  # Seconds between text updates
+    PADDING = 6
+
+    def __init__(self, profiler, position=(10, 10), visible=False):
+        self.profiler = profiler
+        self.position = position
+        self.visible = visible
+        self.font = get_font(None, 22)
+        self.panel = None
+        self.rect = None
+        self._next_refresh = 0.0
+        self._underlay = None
+        self._hidden_rect = None  # Panel area to push once more after hiding
+
+    def toggle(self):
+        self.visible = not self.visible
+        if not self.visible and self.rect is not None:
+            self._hidden_rect = self.rect
+        self._next_refresh = 0.0
+
+    def lines(self):
+        profiler = self.profiler
+        screen = profiler.screen
+        frame = profiler.frame_histogram(screen)
+        assets = asset_manager.stats()
+        text = text_cache.stats()
+        phases = "  ".join(f"{phase} {profiler.histogram(screen, phase).mean * 1000:.1f}"
+                           for phase in ("events", "update", "draw", "present"))
+        latency = profiler.input_latency
+        return [
+            f"{screen}  {profiler.fps:5.1f} FPS",
+            f"frame ms  p50 {frame.percentile(50) * 1000:.2f}  p95 {frame.percentile(95) * 1000:.2f}"
+            f"  p99 {frame.percentile(99) * 1000:.2f}",
+            f"mean ms  {phases}",
+            f"input p95 {latency.percentile(95) * 1000:.1f} ms" if len(latency) else "input  -",
+            f"assets {assets['hit_rate'] * 100:.0f}% hit  {assets['decodes']} decodes  {assets['cache_loads']} cached"
+            f"  text {text['hit_rate'] * 100:.0f}% hit  sprites {sprite_memory_bytes() / 2 ** 20:.1f} MB",
+        ]
+
+    def _render(self):
+        surfaces = [self.font.render(line, True, (255, 255, 255)) for line in self.lines()]
+        width = max(surface.get_width() for surface in surfaces) + 2 * self.PADDING
+        height = sum(surface.get_height() for surface in surfaces) + 2 * self.PADDING
+        panel = pygame.Surface((width, height))
+        panel.fill((20, 20, 20))
+        y = self.PADDING
+        for surface in surfaces:
+            panel.blit(surface, (self.PADDING, y))
+            y += surface.get_height()
+        if self.rect is not None:
+            # Keep the panel from shrinking so a shorter line does not leave stale pixels behind
+            width, height = max(width, self.rect.width), max(height, self.rect.height)
+            grown = pygame.Surface((width, height))
+            grown.fill((20, 20, 20))
+            grown.blit(panel, (0, 0))
+            panel = grown
+        self.panel = panel
+        self.rect = panel.get_rect(topleft=self.position)
+
+    def draw(self, screen):
+        """Draw the panel if visible. Returns the area to present, or None."""
+        if not self.visible:
+            rect, self._hidden_rect = self._hidden_rect, None
+            return rect
+        now = time.perf_counter()
+        if self.panel is None or now >= self._next_refresh:
+            self._render()
+            self._next_refresh = now + self.REFRESH_INTERVAL
+        area = self.rect.clip(screen.get_rect())
+        self._underlay = (area, screen.subsurface(area).copy())
+        screen.blit(self.panel, self.rect)
+        return self.rect
+
+    def restore(self, screen):
+        """Put back what was under the panel, after the frame was presented."""
+        if self._underlay is not None:
+            area, pixels = self._underlay
+            screen.blit(pixels, area)
+            self._underlay = None
@@ -0,0 +1,99 @@
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+
+class Preloader:
+    """Decodes and scales images on a worker thread ahead of time.
+
+    Screens request the assets they (or the screen they are likely to open
+    next) need as ``(path, size)`` pairs. The worker thread does the slow
+    file decode and scaling, or reads the image from the AssetManager's raw
+    cache when it has one; ``poll`` is then called once per frame on the
+    main thread to convert finished images to the display format and hand
+    them to the AssetManager, within a small time budget so it never
+    causes a frame hitch.
+
+    The worker never reads the AssetManager itself, which the main thread
+    may be changing: ``request`` looks up the atlas region and raw cache
+    for each image and queues them with it.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = set()  # (path, size) queued or being decoded
+        self._thread = None
+        self.requested = 0
+        self.completed = 0
+
+    @staticmethod
+    def _key(path, size):
+        return os.path.normpath(path), tuple(size) if size is not None else None
+
+    def request(self, assets):
+        """Queue ``(path, size)`` pairs that are not cached yet. Returns the queued keys."""
+        queued = []
+        for path, size in assets:
+            key = self._key(path, size)
+            if key in self._pending or self.manager.has(*key):
+                continue
+            self._pending.add(key)
+            decode_path, rect = self.manager.atlas_region(key[0])
+            rect = pygame.Rect(rect) if rect is not None else None  # A copy the worker owns
+            self._requests.put((key, decode_path, rect, self.manager.raw_cache))
+            queued.append(key)
+        self.requested += len(queued)
+        if queued and self._thread is None:
+            self._thread = threading.Thread(target=self._work, name="asset-preloader", daemon=True)
+            self._thread.start()
+        return queued
+
+    def is_pending(self, key):
+        return key in self._pending
+
+    def pending_count(self, keys=None):
+        """Number of requests not yet handed to the AssetManager, optionally among ``keys``."""
+        if keys is None:
+            return len(self._pending)
+        return sum(1 for key in keys if key in self._pending)
+
+    def _work(self):
+        # Requests for the same file (or atlas sheet) tend to come together, so keep the last source around
+        last_path, last_source = None, None
+        while True:
+            (path, size), decode_path, rect, raw_cache = self._requests.get()
+            cached = raw_cache.load(path, size) if raw_cache is not None else None  # RawImageCache locks itself
+            if cached is not None:
+                self._results.put((path, size, None, cached))
+                continue
+            try:
+                if decode_path != last_path:
+                    last_path, last_source = decode_path, pygame.image.load(decode_path)
+                source = last_source.subsurface(rect) if rect is not None else last_source
+                surface = pygame.transform.scale(source, size) if size is not None else None
+                self._results.put((path, size, last_source, surface))
+            except (pygame.error, FileNotFoundError):
+                last_path, last_source = None, None
+                self._results.put((path, size, None, None))
+
+    def poll(self, budget_ms=4.0):
+        """Move finished images into the AssetManager. Call once per frame on the main thread."""
+        deadline = time.perf_counter() + budget_ms / 1000
+        while True:
+            try:
+                path, size, source, surface = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if source is None and surface is None:
+                self.manager.mark_missing(path)
+            else:
+                self.manager.adopt(path, source, size, surface)
+            self._pending.discard((path, size))
+            self.completed += 1
+            if time.perf_counter() >= deadline:
+                return
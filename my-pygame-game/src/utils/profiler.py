@@ -0,0 +1,186 @@
+import json
+import time
+from collections import deque
+
+# Main loop phases, in the order they run each frame
+PHASES = ("events", "update", "preload", "draw", "overlay", "present", "idle")
+
+
+class RollingHistogram:
+    """Percentiles over the last ``window`` samples, using fixed-width buckets.
+
+    Adding a sample and dropping the oldest one are O(1); a percentile is
+    one pass over the buckets, so it is cheap enough to read every frame.
+    Samples are in seconds, bucketed by ``bucket_ms`` up to ``max_ms``.
+    """
+
+    def __init__(self, window=600, bucket_ms=0.25, max_ms=250.0):
+        self.bucket = bucket_ms / 1000
+        self.counts = [0] * (int(max_ms / bucket_ms) + 1)  # Last bucket holds everything slower
+        self.samples = deque()
+        self.window = window
+        self.total = 0.0
+
+    def _index(self, value):
+        return min(int(value / self.bucket), len(self.counts) - 1)
+
+    def add(self, value):
+        self.samples.append(value)
+        self.counts[self._index(value)] += 1
+        self.total += value
+        if len(self.samples) > self.window:
+            old = self.samples.popleft()
+            self.counts[self._index(old)] -= 1
+            self.total -= old
+
+    def __len__(self):
+        return len(self.samples)
+
+    @property
+    def mean(self):
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def percentile(self, p):
+        """Upper edge of the bucket holding the ``p``th percentile (0-100), in seconds."""
+        if not self.samples:
+            return 0.0
+        rank = p / 100 * len(self.samples)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return (index + 1) * self.bucket
+        return len(self.counts) * self.bucket
+
+    def summary(self):
+        """Mean, p50/p95/p99 and max in milliseconds."""
+        return {
+            "count": len(self.samples),
+            "mean_ms": self.mean * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": max(self.samples, default=0.0) * 1000,
+        }
+
+
+class FrameProfiler:
+    """Times each phase of the main loop, per screen.
+
+    ``Game.run`` calls ``begin_frame`` with the current screen's name, then
+    ``mark`` after each phase and ``end_frame`` once the frame is done.
+    Every (screen, phase) pair gets a RollingHistogram, as does each
+    screen's work time per frame (everything but the idle wait). Frames
+    where input was waiting also record input-to-present latency: from the
+    start of the frame that handled the input to the end of presenting it.
+    Time the input spent queued before that frame began is not visible to
+    pygame and is not included.
+
+    The last ``max_frames`` frames are kept for ``export_json`` and
+    ``export_chrome_trace`` (chrome://tracing or Perfetto).
+    """
+
+    def __init__(self, window=600, max_frames=18000):
+        self.window = window
+        self.histograms = {}  # (screen, phase) -> RollingHistogram; phase "frame" is the work time
+        self.intervals = RollingHistogram(window)  # Start-to-start time between frames
+        self.input_latency = RollingHistogram(window)
+        self.frames = deque(maxlen=max_frames)  # (start, screen, [(phase, start, duration)], input latency)
+        self.frame_count = 0
+        self._origin = time.perf_counter()
+        self._screen = None
+        self._start = None
+        self._last = None
+        self._phases = None
+        self._input_pending = False
+        self._latency = None
+
+    @property
+    def screen(self):
+        """Name of the screen the current (or last) frame belongs to."""
+        return self._screen
+
+    def histogram(self, screen, phase):
+        histogram = self.histograms.get((screen, phase))
+        if histogram is None:
+            histogram = self.histograms[(screen, phase)] = RollingHistogram(self.window)
+        return histogram
+
+    def begin_frame(self, screen):
+        now = time.perf_counter()
+        if self._start is not None:
+            self.intervals.add(now - self._start)
+        self._screen = screen
+        self._start = self._last = now
+        self._phases = []
+        self._input_pending = False
+        self._latency = None
+
+    def input_seen(self):
+        """Note that input was queued when this frame began."""
+        self._input_pending = True
+
+    def mark(self, phase):
+        """End ``phase``, which started where the previous phase ended."""
+        now = time.perf_counter()
+        duration = now - self._last
+        self._phases.append((phase, self._last, duration))
+        self.histogram(self._screen, phase).add(duration)
+        if phase == "present" and self._input_pending:
+            self._latency = now - self._start
+            self.input_latency.add(self._latency)
+        self._last = now
+
+    def end_frame(self):
+        work = sum(duration for phase, _, duration in self._phases if phase != "idle")
+        self.histogram(self._screen, "frame").add(work)
+        self.frames.append((self._start, self._screen, self._phases, self._latency))
+        self.frame_count += 1
+
+    @property
+    def fps(self):
+        mean = self.intervals.mean
+        return 1 / mean if mean else 0.0
+
+    def frame_histogram(self, screen=None):
+        return self.histogram(screen or self._screen, "frame")
+
+    def summary(self):
+        """Percentiles for every (screen, phase), plus FPS and input latency."""
+        screens = {}
+        for (screen, phase), histogram in self.histograms.items():
+            screens.setdefault(screen, {})[phase] = histogram.summary()
+        return {
+            "frames": self.frame_count,
+            "fps": self.fps,
+            "frame_interval": self.intervals.summary(),
+            "input_latency": self.input_latency.summary(),
+            "screens": screens,
+        }
+
+    def export_json(self, path):
+        """Write the summary and every kept frame's phase timings, in milliseconds."""
+        frames = [{
+            "start_ms": (start - self._origin) * 1000,
+            "screen": screen,
+            "phases": {phase: duration * 1000 for phase, _, duration in phases},
+            "input_latency_ms": latency * 1000 if latency is not None else None,
+        } for start, screen, phases, latency in self.frames]
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), "frames": frames}, f, indent=1)
+
+    def export_chrome_trace(self, path):
+        """Write the kept frames in Chrome trace event format."""
+        events = []
+        for start, screen, phases, latency in self.frames:
+            frame_end = phases[-1][1] + phases[-1][2] if phases else start
+            events.append({"name": screen, "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": (start - self._origin) * 1e6, "dur": (frame_end - start) * 1e6})
+            for phase, phase_start, duration in phases:
+                events.append({"name": phase, "cat": screen, "ph": "X", "pid": 1, "tid": 1,
+                               "ts": (phase_start - self._origin) * 1e6, "dur": duration * 1e6})
+            if latency is not None:
+                events.append({"name": "input latency", "cat": "input", "ph": "X", "pid": 1, "tid": 2,
+                               "ts": (start - self._origin) * 1e6, "dur": latency * 1e6})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+
+import pygame
+
+DEFAULT_CACHE_DIR = 'my-pygame-game/.asset_cache'  # Built by tools/build_asset_cache.py, not committed
+INDEX_FILE = "index.json"
+
+
+def file_hash(path):
+    """SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def size_key(size):
+    return "full" if size is None else f"{size[0]}x{size[1]}"
+
+
+class RawImageCache:
+    """Pre-scaled images stored as uncompressed pixel buffers.
+
+    Every entry is one raw RGB or RGBA file, named after the SHA-1 of the
+    files it was made from, the image path (atlas images share one source
+    file) and its size, and loaded with a memory map and
+    ``pygame.image.frombuffer``. That skips both the PNG/JPG decode and
+    the rescale. The index remembers the size and mtime of every file an
+    entry depends on: the image's own file and, for atlas images, the
+    atlas sheet too. An unchanged file is trusted without re-hashing;
+    otherwise it is hashed once, and a mismatch in any of them means the
+    entry is stale and ``load`` returns None, leaving the caller to load
+    the original file.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()  # The Preloader reads from its worker thread
+        self._index = None
+        self._valid = {}  # (file, sha1) -> whether the file still matches that hash
+        self.hits = 0
+        self.stale = 0
+
+    @property
+    def index(self):
+        if self._index is None:
+            try:
+                with open(os.path.join(self.directory, INDEX_FILE)) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _file_is_valid(self, path, recorded):
+        key = (path, recorded["sha1"])
+        valid = self._valid.get(key)
+        if valid is None:
+            try:
+                stat = os.stat(path)
+                valid = (stat.st_size == recorded["bytes"] and stat.st_mtime_ns == recorded["mtime_ns"]) \
+                    or file_hash(path) == recorded["sha1"]
+            except OSError:
+                valid = False
+            self._valid[key] = valid
+        return valid
+
+    def _is_valid(self, entry):
+        files = entry.get("files")
+        if not files:
+            return False  # An index from before entries recorded every file they depend on
+        with self._lock:
+            return all(self._file_is_valid(path, recorded) for path, recorded in files.items())
+
+    def load(self, path, size=None):
+        """Return the cached surface for ``path`` at ``size``, or None if missing or stale."""
+        entry = self.index.get(os.path.normpath(path))
+        if entry is None:
+            return None
+        variant = entry["sizes"].get(size_key(size))
+        if variant is None:
+            return None
+        if not self._is_valid(entry):
+            self.stale += 1
+            return None
+        try:
+            with open(os.path.join(self.directory, variant["file"]), "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            surface = pygame.image.frombuffer(buffer, tuple(variant["size"]), variant["format"])
+        except (OSError, ValueError, pygame.error):
+            return None
+        self.hits += 1
+        return surface
+
+    def store(self, path, size, surface, source=None):
+        """Write one entry. ``source`` is the file the pixels came from, if not ``path`` itself.
+
+        Both ``path`` and ``source`` are recorded, so an atlas image goes
+        stale when either its own file or the atlas sheet changes.
+        """
+        path = os.path.normpath(path)
+        files = {}
+        for dependency in dict.fromkeys((os.path.normpath(source or path), path)):
+            stat = os.stat(dependency)
+            files[dependency] = {"sha1": file_hash(dependency), "bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        digest = hashlib.sha1("".join(recorded["sha1"] for recorded in files.values()).encode()).hexdigest()
+        pixel_format = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+        path_digest = hashlib.sha1(path.encode()).hexdigest()
+        filename = f"{digest[:16]}_{path_digest[:8]}_{size_key(size)}.raw"
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, filename), "wb") as f:
+            f.write(pygame.image.tobytes(surface, pixel_format))
+        entry = self.index.get(path)
+        if entry is None or entry.get("sha1") != digest:
+            # New, or made from an older version of the files: drop the old sizes
+            entry = self.index[path] = {"sha1": digest, "files": files, "sizes": {}}
+        entry["files"] = files  # Same contents, but the mtimes may have changed
+        entry["sizes"][size_key(size)] = {"file": filename, "size": list(surface.get_size()), "format": pixel_format}
+
+    def save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, INDEX_FILE), "w") as f:
+            json.dump(self.index, f, indent=4)
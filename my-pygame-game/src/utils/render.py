@@ -0,0 +1,94 @@
+import pygame
+
+
+def merge_rects(rects):
+    """Merge overlapping rectangles so each screen area is redrawn only once."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        # Keep absorbing overlapping rects until this one stops growing
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyLayer:
+    """Redraws only the parts of the screen that changed since the last frame.
+
+    A screen hands over a cached static layer (background plus anything that
+    never moves) once, then calls ``render`` each frame with the dynamic items
+    in back-to-front order as ``(key, image, rect)`` tuples. An item counts as
+    changed when its image object or rect differs from the previous frame.
+    ``render`` returns the rectangles that were repainted, ready to be passed
+    to ``pygame.display.update``.
+    """
+
+    def __init__(self, static_layer=None):
+        self.static_layer = static_layer
+        self._previous = {}  # key -> (image, rect) drawn last frame
+        self.needs_full_redraw = True
+
+    def set_static_layer(self, surface):
+        self.static_layer = surface
+        self.needs_full_redraw = True
+
+    def invalidate(self):
+        """Force the next frame to repaint the whole screen."""
+        self.needs_full_redraw = True
+
+    def render(self, screen, items):
+        render_layer = getattr(screen, "render_layer", None)
+        if render_layer is not None:
+            return render_layer(self, items)  # Drawn as textures, see utils.texture_renderer
+        current = {}
+        for key, image, rect in items:
+            current[key] = (image, tuple(rect))
+
+        if self.needs_full_redraw:
+            screen.blit(self.static_layer, (0, 0))
+            for _, image, rect in items:
+                screen.blit(image, rect)
+            self._previous = current
+            self.needs_full_redraw = False
+            return [screen.get_rect()]
+
+        changed = []
+        for key, (image, rect) in current.items():
+            previous = self._previous.get(key)
+            if previous is None:
+                changed.append(rect)
+            elif previous[0] is not image or previous[1] != rect:
+                changed.append(rect)
+                changed.append(previous[1])
+        for key, (_, rect) in self._previous.items():
+            if key not in current:
+                changed.append(rect)  # Item disappeared, uncover what was beneath it
+        self._previous = current
+        if not changed:
+            return []
+
+        dirty = merge_rects(changed)
+        clip = screen.get_clip()
+        for area in dirty:
+            screen.set_clip(area)
+            screen.blit(self.static_layer, area, area)
+            for _, image, rect in items:
+                if area.colliderect(rect):
+                    screen.blit(image, rect)
+        screen.set_clip(clip)
+        return dirty
+
+
+def compose_layer(size, *layers):
+    """Flatten ``(image, position)`` pairs into one display-format surface."""
+    surface = pygame.Surface(size)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    for image, position in layers:
+        surface.blit(image, position)
+    return surface
@@ -0,0 +1,87 @@
+import os
+
+import pygame
+
+from utils.assets import asset_manager
+
+
+def smoothscale(surface, size):
+    """Filtered scaling where the pixel format allows it, plain scaling otherwise."""
+    if surface.get_bitsize() in (24, 32):
+        return pygame.transform.smoothscale(surface, size)
+    return pygame.transform.scale(surface, size)
+
+
+class SpriteVariants:
+    """One piece of character art at every size it is drawn at.
+
+    The full-size source is decoded once by the AssetManager. Each
+    ``(size, flip)`` asked for is smooth-scaled from that source the first
+    time and kept, so art is never scaled again from an already scaled
+    copy. Characters are only drawn at a handful of sizes, so variants are
+    kept for as long as the art is in use rather than going through the
+    AssetManager's LRU.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._variants = {}  # (size, flip) -> surface
+        self.builds = 0  # Variants scaled or flipped so far
+
+    @property
+    def source(self):
+        return asset_manager.load(self.path)
+
+    def get(self, size=None, flip=False):
+        """The art at ``size`` (full size for None), mirrored horizontally if ``flip``."""
+        key = (tuple(size) if size is not None else None, flip)
+        surface = self._variants.get(key)
+        if surface is None:
+            if flip:
+                surface = pygame.transform.flip(self.get(size), True, False)
+            elif key[0] is None or key[0] == self.source.get_size():
+                return self.source  # Owned by the AssetManager, nothing to build
+            else:
+                surface = smoothscale(self.source, key[0])
+            self._variants[key] = surface
+            self.builds += 1
+        return surface
+
+    def memory_bytes(self):
+        """Bytes held by the variants built so far (the source is counted by the AssetManager)."""
+        return sum(surface.get_width() * surface.get_height() * surface.get_bytesize()
+                   for surface in self._variants.values())
+
+    def stats(self):
+        source_bytes = 0
+        if asset_manager.has(self.path):
+            source = self.source
+            source_bytes = source.get_width() * source.get_height() * source.get_bytesize()
+        return {
+            "sizes": sorted(self._variants, key=repr),
+            "variant_bytes": self.memory_bytes(),
+            "source_bytes": source_bytes,
+            "builds": self.builds,
+        }
+
+
+_shared = {}  # Normalised path -> SpriteVariants
+
+
+def sprite_variants(path):
+    """The SpriteVariants for an image, shared by every sprite that uses the same art."""
+    key = os.path.normpath(path)
+    variants = _shared.get(key)
+    if variants is None:
+        variants = SpriteVariants(key)
+        _shared[key] = variants
+    return variants
+
+
+def sprite_memory_bytes():
+    """Bytes held by the scaled variants of every sprite image."""
+    return sum(variants.memory_bytes() for variants in _shared.values())
+
+
+def clear_sprite_variants():
+    _shared.clear()
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+
+import pygame
+
+_fonts = {}  # (face, size) -> pygame.font.Font
+
+
+def get_font(face=None, size=36):
+    """Return a shared Font for (face, size), creating it the first time."""
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(face, size)
+        _fonts[key] = font
+    return font
+
+
+def clear_fonts():
+    """Forget every shared font and rendered text. Fonts don't survive ``pygame.quit()``."""
+    _fonts.clear()
+    text_cache.clear()
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (text, font, color, antialias)."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, color, antialias=True):
+        key = (text, font, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+# Shared cache used by screens and helpers.draw_text
+text_cache = TextCache()
+
+
+def render_text(text, size=36, color=(255, 255, 255), face=None, antialias=True):
+    """Render text with a shared font, reusing the surface if it was drawn before."""
+    return text_cache.render(text, get_font(face, size), color, antialias)
+
+
+class TextLabel:
+    """A piece of HUD text that is only re-rendered when its value changes.
+
+    ``template`` is a format string such as "HP: {}".
+    """
+
+    def __init__(self, template, font, color=(255, 255, 255)):
+        self.template = template
+        self.font = font
+        self.color = color
+        self._value = object()  # Sentinel so the first set() always renders
+        self.surface = None
+
+    def set(self, value, color=None):
+        """Update the label value. Returns True if the surface was re-rendered."""
+        color = color or self.color
+        if value == self._value and color == self.color and self.surface is not None:
+            return False
+        self._value = value
+        self.color = color
+        self.surface = self.font.render(self.template.format(value), True, color)
+        return True
+
+    def get_width(self):
+        return self.surface.get_width() if self.surface else 0
+
+    def draw(self, screen, position):
+        if self.surface is not None:
+            screen.blit(self.surface, position)
@@ -0,0 +1,127 @@
+import weakref
+
+import pygame
+
+try:
+    from pygame._sdl2 import video
+except ImportError:  # pygame built without the SDL2 render API
+    video = None
+
+
+class TextureCanvas(pygame.Surface):
+    """The screen surface handed to screens when drawing through textures.
+
+    It has the logical size, so every hardcoded coordinate in the screens
+    still holds. A DirtyLayer rendered onto it queues its static layer and
+    items to be drawn as textures instead of blitting them (see
+    ``DirtyLayer.render``). Anything drawn straight onto it, like the
+    loading screen's progress bar, is uploaded as one frame texture.
+    """
+
+    def __init__(self, size, renderer):
+        super().__init__(size)
+        self.renderer = renderer
+
+    def render_layer(self, layer, items):
+        self.renderer.queue(layer.static_layer, [(image, rect) for _, image, rect in items])
+        layer.needs_full_redraw = False
+        return [self.get_rect()]
+
+
+class TextureRenderer:
+    """Draws frames with SDL's 2D renderer instead of blitting to the window surface.
+
+    Each surface is uploaded to a texture the first time it is drawn and
+    the texture is kept for as long as the surface lives, so static art
+    (backgrounds, cards, characters, buildings) costs one upload. Images
+    are stretched to their rect and optionally mirrored when drawn, which
+    the renderer does for free. Frames are laid out at the fixed logical
+    ``size`` and SDL scales them to whatever size the window is, keeping
+    the aspect ratio.
+
+    Tries a hardware-accelerated renderer first and falls back to SDL's
+    software renderer, which also works with the dummy video driver on
+    headless machines. Raises pygame.error if neither can be created.
+    """
+
+    def __init__(self, size, title, window_size=None, vsync=False):
+        if video is None:
+            raise pygame.error("pygame._sdl2 is not available")
+        self.size = tuple(size)
+        try:  # pygame._sdl2 raises its own error type, not pygame.error
+            self.window = video.Window(title, size=window_size or self.size, resizable=True)
+            try:
+                self.renderer = video.Renderer(self.window, accelerated=1, vsync=vsync)
+                self.accelerated = True
+            except video.error:
+                self.renderer = video.Renderer(self.window, accelerated=0, vsync=vsync)
+                self.accelerated = False
+        except video.error as e:
+            raise pygame.error(str(e)) from e
+        self.renderer.logical_size = self.size
+        self.canvas = TextureCanvas(self.size, self)
+        self._textures = weakref.WeakKeyDictionary()  # surface -> Texture, dropped with the surface
+        self._frame_texture = None  # Streaming texture for frames drawn straight onto the canvas
+        self._queued = None  # (static layer, [(image, rect)]) for this frame
+        self._shown = None  # What the window shows, to skip presenting the same frame again
+        self.uploads = 0
+        self.presents = 0
+
+    def texture(self, surface):
+        """The texture for ``surface``, uploading it the first time."""
+        texture = self._textures.get(surface)
+        if texture is None:
+            texture = video.Texture.from_surface(self.renderer, surface)
+            self._textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def draw(self, surface, rect, flip_x=False):
+        """Draw ``surface`` stretched to ``rect``, mirrored horizontally if ``flip_x``."""
+        if surface.get_width() and surface.get_height():  # e.g. an empty text label, which SDL can't upload
+            self.texture(surface).draw(dstrect=pygame.Rect(rect), flip_x=flip_x)
+
+    def invalidate(self):
+        """Draw the next frame even if it looks the same as the one on screen."""
+        self._shown = None
+
+    def queue(self, static_layer, items):
+        self._queued = (static_layer, items)
+
+    def present(self, extra=()):
+        """Draw this frame, plus ``extra`` (image, rect) pairs on top, and show it.
+
+        A frame made of the same images at the same places as the one on
+        screen, in a window of the same size, is not drawn again.
+        """
+        shown = None
+        if self._queued is not None:
+            static_layer, items = self._queued
+            shown = (self.window.size, static_layer,
+                     tuple((image, tuple(rect)) for image, rect in list(items) + list(extra)))
+            if shown == self._shown:
+                self._queued = None
+                return
+        self._shown = shown  # Frames drawn straight onto the canvas can't be compared
+        self.presents += 1
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+        if self._queued is not None:
+            static_layer, items = self._queued
+            if static_layer is not None:
+                self.draw(static_layer, static_layer.get_rect())
+            for image, rect in items:
+                self.draw(image, rect)
+            self._queued = None
+        else:
+            if self._frame_texture is None:
+                self._frame_texture = video.Texture(self.renderer, self.size, streaming=True)
+            self._frame_texture.update(self.canvas)
+            self._frame_texture.draw()
+        for image, rect in extra:
+            self.draw(image, rect)
+        self.renderer.present()
+
+    def stats(self):
+        return {"textures": len(self._textures), "uploads": self.uploads, "presents": self.presents,
+                "window": self.window.size, "accelerated": self.accelerated}
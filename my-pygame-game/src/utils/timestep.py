@@ -0,0 +1,39 @@
+class FixedTimestep:
+    """Turns frame times into a whole number of fixed-length updates.
+
+    The game simulates at ``rate`` updates per second however fast frames
+    are drawn. ``advance`` takes the frame's time in integer milliseconds
+    and returns how many updates to run; what is left over is ``alpha``,
+    how far (0 to 1) the frame is into the next update, for interpolating
+    positions when drawing. Time is kept in whole milliseconds times
+    ``rate``, so the same frame times always give the same updates, which
+    keeps replays exact. After a long stall at most ``max_steps`` updates
+    run and the rest of the backlog is dropped, rather than trying to
+    catch up for several frames.
+    """
+
+    def __init__(self, rate=60, max_steps=8):
+        self.rate = rate
+        self.step = 1 / rate  # Seconds of game time per update
+        self.max_steps = max_steps
+        self._last = None
+        self._accumulated = 0  # Milliseconds * rate not yet simulated
+        self.updates = 0
+
+    def advance(self, now):
+        """Add the time since the previous frame. Returns the number of updates to run."""
+        if self._last is not None:
+            self._accumulated += (now - self._last) * self.rate
+        self._last = now
+        steps = min(self._accumulated // 1000, self.max_steps)
+        self._accumulated = min(self._accumulated - steps * 1000, 999)  # Drop what could not be caught up
+        self.updates += steps
+        return steps
+
+    def pause(self):
+        """Don't count the time until the next ``advance``, e.g. while the game sat idle."""
+        self._last = None
+
+    @property
+    def alpha(self):
+        return self._accumulated / 1000
@@ -0,0 +1,83 @@
+"""Pre-render every image at every size the screens use into the raw cache.
+
+Collects the ``(path, size)`` pairs from each screen's ``required_assets``,
+produces each one exactly as the AssetManager would (same atlas, same
+scaling) and stores it as an uncompressed pixel buffer in
+``my-pygame-game/.asset_cache``. At runtime those images are memory mapped
+instead of decoded and rescaled; anything missing or stale in the cache is
+loaded from the original files as before.
+
+Run from the repository root after changing art or image sizes:
+
+    python my-pygame-game/tools/build_asset_cache.py
+"""
+import argparse
+import os
+import shutil
+import sys
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pygame
+from card_sprite import CARD_ATLAS
+from deck_store import DeckStore
+from screens.registry import SCREENS, ScreenRegistry
+from utils.assets import AssetManager
+from utils.raw_cache import DEFAULT_CACHE_DIR, RawImageCache
+
+SCREEN_SIZE = (1200, 800)
+
+
+def collect_assets(screen):
+    """Every (path, size) pair any screen asks for, without duplicates."""
+    game = SimpleNamespace(screen=screen, selected_player=None, deck_store=DeckStore())
+    registry = ScreenRegistry()
+    assets = {}
+    for name in SCREENS:
+        if hasattr(registry.get(name), "required_assets"):
+            for path, size in registry.required_assets(name, game):
+                assets[(os.path.normpath(path), tuple(size) if size is not None else None)] = None
+    return list(assets)
+
+
+def build_cache(directory, screen):
+    """Write the cache and its index. Returns (entries written, bytes written)."""
+    manager = AssetManager(budget_bytes=0)  # Nothing needs to stay cached here
+    manager.register_atlas(CARD_ATLAS)
+    cache = RawImageCache(directory)
+    written = total_bytes = 0
+    for path, size in collect_assets(screen):
+        try:
+            surface = manager.get(path, size)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        cache.store(path, size, surface, source=manager.atlas_region(path)[0])
+        written += 1
+        total_bytes += surface.get_width() * surface.get_height() * (4 if surface.get_flags() & pygame.SRCALPHA else 3)
+    cache.save_index()
+    return written, total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="where to write the cache")
+    parser.add_argument("--clean", action="store_true", help="delete the existing cache first")
+    args = parser.parse_args()
+
+    if args.clean and os.path.isdir(args.cache_dir):
+        shutil.rmtree(args.cache_dir)
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    start = time.perf_counter()
+    written, total_bytes = build_cache(args.cache_dir, screen)
+    print(f"Cached {written} images ({total_bytes / 1024 / 1024:.1f} MB) in {args.cache_dir} "
+          f"in {time.perf_counter() - start:.2f}s")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
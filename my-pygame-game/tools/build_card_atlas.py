@@ -0,0 +1,121 @@
+"""Pack every card image into one texture atlas.
+
+Reads each image in ``--source`` (assets/Kartice by default), scales it
+down to fit ``--max-size`` if needed, packs the cells into rows on a
+single sheet and writes the sheet as PNG next to a JSON manifest giving
+each source file's rect. The AssetManager then serves card images as
+subsurfaces of that sheet, so all card art costs one decode.
+
+Re-run it whenever card art is added or changed; entries whose source
+file no longer matches the manifest are ignored at runtime and loaded
+from the original file instead.
+
+Run from the repository root:
+
+    python my-pygame-game/tools/build_card_atlas.py
+"""
+import argparse
+import json
+import math
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pygame
+from card_sprite import CARD_ATLAS
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def fit_size(size, max_size):
+    """Scale ``size`` down (never up) so it fits in a ``max_size`` square."""
+    width, height = size
+    scale = min(1.0, max_size / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def pack(sizes, sheet_width, padding):
+    """Shelf-pack ``{name: (w, h)}``; returns ``{name: (x, y, w, h)}`` and the sheet height.
+
+    Cells are placed tallest first, left to right, starting a new row when
+    the current one is full.
+    """
+    rects = {}
+    x = y = row_height = 0
+    for name, (width, height) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if width > sheet_width:
+            raise ValueError(f"{name} is wider than the sheet ({width} > {sheet_width})")
+        if x and x + width > sheet_width:
+            x, y, row_height = 0, y + row_height + padding, 0
+        rects[name] = (x, y, width, height)
+        x += width + padding
+        row_height = max(row_height, height)
+    return rects, y + row_height
+
+
+def build_atlas(source_dir, manifest_path, max_size=256, sheet_width=None, padding=2):
+    """Write the atlas sheet and manifest. Returns the manifest dict.
+
+    Without a ``sheet_width`` the sheet is made roughly square.
+    """
+    images, entries = {}, {}
+    for filename in sorted(os.listdir(source_dir)):
+        if not filename.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        path = os.path.join(source_dir, filename)
+        try:
+            image = pygame.image.load(path)
+        except pygame.error as e:
+            print(f"Skipping {filename}: {e}")
+            continue
+        size = fit_size(image.get_size(), max_size)
+        images[filename] = pygame.transform.smoothscale(image.convert_alpha(), size) \
+            if size != image.get_size() else image.convert_alpha()
+        entries[filename] = {"source_size": list(image.get_size()), "bytes": os.path.getsize(path)}
+
+    if sheet_width is None:
+        columns = math.ceil(math.sqrt(len(images))) or 1
+        sheet_width = columns * (max(image.get_width() for image in images.values()) + padding) - padding
+    rects, height = pack({name: image.get_size() for name, image in images.items()}, sheet_width, padding)
+    sheet = pygame.Surface((sheet_width, height), pygame.SRCALPHA)
+    for name, rect in rects.items():
+        sheet.blit(images[name], rect[:2])
+        entries[name]["rect"] = list(rect)
+
+    manifest_dir = os.path.dirname(manifest_path)
+    sheet_path = os.path.splitext(manifest_path)[0] + ".png"
+    os.makedirs(manifest_dir or ".", exist_ok=True)
+    pygame.image.save(sheet, sheet_path)
+    manifest = {
+        "image": os.path.basename(sheet_path),
+        "size": [sheet_width, height],
+        "source_dir": os.path.relpath(source_dir, manifest_dir or ".").replace(os.sep, "/"),
+        "entries": entries,
+    }
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--source", default="my-pygame-game/src/assets/Kartice", help="directory of card images")
+    parser.add_argument("--manifest", default=CARD_ATLAS, help="manifest to write; the sheet goes next to it")
+    # Cards are never drawn larger than 170x255, so 256 keeps the sheet small and quick to decode
+    parser.add_argument("--max-size", type=int, default=256, help="largest side of a packed image")
+    parser.add_argument("--width", type=int, default=None, help="sheet width in pixels (default: about square)")
+    parser.add_argument("--padding", type=int, default=2, help="gap between packed images")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # convert_alpha needs a display
+    manifest = build_atlas(args.source, args.manifest, args.max_size, args.width, args.padding)
+    width, height = manifest["size"]
+    print(f"Packed {len(manifest['entries'])} images into a {width}x{height} sheet next to {args.manifest}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Rank every possible deck by simulated win rate.
+
+Enumerates each combination of ``--deck-size`` cards from the catalog,
+simulates ``--runs`` full fights (four roster enemies, then the boss) per
+deck with the headless combat rules, and writes every deck to a ranked
+CSV file plus a JSON summary of the best and worst.
+
+By default every enemy, the boss included, flips a coin as before the
+boss AI, which keeps the tool fast enough for large catalogs but makes
+the boss much easier than in the game. ``--enemy-ai game`` gives the
+boss the game's AI (enemy_ai.ENEMY_AIS), memoized per boss position;
+each new position costs a search, so this runs at hundreds of fights per
+second per core rather than tens of thousands.
+
+Decks are handed to a process pool in chunks, and every deck gets a seed
+derived from ``--seed`` and its position in the enumeration, so results
+are identical whatever the number of workers. The boss AI's search is
+budgeted in nodes, not time, so that holds with ``--enemy-ai game`` too.
+
+Run from the repository root:
+
+    python my-pygame-game/tools/deck_balance.py --runs 2000 --workers 8
+"""
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from card import get_predefined_cards
+from card_database import CardDatabase
+from combat_engine import deck_from_cards, simulate
+from enemy_ai import enemy_ai_for
+
+ENEMY_AI_OPTIONS = {
+    "random": None,  # Every enemy flips a coin, as before the boss AI
+    "game": enemy_ai_for,  # The boss searches ahead, as in the game
+}
+
+# Set in each worker by _init_worker so chunks only carry deck indices
+_catalog = None
+_options = None
+
+
+def _init_worker(catalog, options):
+    global _catalog, _options
+    _catalog = catalog
+    _options = options
+
+
+def deck_seed(base_seed, rank):
+    """Seed for the deck at position ``rank``; independent of chunking and worker count."""
+    return base_seed * 1_000_003 + rank
+
+
+def simulate_chunk(chunk):
+    """Simulate every deck in a chunk of (rank, card indices) pairs."""
+    results = []
+    for rank, indices in chunk:
+        deck = tuple(_catalog[i] for i in indices)
+        stats = simulate(deck, _options["health"], _options["runs"],
+                         seed=deck_seed(_options["seed"], rank), policy=_options["policy"],
+                         enemy_ai=ENEMY_AI_OPTIONS[_options["enemy_ai"]])
+        results.append((stats["win_rate"], stats["avg_turns"], stats["avg_round"], rank, indices))
+    return results
+
+
+def enumerate_decks(catalog_size, deck_size, sample=None, seed=0):
+    """Yield (rank, card indices) for every deck, or for ``sample`` random distinct decks."""
+    if sample is None:
+        yield from enumerate(itertools.combinations(range(catalog_size), deck_size))
+        return
+    rng = random.Random(seed)
+    seen = set()
+    while len(seen) < sample:
+        indices = tuple(sorted(rng.sample(range(catalog_size), deck_size)))
+        if indices not in seen:
+            seen.add(indices)
+            yield len(seen) - 1, indices
+
+
+def chunked(iterable, size):
+    """Lazily split an iterable into lists, so huge catalogs are never materialized."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class RankingWriter:
+    """Every deck's result, ranked into a CSV file without holding them all in memory.
+
+    Rows are buffered and spilled to temporary files in sorted runs of
+    ``run_rows``; ``write`` merges the runs into ``path``, best deck first.
+    """
+
+    def __init__(self, path, run_rows=100_000):
+        self.path = path
+        self.run_rows = run_rows
+        self._rows = []
+        self._runs = []
+        self._directory = tempfile.TemporaryDirectory(prefix="deck_balance.")
+
+    def add(self, win_rate, avg_turns, avg_round, rank, indices):
+        # Higher win rate is better; ties go to the deck that wins in fewer turns
+        self._rows.append((-win_rate, avg_turns, rank, avg_round, indices))
+        if len(self._rows) >= self.run_rows:
+            self._spill()
+
+    def _spill(self):
+        self._rows.sort()
+        path = os.path.join(self._directory.name, f"run{len(self._runs)}.csv")
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            for negative_win_rate, avg_turns, rank, avg_round, indices in self._rows:
+                # repr keeps the floats exact, so the merge orders rows as the sort did
+                writer.writerow((repr(negative_win_rate), repr(avg_turns), rank, repr(avg_round),
+                                 " ".join(map(str, indices))))
+        self._runs.append(path)
+        self._rows = []
+
+    @staticmethod
+    def _read_run(path):
+        with open(path, newline="") as file:
+            for negative_win_rate, avg_turns, rank, avg_round, indices in csv.reader(file):
+                yield (float(negative_win_rate), float(avg_turns), int(rank), float(avg_round),
+                       tuple(map(int, indices.split())))
+
+    def write(self, names):
+        """Merge everything added into ``path``, with card ``names`` for the indices. Returns the row count."""
+        self._rows.sort()
+        runs = [self._read_run(path) for path in self._runs] + [iter(self._rows)]
+        position = 0
+        with open(self.path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("position", "win_rate", "avg_turns", "avg_round", "rank", "cards"))
+            for position, (negative_win_rate, avg_turns, rank, avg_round, indices) in enumerate(heapq.merge(*runs), 1):
+                writer.writerow((position, round(-negative_win_rate, 4), round(avg_turns, 2), round(avg_round, 2),
+                                 rank, ", ".join(names[i] for i in indices)))
+        self._rows = []
+        self._runs = []
+        self._directory.cleanup()
+        return position
+
+
+def analyze(cards, deck_size=4, runs=1000, health=100, policy="greedy", seed=0, workers=None,
+            chunk_size=64, sample=None, top=20, ranking_path=None, enemy_ai="random"):
+    """Simulate all decks and return a report dict with the best and worst ``top`` decks.
+
+    ``enemy_ai`` is a key of ENEMY_AI_OPTIONS: "random" for the coin-flip
+    boss, "game" for the boss AI the game uses (much slower).
+
+    With ``ranking_path``, every simulated deck is also written there as a
+    ranked CSV (see RankingWriter).
+    """
+    catalog = deck_from_cards(cards)
+    total = math.comb(len(catalog), deck_size)
+    if sample is not None and sample >= total:
+        sample = None  # Sampling more than exist is just full enumeration
+    deck_count = total if sample is None else sample
+    if enemy_ai not in ENEMY_AI_OPTIONS:
+        raise ValueError(f"Unknown enemy AI: {enemy_ai}")
+    options = {"runs": runs, "health": health, "policy": policy, "seed": seed, "enemy_ai": enemy_ai}
+
+    # Keep only the best and worst decks in memory, whatever the catalog size; the rest go to disk
+    best, worst = [], []
+    ranking = RankingWriter(ranking_path) if ranking_path else None
+    simulated = 0
+    start = time.perf_counter()
+    chunks = chunked(enumerate_decks(len(catalog), deck_size, sample, seed), chunk_size)
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(catalog, options)) as pool:
+        for results in pool.imap_unordered(simulate_chunk, chunks):
+            for win_rate, avg_turns, avg_round, rank, indices in results:
+                # Higher win rate is better; ties go to the deck that wins in fewer turns
+                entry = (win_rate, -avg_turns, rank, indices, avg_round)
+                if len(best) < top:
+                    heapq.heappush(best, entry)
+                else:
+                    heapq.heappushpop(best, entry)
+                inverse = (-win_rate, avg_turns, -rank, indices, avg_round)
+                if len(worst) < top:
+                    heapq.heappush(worst, inverse)
+                else:
+                    heapq.heappushpop(worst, inverse)
+                if ranking is not None:
+                    ranking.add(win_rate, avg_turns, avg_round, rank, indices)
+            simulated += len(results)
+    elapsed = time.perf_counter() - start
+    if ranking is not None:
+        ranking.write([card.name for card in cards])
+
+    def describe(win_rate, avg_turns, rank, indices, avg_round):
+        return {
+            "cards": [cards[i].name for i in indices],
+            "win_rate": round(win_rate, 4),
+            "avg_turns": round(avg_turns, 2),
+            "avg_round": round(avg_round, 2),
+            "rank": rank,
+        }
+
+    return {
+        "catalog_size": len(catalog),
+        "deck_size": deck_size,
+        "decks_total": total,
+        "decks_simulated": simulated,
+        "runs_per_deck": runs,
+        "player_health": health,
+        "policy": policy,
+        "enemy_ai": enemy_ai,
+        "seed": seed,
+        "workers": workers or os.cpu_count(),
+        "seconds": round(elapsed, 3),
+        "fights_per_second": round(simulated * runs / elapsed) if elapsed else None,
+        "ranking": ranking_path,
+        "best": [describe(w, -t, r, i, a) for w, t, r, i, a in sorted(best, reverse=True)],
+        "worst": [describe(-w, t, -r, i, a) for w, t, r, i, a in sorted(worst, reverse=True)],
+    }
+
+
+def print_table(title, decks):
+    print(title)
+    for position, deck in enumerate(decks, 1):
+        print(f"{position:>3}. {deck['win_rate']:>6.1%}  {deck['avg_turns']:>6.1f} turns  {', '.join(deck['cards'])}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalog", help="card JSON file (default: the predefined tavern cards)")
+    parser.add_argument("--deck-size", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=1000, help="simulated fights per deck")
+    parser.add_argument("--health", type=int, default=100, help="player starting health")
+    parser.add_argument("--policy", choices=("attack", "random", "greedy"), default="greedy")
+    parser.add_argument("--enemy-ai", choices=tuple(ENEMY_AI_OPTIONS), default="random",
+                        help="random: the coin-flip boss (default, fast); game: the boss plays as in the game")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="decks per work item")
+    parser.add_argument("--sample", type=int, default=None, help="simulate this many random decks instead of all")
+    parser.add_argument("--top", type=int, default=20, help="decks to list at each end of the ranking")
+    parser.add_argument("--output", default="deck_balance_report.json", help="JSON summary")
+    parser.add_argument("--ranking", default="deck_balance_ranking.csv", help="every deck, ranked")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.catalog:
+        database = CardDatabase(args.catalog)
+        cards = database.cards()
+        if database.last_error is not None:  # The database keeps going without it; a report can't
+            sys.exit(f"Could not load the card catalog {args.catalog}: {database.last_error}")
+    else:
+        cards = get_predefined_cards()
+    report = analyze(cards, args.deck_size, args.runs, args.health, args.policy, args.seed,
+                     args.workers, args.chunk_size, args.sample, args.top, args.ranking, args.enemy_ai)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    rate = f"{report['fights_per_second']:,} fights/s" if report["fights_per_second"] is not None else "too fast to time"
+    print(f"Simulated {report['decks_simulated']} of {report['decks_total']} decks x {args.runs} runs "
+          f"against the {args.enemy_ai} boss in {report['seconds']}s ({rate} on {report['workers']} workers)")
+    print_table("Best decks:", report["best"])
+    print_table("Worst decks:", report["worst"])
+    print(f"Report written to {args.output}, every deck ranked in {args.ranking}")
+
+
+if __name__ == "__main__":
+    main()